@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains implementation to build several asset rigs in a single session
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import os
+import re
+import time
+import traceback
+
+import tpDccLib as tp
+
+from . import profiles
+from . import spec
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+
+def get_namespace(asset_name):
+    """
+    Returns a valid namespace for the given asset name
+    :param asset_name: str
+    :return: str
+    """
+
+    namespace = re.sub(r'[^a-zA-Z0-9_]', '_', asset_name)
+    if namespace[0].isdigit():
+        namespace = '_{}'.format(namespace)
+
+    return namespace
+
+
+def export_rig(main_grp, namespace, file_path, file_type='mayaAscii'):
+    """
+    Exports a rig built inside a namespace into its own file without the namespace and removes it from the scene
+    :param main_grp: str, rig main group
+    :param namespace: str, namespace where the rig was built
+    :param file_path: str, file where the rig is exported
+    :param file_type: str, Maya file type (mayaAscii or mayaBinary)
+    :return: str, exported file path
+    """
+
+    namespace = ':{}'.format(namespace.strip(':'))
+    nodes = mc.namespaceInfo(namespace, listOnlyDependencyNodes=True, dagPath=True, recurse=True) or list()
+    uuids = mc.ls(nodes, uuid=True) or list()
+    main_uuid = mc.ls(main_grp, uuid=True)[0]
+
+    # Nested namespaces (from imported or referenced files) are moved to the root namespace with the rig nodes
+    existing_namespaces = set(mc.namespaceInfo(':', listOnlyNamespaces=True, recurse=True, absoluteName=True) or list())
+    nested_namespaces = mc.namespaceInfo(namespace, listOnlyNamespaces=True, recurse=True, absoluteName=True) or list()
+    moved_namespaces = [':{}'.format(nested_namespace[len(namespace) + 1:]) for nested_namespace in nested_namespaces]
+
+    # Nodes are moved to the root namespace so the exported rig has the same names as a single asset build
+    mc.namespace(setNamespace=':')
+    mc.namespace(moveNamespace=[namespace, ':'], force=True)
+    mc.namespace(removeNamespace=namespace)
+
+    file_dir = os.path.dirname(file_path)
+    if file_dir and not os.path.isdir(file_dir):
+        os.makedirs(file_dir)
+
+    profiles.export_nodes(
+        mc.ls(main_uuid, long=True), file_path, type=file_type, preserveReferences=True, shader=True, channels=True,
+        constraints=True, expressions=True, constructionHistory=True)
+
+    existing_nodes = mc.ls(uuids, long=True) or list()
+    if existing_nodes:
+        mc.lockNode(existing_nodes, lock=False)
+        mc.delete(existing_nodes)
+
+    for moved_namespace in sorted(moved_namespaces, key=lambda item: item.count(':'), reverse=True):
+        if moved_namespace in existing_namespaces or not mc.namespace(exists=moved_namespace):
+            continue
+        if not mc.namespaceInfo(moved_namespace, listNamespace=True):
+            mc.namespace(removeNamespace=moved_namespace)
+
+    return file_path
+
+
+class BatchBuilder(object):
+    """
+    Class that builds several asset rigs in a single session, each one inside its own namespace, and exports each
+    rig to its own file
+    """
+
+    def __init__(self, rig_class=None, file_type='mayaAscii', spec_cache=None):
+        """
+        :param rig_class: class or None, rig class used to build the assets. If not given, prop.PropRig is used
+        :param file_type: str, Maya file type of the exported rigs
+        :param spec_cache: spec.SpecCache or None
+        """
+
+        super(BatchBuilder, self).__init__()
+
+        if rig_class is None:
+            from . import prop
+            rig_class = prop.PropRig
+
+        self._rig_class = rig_class
+        self._file_type = file_type
+        self._spec_cache = spec_cache
+        self._assets = list()
+        self._report = dict()
+
+    @property
+    def report(self):
+        """
+        Returns result of the last batch build for each asset
+        :return: dict
+        """
+
+        return self._report
+
+    def add_asset(self, asset_name, file_path, source_files=None, **kwargs):
+        """
+        Adds a new asset to build
+        :param asset_name: str
+        :param file_path: str, file where the asset rig will be exported
+        :param source_files: list<str> or None, files the rig is built from. If given and the builder has a spec
+            cache, the rig is recreated from its cached spec while those files do not change
+        :param kwargs: dict, extra arguments passed to the rig class
+        """
+
+        # Failed builds are rolled back so they do not leave partial rigs in the shared session
+        kwargs.setdefault('transactional', True)
+        kwargs.setdefault('profile', profiles.Profiles.Batch)
+        options = {'rig_class': '{}.{}'.format(self._rig_class.__module__, self._rig_class.__name__), 'kwargs': kwargs}
+        source_key = spec.get_source_key(source_files, options=options) if source_files else None
+        self._assets.append((asset_name, file_path, source_key, kwargs))
+
+    def build(self, force_new=True, validation_report=None):
+        """
+        Builds and exports all the added assets in a single new scene
+        Assets that fail to build are reported and skipped, the rest of the batch is built anyway
+        :param force_new: bool, Whether to discard unsaved changes when creating the new scene
+        :param validation_report: dict or None, report returned by validator.validate_library. If given, assets
+            that are not valid are skipped without building them
+        :return: dict
+        """
+
+        self._report = dict()
+        mc.file(force=force_new, new=True)
+
+        validated_assets = validation_report.get('assets', dict()) if validation_report else dict()
+
+        rigs = list()
+        for asset_name, file_path, source_key, kwargs in self._assets:
+            asset_validation = validated_assets.get(asset_name)
+            if asset_validation and not asset_validation['valid']:
+                tp.logger.warning('Skipping rig build for invalid asset {}'.format(asset_name))
+                self._report[asset_name] = {'status': 'skipped', 'errors': asset_validation['errors']}
+                continue
+            start_time = time.time()
+            try:
+                rig_spec = None
+                if self._spec_cache and source_key:
+                    rig_spec = self._spec_cache.get(asset_name, source_key=source_key)
+                asset_rig = self._rig_class(asset_name, namespace=get_namespace(asset_name), **kwargs)
+                asset_rig.build(new_scene=False, rig_spec=rig_spec)
+                if self._spec_cache and source_key and not rig_spec:
+                    self._spec_cache.put(asset_rig.get_spec(source_key=source_key))
+                rigs.append((asset_name, asset_rig, file_path))
+                self._report[asset_name] = {
+                    'status': 'built', 'build_time': time.time() - start_time, 'from_spec': rig_spec is not None}
+            except Exception as exc:
+                tp.logger.error('Error while building rig for asset {}: {}'.format(asset_name, exc))
+                self._report[asset_name] = {
+                    'status': 'failed', 'build_time': time.time() - start_time, 'error': traceback.format_exc()}
+
+        for asset_name, asset_rig, file_path in rigs:
+            start_time = time.time()
+            try:
+                export_rig(asset_rig.main_group, asset_rig.namespace, file_path, file_type=self._file_type)
+                self._report[asset_name].update(
+                    {'status': 'exported', 'file': file_path, 'export_time': time.time() - start_time})
+            except Exception as exc:
+                tp.logger.error('Error while exporting rig for asset {}: {}'.format(asset_name, exc))
+                self._report[asset_name].update({'status': 'failed', 'error': traceback.format_exc()})
+
+        return self._report
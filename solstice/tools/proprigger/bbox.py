@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains bounding box computation and caching used to size rig controls
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import hashlib
+from functools import partial
+
+import numpy as np
+
+# Bounding box cache shared by all the rigs built in the session (see get_session_cache)
+_SESSION_CACHE = None
+
+
+def geometry_hash(*arrays):
+    """
+    Returns a hash that identifies the given geometry arrays (points, topology, matrices ...)
+    :param arrays: list<numpy.ndarray>
+    :return: str
+    """
+
+    hasher = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        hasher.update(str(array.dtype).encode('utf-8'))
+        hasher.update(str(array.shape).encode('utf-8'))
+        hasher.update(array.tobytes())
+
+    return hasher.hexdigest()
+
+
+class BoundingBox(object):
+    """
+    Axis aligned bounding box
+    """
+
+    def __init__(self, min_point=None, max_point=None):
+        super(BoundingBox, self).__init__()
+
+        self._min = np.asarray(min_point, dtype=np.float64) if min_point is not None else None
+        self._max = np.asarray(max_point, dtype=np.float64) if max_point is not None else None
+
+    def __repr__(self):
+        return 'BoundingBox({}, {})'.format(self.min, self.max)
+
+    @classmethod
+    def from_points(cls, points):
+        """
+        Creates a bounding box enclosing the given points
+        :param points: numpy.ndarray, (N, 3) array of points
+        :return: BoundingBox
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if not len(points):
+            return cls()
+
+        return cls(points.min(axis=0), points.max(axis=0))
+
+    @classmethod
+    def union(cls, boxes):
+        """
+        Creates a bounding box enclosing all the given bounding boxes
+        :param boxes: list<BoundingBox>
+        :return: BoundingBox
+        """
+
+        boxes = [box for box in boxes if not box.is_empty]
+        if not boxes:
+            return cls()
+
+        return cls(np.min([box.min for box in boxes], axis=0), np.max([box.max for box in boxes], axis=0))
+
+    @property
+    def is_empty(self):
+        """
+        Returns whether the bounding box encloses any point or not
+        :return: bool
+        """
+
+        return self._min is None or self._max is None
+
+    @property
+    def min(self):
+        """
+        Returns minimum corner of the bounding box
+        :return: numpy.ndarray
+        """
+
+        return self._min if self._min is not None else np.zeros(3)
+
+    @property
+    def max(self):
+        """
+        Returns maximum corner of the bounding box
+        :return: numpy.ndarray
+        """
+
+        return self._max if self._max is not None else np.zeros(3)
+
+    @property
+    def center(self):
+        """
+        Returns center of the bounding box
+        :return: numpy.ndarray
+        """
+
+        return (self.min + self.max) * 0.5
+
+    @property
+    def size(self):
+        """
+        Returns size of the bounding box in each axis
+        :return: numpy.ndarray
+        """
+
+        return self.max - self.min
+
+    @property
+    def radius(self):
+        """
+        Returns radius of the sphere that encloses the bounding box
+        :return: float
+        """
+
+        return float(np.linalg.norm(self.size) * 0.5)
+
+    def footprint(self, axis=1):
+        """
+        Returns the size of the bounding box projected in the plane perpendicular to the given axis
+        :param axis: int, 0 (X), 1 (Y) or 2 (Z)
+        :return: numpy.ndarray, (2, ) array
+        """
+
+        return np.delete(self.size, axis)
+
+    def footprint_radius(self, axis=1):
+        """
+        Returns the radius of the circle that encloses the footprint of the bounding box
+        :param axis: int, 0 (X), 1 (Y) or 2 (Z)
+        :return: float
+        """
+
+        return float(np.linalg.norm(self.footprint(axis=axis)) * 0.5)
+
+    def control_radius(self, axis=1, padding=1.1, minimum=0.1):
+        """
+        Returns a control radius that encloses the footprint of the bounding box
+        :param axis: int, normal axis of the control
+        :param padding: float, multiplier applied to the footprint radius
+        :param minimum: float, minimum radius returned for flat or empty bounding boxes
+        :return: float
+        """
+
+        return max(self.footprint_radius(axis=axis) * padding, minimum)
+
+    def as_list(self):
+        """
+        Returns bounding box with the same layout returned by exactWorldBoundingBox
+        :return: list<float>, [xmin, ymin, zmin, xmax, ymax, zmax]
+        """
+
+        return self.min.tolist() + self.max.tolist()
+
+
+class BoundingBoxCache(object):
+    """
+    Caches per mesh bounding boxes keyed on a cheap geometry key (vertex count, object space bounds and world
+    matrix), so points are only read for meshes whose key changed
+    Cached boxes are world space boxes: the world matrix is part of the key, so moving the mesh or any of its parents
+    invalidates the cached box
+    """
+
+    def __init__(self):
+        super(BoundingBoxCache, self).__init__()
+
+        self._boxes = dict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def get(self, mesh, geo_key, points_fn):
+        """
+        Returns bounding box of the given mesh, only reading its points if its geometry key changed
+        :param mesh: str, name of the mesh
+        :param geo_key: tuple, key that changes when the mesh geometry changes (see utils.get_mesh_key)
+        :param points_fn: callable, function that returns the (N, 3) points of the mesh. Only called on misses
+        :return: BoundingBox
+        """
+
+        cached = self._boxes.get(mesh)
+        if cached and cached[0] == geo_key:
+            self._hits += 1
+            return cached[1]
+
+        self._misses += 1
+        box = BoundingBox.from_points(points_fn())
+        self._boxes[mesh] = (geo_key, box)
+
+        return box
+
+    def bounds(self, meshes_keys, points_fn):
+        """
+        Returns the aggregated bounding box of the given meshes
+        :param meshes_keys: dict(str, tuple), mesh names and their geometry keys
+        :param points_fn: callable, function that returns the points of the mesh it receives
+        :return: BoundingBox
+        """
+
+        return BoundingBox.union(
+            [self.get(mesh, geo_key, partial(points_fn, mesh)) for mesh, geo_key in meshes_keys.items()])
+
+    def remove(self, mesh):
+        """
+        Removes cached bounding box of the given mesh
+        :param mesh: str
+        """
+
+        self._boxes.pop(mesh, None)
+
+    def clear(self):
+        """
+        Removes all cached bounding boxes
+        """
+
+        self._boxes.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+def get_session_cache():
+    """
+    Returns bounding box cache shared by all the rigs built in the session, so rebuilding a rig or building rigs
+    that share geometry only reads the points of the meshes that changed. Cache is created once
+    :return: BoundingBoxCache
+    """
+
+    global _SESSION_CACHE
+    if _SESSION_CACHE is None:
+        _SESSION_CACHE = BoundingBoxCache()
+
+    return _SESSION_CACHE
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains import time benchmark of the Prop Rigger tool modules
+Each module is imported in a new interpreter, so timings do not depend on modules already loaded by the session
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import sys
+import json
+import subprocess
+
+
+# Modules that should only be loaded when they are used for the first time
+HEAVY_MODULES = ['xgenm', 'artellapipe', 'Qt', 'numpy', 'maya.cmds', 'maya.api.OpenMaya']
+
+DEFAULT_MODULES = [
+    'solstice.tools.proprigger',
+    'solstice.tools.proprigger.proprigger',
+    'solstice.tools.proprigger.ui',
+    'solstice.tools.proprigger.prop'
+]
+
+_IMPORT_SCRIPT = '''
+import sys, time, json
+start_time = time.time()
+try:
+    import {module}
+    error = None
+except Exception as exc:
+    error = str(exc)
+import_time = time.time() - start_time
+print(json.dumps({{
+    'time': import_time, 'error': error, 'loaded': [name for name in {heavy} if name in sys.modules]}}))
+'''
+
+
+def measure_import(module_name, python=None, repeat=3):
+    """
+    Returns the time needed to import the given module in a new interpreter and the heavy modules it loads
+    :param module_name: str
+    :param python: str or None, Python executable (mayapy to benchmark inside Maya). Current one is used by default
+    :param repeat: int, number of imports. Fastest one is reported
+    :return: dict
+    """
+
+    script = _IMPORT_SCRIPT.format(module=module_name, heavy=repr(HEAVY_MODULES))
+    results = list()
+    for _ in range(max(1, repeat)):
+        output = subprocess.check_output([python or sys.executable, '-c', script])
+        results.append(json.loads(output.decode('utf-8').strip().splitlines()[-1]))
+
+    result = min(results, key=lambda item: item['time'])
+    result['module'] = module_name
+
+    return result
+
+
+def run_benchmark(modules=None, python=None, repeat=3):
+    """
+    Returns import time benchmark of the given modules
+    :param modules: list<str> or None, modules to benchmark. If not given, tool entry modules are benchmarked
+    :param python: str or None, Python executable
+    :param repeat: int, number of imports of each module
+    :return: list<dict>
+    """
+
+    return [measure_import(module_name, python=python, repeat=repeat) for module_name in modules or DEFAULT_MODULES]
+
+
+def format_benchmark(results):
+    """
+    Returns a text report of the given benchmark results
+    :param results: list<dict>
+    :return: str
+    """
+
+    lines = ['Import times:']
+    for result in results:
+        status = 'error: {}'.format(result['error']) if result['error'] else ', '.join(result['loaded']) or '-'
+        lines.append('\t{:<45} {:>8.1f}ms  {}'.format(result['module'], result['time'] * 1000.0, status))
+
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    print(format_benchmark(run_benchmark(sys.argv[1:] or None)))
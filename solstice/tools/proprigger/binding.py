@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains rigid joint binding of rig geometry, used as an alternative to constraint driven asset groups
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+from collections import Counter
+
+import numpy as np
+import tpDccLib as tp
+
+from . import naming
+from . import profiler
+
+if tp.is_maya():
+    import maya.cmds as mc
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+
+
+class BindingModes(object):
+    Constraint = 'constraint'
+    Joint = 'joint'
+
+
+def rigid_weights(vertex_count, influence_index, influence_count):
+    """
+    Returns skin weights that bind all the vertices of a mesh to a single influence
+    :param vertex_count: int
+    :param influence_index: int, index of the influence that drives the mesh
+    :param influence_count: int, number of influences of the skin cluster
+    :return: numpy.ndarray, flat (vertex_count * influence_count) array ordered by vertex
+    """
+
+    if not 0 <= influence_index < influence_count:
+        raise ValueError('Influence index {} is not valid for {} influences'.format(influence_index, influence_count))
+
+    weights = np.zeros((vertex_count, influence_count), dtype=np.float64)
+    weights[:, influence_index] = 1.0
+
+    return weights.reshape(-1)
+
+
+def estimate_cost(vertex_counts, control_count, mode, geometry_groups=2):
+    """
+    Returns estimated node count and evaluation weight of the nodes used to drive the rig geometry
+    Uses the same node weights as the rig complexity profiler
+    :param vertex_counts: list<int>, vertex count of each bound mesh
+    :param control_count: int, number of controls that drive geometry
+    :param mode: str, binding mode (BindingModes)
+    :param geometry_groups: int, number of geometry groups (proxy and hires)
+    :return: dict
+    """
+
+    if mode == BindingModes.Constraint:
+        node_types = Counter({'parentConstraint': geometry_groups, 'scaleConstraint': geometry_groups})
+        deformed_vertices = 0
+    elif mode == BindingModes.Joint:
+        node_types = Counter({
+            'joint': control_count * geometry_groups, 'decomposeMatrix': control_count,
+            'multMatrix': max(control_count - 1, 0), 'skinCluster': len(vertex_counts)})
+        deformed_vertices = sum(vertex_counts)
+    else:
+        raise ValueError('Binding mode "{}" is not valid'.format(mode))
+
+    evaluation_weight = sum(
+        profiler.NODE_WEIGHTS.get(node_type, profiler.DEFAULT_NODE_WEIGHT) * count
+        for node_type, count in node_types.items())
+    evaluation_weight += deformed_vertices * profiler.DEFORMED_VERTEX_WEIGHT
+
+    return {
+        'mode': mode,
+        'node_count': sum(node_types.values()),
+        'node_types': dict(node_types),
+        'deformed_vertices': deformed_vertices,
+        'evaluation_weight': round(evaluation_weight, 3)
+    }
+
+
+def compare_costs(vertex_counts, control_count, geometry_groups=2):
+    """
+    Returns estimated costs of both binding modes and their differences
+    :param vertex_counts: list<int>, vertex count of each bound mesh
+    :param control_count: int, number of controls that drive geometry
+    :param geometry_groups: int, number of geometry groups (proxy and hires)
+    :return: dict
+    """
+
+    constraint_cost = estimate_cost(vertex_counts, control_count, BindingModes.Constraint, geometry_groups)
+    joint_cost = estimate_cost(vertex_counts, control_count, BindingModes.Joint, geometry_groups)
+
+    return {
+        BindingModes.Constraint: constraint_cost,
+        BindingModes.Joint: joint_cost,
+        'diff': profiler.compare_reports(constraint_cost, joint_cost)
+    }
+
+
+def create_joints(controls, parent, suffix, drivers=None):
+    """
+    Creates a joint hierarchy that follows the given controls
+    Joints are driven with matrix nodes instead of constraints
+    :param controls: list<tuple(str, str or None)>, controls and their parent controls. Parents must be listed first
+    :param parent: str, group where the joint hierarchy is created
+    :param suffix: str, suffix added to the joint names (proxy, hires)
+    :param drivers: dict(str, str) or None, decompose matrix nodes of already driven controls. New driver nodes are
+        added to it, so several joint hierarchies can share the same driver nodes
+    :return: list<str>, created joints, in the same order as the controls
+    """
+
+    drivers = drivers if drivers is not None else dict()
+    joints = dict()
+    for ctrl, parent_ctrl in controls:
+        base_name = naming.remove_suffix(ctrl.split('|')[-1])
+        joint = mc.createNode(
+            'joint', name=naming.build_name(base_name, suffix, naming.Names.Joint),
+            parent=joints[parent_ctrl] if parent_ctrl else parent)
+        joint = mc.ls(joint, long=True)[0]
+
+        if ctrl not in drivers:
+            decompose_matrix = mc.createNode(
+                'decomposeMatrix', name=naming.build_name(base_name, naming.Names.DecomposeMatrix))
+            if parent_ctrl:
+                mult_matrix = mc.createNode('multMatrix', name=naming.build_name(base_name, naming.Names.MultMatrix))
+                mc.connectAttr('{}.worldMatrix[0]'.format(ctrl), '{}.matrixIn[0]'.format(mult_matrix))
+                mc.connectAttr('{}.worldInverseMatrix[0]'.format(parent_ctrl), '{}.matrixIn[1]'.format(mult_matrix))
+                mc.connectAttr('{}.matrixSum'.format(mult_matrix), '{}.inputMatrix'.format(decompose_matrix))
+            else:
+                mc.connectAttr('{}.worldMatrix[0]'.format(ctrl), '{}.inputMatrix'.format(decompose_matrix))
+            mc.setAttr('{}.inputRotateOrder'.format(decompose_matrix), mc.getAttr('{}.rotateOrder'.format(ctrl)))
+            drivers[ctrl] = decompose_matrix
+
+        for attr in ['Translate', 'Rotate', 'Scale']:
+            mc.connectAttr('{}.output{}'.format(drivers[ctrl], attr), '{}.{}'.format(joint, attr.lower()))
+        mc.setAttr('{}.rotateOrder'.format(joint), mc.getAttr('{}.rotateOrder'.format(ctrl)))
+        mc.setAttr('{}.segmentScaleCompensate'.format(joint), False)
+        joints[ctrl] = joint
+
+    return [joints[ctrl] for ctrl, _ in controls]
+
+
+def bind_rigid(mesh, joints, joint_index):
+    """
+    Binds given mesh to the given joints with all the vertices weighted to a single joint
+    Weights are written with a single API call
+    :param mesh: str, mesh shape
+    :param joints: list<str>, skin cluster influences
+    :param joint_index: int, index of the joint that drives the mesh
+    :return: str, new skin cluster
+    """
+
+    skin_cluster = mc.skinCluster(
+        joints, mesh, toSelectedBones=True, bindMethod=0, maximumInfluences=1, normalizeWeights=1,
+        name=naming.build_name(mesh.split('|')[-1], 'skinCluster'))[0]
+
+    selection = om.MSelectionList()
+    selection.add(mesh)
+    selection.add(skin_cluster)
+    dag_path = selection.getDagPath(0)
+    skin_fn = oma.MFnSkinCluster(selection.getDependNode(1))
+
+    # Influence indices of the skin cluster do not always follow the order of the given joints
+    influences = [influence.fullPathName() for influence in skin_fn.influenceObjects()]
+    influence_index = influences.index(mc.ls(joints[joint_index], long=True)[0])
+
+    vertex_count = om.MFnMesh(dag_path).numVertices
+    components_fn = om.MFnSingleIndexedComponent()
+    components = components_fn.create(om.MFn.kMeshVertComponent)
+    components_fn.setCompleteData(vertex_count)
+
+    weights = om.MDoubleArray(rigid_weights(vertex_count, influence_index, len(influences)).tolist())
+    skin_fn.setWeights(dag_path, components, om.MIntArray(list(range(len(influences)))), weights, False)
+
+    return skin_cluster
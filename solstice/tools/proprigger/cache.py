@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a scene query cache used during rig builds
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+
+# Indices of the cached queries
+EXISTS, CHILDREN, SHAPES, ATTRIBUTES = range(4)
+
+
+def _path_tokens(path):
+    return set(token for token in path.split('|') if token)
+
+
+def _get_short_name(node):
+    return node.split('|')[-1]
+
+
+class SceneQueryCache(object):
+    """
+    Caches existence, children, shapes and attribute queries done during a build
+    Cached entries are invalidated by the mutation functions of the cache (group, parent, rename, delete ...), so
+    rigs must mutate the scene through them to keep cached answers valid
+    Entries are indexed by the node names found in their keys and results, so mutations only visit the entries of
+    the nodes they change and never query the scene to find out what to invalidate
+    """
+
+    def __init__(self):
+        super(SceneQueryCache, self).__init__()
+
+        self._exists = dict()
+        self._children = dict()
+        self._shapes = dict()
+        self._attributes = dict()
+        self._caches = [self._exists, self._children, self._shapes, self._attributes]
+
+        # node name > set of (cache index, key) of the entries where the node is involved
+        self._index = dict()
+        # node short name > keys of its cached children
+        self._children_index = dict()
+
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def stats(self):
+        """
+        Returns cache hit/miss counters
+        :return: dict
+        """
+
+        total = self._hits + self._misses
+        return {'hits': self._hits, 'misses': self._misses, 'hit_ratio': self._hits / total if total else 0.0}
+
+    # ==================================================================================================================
+    # QUERIES
+    # ==================================================================================================================
+
+    def exists(self, node):
+        """
+        Returns whether given node exists or not
+        :param node: str
+        :return: bool
+        """
+
+        if not node:
+            return False
+
+        return self._get(EXISTS, node, lambda: mc.objExists(node))
+
+    def children(self, node, full_path=True, children_type=None):
+        """
+        Returns direct children of the given node
+        :param node: str
+        :param full_path: bool
+        :param children_type: str or None
+        :return: list<str>
+        """
+
+        key = (node, full_path, children_type)
+        kwargs = {'type': children_type} if children_type else dict()
+
+        return list(self._get(CHILDREN, key, lambda: tuple(
+            mc.listRelatives(node, children=True, fullPath=full_path, **kwargs) or list())))
+
+    def shapes(self, node, full_path=True):
+        """
+        Returns shapes of the given node
+        :param node: str
+        :param full_path: bool
+        :return: list<str>
+        """
+
+        key = (node, full_path)
+
+        return list(self._get(SHAPES, key, lambda: tuple(
+            mc.listRelatives(node, shapes=True, fullPath=full_path) or list())))
+
+    def attribute_exists(self, node, attribute_name):
+        """
+        Returns whether given attribute exists in the given node or not
+        :param node: str
+        :param attribute_name: str
+        :return: bool
+        """
+
+        key = (node, attribute_name)
+
+        return self._get(ATTRIBUTES, key, lambda: mc.attributeQuery(attribute_name, node=node, exists=True))
+
+    # ==================================================================================================================
+    # MUTATIONS
+    # ==================================================================================================================
+
+    def created(self, *nodes):
+        """
+        Notifies the cache that the given nodes were created outside of the cache mutation functions
+        Parents of nodes given with their full path are taken from the path. Parents of the other nodes are queried
+        at once
+        :param nodes: list<str>
+        """
+
+        parents = [node.rsplit('|', 1)[0] for node in nodes if '|' in node]
+        short_nodes = [node for node in nodes if '|' not in node]
+        if short_nodes:
+            parents.extend(mc.listRelatives(short_nodes, parent=True, fullPath=True) or list())
+
+        self._invalidate(nodes)
+        self._invalidate_children(parents)
+        for node in nodes:
+            self._set(EXISTS, node, True)
+
+    def group(self, *nodes, **kwargs):
+        """
+        Groups given nodes and updates the cache
+        :param nodes: list<str>
+        :param kwargs: dict, arguments passed to maya.cmds.group
+        :return: str, new group
+        """
+
+        new_grp = mc.group(*nodes, **kwargs)
+
+        # Cached children of the old parents are found through the index, because they contain the grouped nodes
+        self._invalidate(nodes, paths_only=True)
+        self._invalidate_children([kwargs.get('parent')])
+        self._invalidate([new_grp])
+        self._set(EXISTS, new_grp, True)
+
+        return new_grp
+
+    def parent(self, nodes, parent=None, **kwargs):
+        """
+        Parents given nodes and updates the cache
+        :param nodes: str or list<str>
+        :param parent: str or None, new parent. If None, nodes are parented to world
+        :param kwargs: dict, arguments passed to maya.cmds.parent
+        :return: list<str>, parented nodes
+        """
+
+        nodes = [nodes] if not isinstance(nodes, (list, tuple)) else list(nodes)
+        if parent:
+            result = mc.parent(nodes, parent, **kwargs)
+        else:
+            result = mc.parent(nodes, world=True, **kwargs)
+        self._invalidate(nodes, paths_only=True)
+        self._invalidate_children([parent])
+
+        return result
+
+    def rename(self, node, new_name):
+        """
+        Renames given node and updates the cache
+        :param node: str
+        :param new_name: str
+        :return: str, final name of the node
+        """
+
+        result = mc.rename(node, new_name)
+        self._invalidate([node, new_name, result])
+        if result != node:
+            self._set(EXISTS, node, False)
+        self._set(EXISTS, result, True)
+
+        return result
+
+    def delete(self, nodes):
+        """
+        Deletes given nodes and updates the cache
+        Descendants are queried at once, so entries cached by the short name of a descendant are removed too
+        :param nodes: str or list<str>
+        """
+
+        nodes = [nodes] if not isinstance(nodes, (list, tuple)) else list(nodes)
+        descendants = mc.listRelatives(nodes, allDescendents=True, fullPath=True) or list()
+
+        mc.delete(nodes)
+        self._invalidate(nodes + [_get_short_name(descendant) for descendant in descendants])
+        for node in nodes:
+            self._set(EXISTS, node, False)
+
+    def add_attribute(self, node, attribute_name, **kwargs):
+        """
+        Adds a new attribute to the given node and updates the cache
+        :param node: str
+        :param attribute_name: str
+        :param kwargs: dict, arguments passed to maya.cmds.addAttr
+        """
+
+        mc.addAttr(node, ln=attribute_name, **kwargs)
+        self._set(ATTRIBUTES, (node, attribute_name), True)
+
+    def invalidate(self, nodes=None):
+        """
+        Removes cached entries related with the given nodes. If no nodes are given, the full cache is cleared
+        :param nodes: list<str> or None
+        """
+
+        if nodes is None:
+            for cache in self._caches:
+                cache.clear()
+            self._index.clear()
+            self._children_index.clear()
+            return
+
+        self._invalidate(nodes)
+
+    # ==================================================================================================================
+    # INTERNAL
+    # ==================================================================================================================
+
+    def _get(self, cache_index, key, query_fn):
+        cache = self._caches[cache_index]
+        if key in cache:
+            self._hits += 1
+            return cache[key]
+
+        self._misses += 1
+        value = query_fn()
+        self._set(cache_index, key, value)
+
+        return value
+
+    def _set(self, cache_index, key, value):
+        """
+        Internal function that stores a cache entry and indexes it by the nodes found in its key and value
+        :param cache_index: int, cached query (EXISTS, CHILDREN, SHAPES or ATTRIBUTES)
+        :param key: str or tuple
+        :param value: object
+        """
+
+        cache = self._caches[cache_index]
+        if key in cache:
+            self._remove(cache_index, key)
+        cache[key] = value
+
+        key_node = key[0] if isinstance(key, tuple) else key
+        names = _path_tokens(key_node)
+        if isinstance(value, tuple):
+            for item in value:
+                names.update(_path_tokens(item))
+        for name in names:
+            self._index.setdefault(name, set()).add((cache_index, key))
+        if cache is self._children:
+            self._children_index.setdefault(_get_short_name(key_node), set()).add(key)
+
+    def _remove(self, cache_index, key):
+        """
+        Internal function that removes a cache entry and its index entries
+        :param cache_index: int
+        :param key: str or tuple
+        """
+
+        cache = self._caches[cache_index]
+        value = cache.pop(key, None)
+        key_node = key[0] if isinstance(key, tuple) else key
+        names = _path_tokens(key_node)
+        if isinstance(value, tuple):
+            for item in value:
+                names.update(_path_tokens(item))
+        for name in names:
+            entries = self._index.get(name)
+            if entries:
+                entries.discard((cache_index, key))
+                if not entries:
+                    self._index.pop(name)
+        if cache is self._children:
+            keys = self._children_index.get(_get_short_name(key_node))
+            if keys:
+                keys.discard(key)
+
+    def _invalidate(self, nodes, paths_only=False):
+        """
+        Internal function that removes all cached entries where any of the given nodes is involved, either in the
+        queried node path (so descendants of renamed nodes are invalidated too) or in the cached result
+        :param nodes: list<str>
+        :param paths_only: bool, If True, entries that only store the short name of the nodes are kept. Used when
+            nodes are moved in the hierarchy, because their names, children and shapes do not change but their
+            full paths and the children of their old parents do
+        """
+
+        names = set(_get_short_name(node) for node in nodes if node)
+        for name in names:
+            for cache_index, key in list(self._index.get(name, set())):
+                if paths_only and not self._is_path_entry(cache_index, key, name):
+                    continue
+                self._remove(cache_index, key)
+
+    def _is_path_entry(self, cache_index, key, name):
+        """
+        Internal function that returns whether the given node name is stored in an entry as part of a full path or
+        as an item of a children or shapes result
+        :param cache_index: int
+        :param key: str or tuple
+        :param name: str
+        :return: bool
+        """
+
+        key_node = key[0] if isinstance(key, tuple) else key
+        if '|' in key_node:
+            return True
+
+        value = self._caches[cache_index][key]
+        return isinstance(value, tuple) and any(name in _path_tokens(item) for item in value)
+
+    def _invalidate_children(self, parents):
+        """
+        Internal function that removes cached children of the given parents
+        :param parents: list<str>
+        """
+
+        for name in set(_get_short_name(parent) for parent in parents if parent):
+            for key in list(self._children_index.get(name, set())):
+                self._remove(CHILDREN, key)
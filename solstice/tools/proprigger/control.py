@@ -14,6 +14,7 @@ __email__ = "tpoveda@cgart3d.com, enriquevelmai@hotmail.com"
 
 import sys
 
+from . import cache
 from . import naming
 import maya.cmds as mc
 
@@ -30,11 +31,18 @@ class RigControl(object):
             create_auto_group=True,
             create_constraint_group=True,
             auto_rename=True,
-            color_index=-1):
+            color_index=-1,
+            query_cache=None,
+            name_registry=None):
 
         if lock_channels is None:
             lock_channels = ['v']
 
+        query_cache = query_cache or cache.SceneQueryCache()
+        query_cache.created(node)
+        name_registry = name_registry or naming.NameRegistry()
+        name_registry.register(node)
+
         self._node = None
         self._root = None
         self._offset = None
@@ -43,10 +51,11 @@ class RigControl(object):
 
         ctrl_new_name = node
         if auto_rename:
-            ctrl_new_name = naming.build_name(node, naming.Names.Control)
-            mc.rename(node, ctrl_new_name)
+            ctrl_new_name = name_registry.claim(naming.build_name(node, naming.Names.Control))
+            ctrl_new_name = name_registry.register(query_cache.rename(node, ctrl_new_name))
+            name_registry.release(node)
 
-        ctrl_shapes = mc.listRelatives(ctrl_new_name, shapes=True, full_path=True)
+        ctrl_shapes = query_cache.shapes(ctrl_new_name, full_path=True)
         for shp in ctrl_shapes:
             mc.setAttr('{}.ove'.format(shp), True)
             mc.setAttr("{}.ovc".format(shp), True)
@@ -62,34 +71,39 @@ class RigControl(object):
 
         self._node = ctrl_new_name
 
-        self._root = mc.group(ctrl_shapes[0], name=naming.build_name(ctrl_new_name, naming.Names.RootGroup))
+        root_name = name_registry.claim(naming.build_name(ctrl_new_name, naming.Names.RootGroup))
+        if create_auto_group:
+            auto_name = name_registry.claim(naming.build_name(ctrl_new_name, naming.Names.AutoGroup))
+        if create_constraint_group:
+            constraint_name = name_registry.claim(naming.build_name(ctrl_new_name, naming.Names.ConstraintGroup))
+        if create_offset_group:
+            offset_name = name_registry.claim(naming.build_name(ctrl_new_name, naming.Names.OffsetGroup))
+
+        self._root = query_cache.group(ctrl_shapes[0], name=root_name)
 
         if create_auto_group:
-            self._auto = mc.group(self._root, name=naming.build_name(ctrl_new_name, naming.Names.AutoGroup))
+            self._auto = query_cache.group(self._root, name=auto_name)
         if create_constraint_group:
             if create_auto_group:
-                self._constraint = mc.group(self._auto,
-                                            name=naming.build_name(ctrl_new_name, naming.Names.ConstraintGroup))
+                self._constraint = query_cache.group(self._auto, name=constraint_name)
             else:
-                self._constraint = mc.group(self._root,
-                                            name=naming.build_name(ctrl_new_name, naming.Names.ConstraintGroup))
+                self._constraint = query_cache.group(self._root, name=constraint_name)
         if create_offset_group:
             if create_constraint_group:
-                self._offset = mc.group(self._constraint,
-                                        name=naming.build_name(ctrl_new_name, naming.Names.OffsetGroup))
+                self._offset = query_cache.group(self._constraint, name=offset_name)
             else:
                 if create_auto_group:
-                    self._offset = mc.group(self._auto, name=naming.build_name(ctrl_new_name, naming.Names.OffsetGroup))
+                    self._offset = query_cache.group(self._auto, name=offset_name)
                 else:
-                    self._offset = mc.group(self._root, name=naming.build_name(ctrl_new_name, naming.Names.OffsetGroup))
+                    self._offset = query_cache.group(self._root, name=offset_name)
 
-        target_obj = self._offset if self._offset and mc.objExists(self._offset) else ctrl_new_name
-        if mc.objExists(translate_to):
+        target_obj = self._offset if self._offset and query_cache.exists(self._offset) else ctrl_new_name
+        if query_cache.exists(translate_to):
             mc.delete(mc.pointConstraint(translate_to, target_obj))
-        if mc.objExists(rotate_to):
+        if query_cache.exists(rotate_to):
             mc.delete(mc.orientConstraint(rotate_to, target_obj))
-        if mc.objExists(parent):
-            mc.parent(target_obj, parent)
+        if query_cache.exists(parent):
+            query_cache.parent(target_obj, parent)
 
         single_attr_lock_list = list()
         for lock_channel in lock_channels:
@@ -107,13 +121,41 @@ class RigControl(object):
             # if self._root:
             #     cmds.setAttr('{}.{}'.format(self._root, attr, lock=True, keyable=False, channelBox=False))
 
-        ctrl_shapes = mc.listRelatives(ctrl_new_name, shapes=True, full_path=True)
+        ctrl_shapes = query_cache.shapes(ctrl_new_name, full_path=True)
         if len(ctrl_shapes) > 1:
             for i in range(len(ctrl_shapes)):
-                mc.rename(ctrl_shapes[i],
-                          '{}{}Shape'.format(node, naming.get_alpha(i, capital=True)))
+                query_cache.rename(ctrl_shapes[i],
+                                   name_registry.claim('{}{}Shape'.format(node, naming.get_alpha(i, capital=True))))
         else:
-            mc.rename(ctrl_shapes[0], '{}Shape'.format(node))
+            query_cache.rename(ctrl_shapes[0], name_registry.claim('{}Shape'.format(node)))
+
+    @classmethod
+    def from_node(cls, node):
+        """
+        Returns a control that wraps an already existing control node and its groups without creating any node
+        Used to work with controls of rigs that were not built in the current session, such as rigs rebuilt from
+        a spec. Groups are found walking up the control parents by their suffix, so removed groups are None
+        :param node: str, control node
+        :return: RigControl
+        """
+
+        rig_control = cls.__new__(cls)
+        rig_control._node = node
+        rig_control._root = None
+        rig_control._auto = None
+        rig_control._constraint = None
+        rig_control._offset = None
+
+        group_attrs = [('_root', naming.Names.RootGroup), ('_auto', naming.Names.AutoGroup),
+                       ('_constraint', naming.Names.ConstraintGroup), ('_offset', naming.Names.OffsetGroup)]
+        parent = (mc.listRelatives(node, parent=True, fullPath=True) or [None])[0]
+        for attr_name, suffix in group_attrs:
+            if not parent or not parent.endswith(naming.Names.Separator + suffix):
+                continue
+            setattr(rig_control, attr_name, parent)
+            parent = (mc.listRelatives(parent, parent=True, fullPath=True) or [None])[0]
+
+        return rig_control
 
     @property
     def node(self):
@@ -238,4 +280,7 @@ class Circle(RigControl, object):
                  radius=1.0,
                  **kwargs
                  ):
+        name_registry = kwargs.get('name_registry')
+        if name_registry:
+            name = name_registry.claim(name)
         super(Circle, self).__init__(node=mc.circle(name=name, normal=normal, radius=radius, ch=False)[0], **kwargs)
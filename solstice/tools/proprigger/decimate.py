@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains vertex clustering decimation used to generate proxy geometry
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import numpy as np
+
+from . import meshdata
+
+
+class Strategies(object):
+    Cluster = 'cluster'
+    Box = 'box'
+
+
+# Vertex indices of the 12 triangles of a box built from the 8 corners returned by _box_corners
+BOX_TRIANGLES = np.array([
+    [0, 2, 1], [1, 2, 3], [4, 5, 6], [5, 7, 6],
+    [0, 1, 4], [1, 5, 4], [2, 6, 3], [3, 6, 7],
+    [0, 4, 2], [2, 4, 6], [1, 3, 5], [3, 7, 5]], dtype=np.int64)
+
+
+def _box_corners(points):
+    bmin = points.min(axis=0)
+    bmax = points.max(axis=0)
+    return np.array([[bmax[0] if i & 1 else bmin[0],
+                      bmax[1] if i & 2 else bmin[1],
+                      bmax[2] if i & 4 else bmin[2]] for i in range(8)], dtype=np.float64)
+
+
+def _remove_unused_points(points, triangles):
+    used, inverse = np.unique(triangles.reshape(-1), return_inverse=True)
+    return points[used], inverse.reshape(-1, 3)
+
+
+def cluster_vertices(points, triangles, resolution):
+    """
+    Decimates a triangle mesh merging all the vertices that fall in the same cell of a uniform grid
+    :param points: numpy.ndarray, (N, 3) array of points
+    :param triangles: numpy.ndarray, (M, 3) array of vertex indices
+    :param resolution: int, number of cells along the largest axis of the mesh bounding box
+    :return: tuple(numpy.ndarray, numpy.ndarray), decimated points and triangles
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    if not len(points) or not len(triangles):
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    bmin = points.min(axis=0)
+    extent = (points.max(axis=0) - bmin).max()
+    cell_size = extent / max(int(resolution), 1) if extent > 0 else 1.0
+    dims = np.maximum(np.ceil((points.max(axis=0) - bmin) / cell_size).astype(np.int64), 1)
+    cells = np.minimum(np.floor((points - bmin) / cell_size).astype(np.int64), dims - 1)
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    _, cluster_ids, cluster_sizes = np.unique(keys, return_inverse=True, return_counts=True)
+    cluster_ids = cluster_ids.reshape(-1)
+    cluster_points = np.column_stack(
+        [np.bincount(cluster_ids, weights=points[:, axis]) for axis in range(3)]) / cluster_sizes[:, None]
+
+    new_triangles = cluster_ids[triangles]
+    valid = new_triangles[:, 0] != new_triangles[:, 1]
+    valid &= new_triangles[:, 1] != new_triangles[:, 2]
+    valid &= new_triangles[:, 0] != new_triangles[:, 2]
+    new_triangles = new_triangles[valid]
+    if not len(new_triangles):
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    # Several triangles can collapse into the same one, we only keep the first one to preserve its winding
+    _, unique_index = np.unique(np.sort(new_triangles, axis=1), axis=0, return_index=True)
+    new_triangles = new_triangles[np.sort(unique_index)]
+
+    return _remove_unused_points(cluster_points, new_triangles)
+
+
+def bounding_box_hull(points):
+    """
+    Returns a box mesh that encloses the given points
+    :param points: numpy.ndarray, (N, 3) array of points
+    :return: tuple(numpy.ndarray, numpy.ndarray), box points and triangles
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if not len(points):
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    return _box_corners(points), BOX_TRIANGLES.copy()
+
+
+def decimate(points, triangles, target_triangles, strategy=Strategies.Cluster):
+    """
+    Decimates a triangle mesh until its triangle count fits in the given budget
+    The largest grid resolution that fits the budget is found with a binary search. If no resolution fits it,
+    the bounding box hull of the mesh is returned instead
+    :param points: numpy.ndarray, (N, 3) array of points
+    :param triangles: numpy.ndarray, (M, 3) array of vertex indices
+    :param target_triangles: int, maximum number of triangles of the decimated mesh
+    :param strategy: str, Strategies.Cluster or Strategies.Box
+    :return: tuple(numpy.ndarray, numpy.ndarray), decimated points and triangles
+    """
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+    if strategy == Strategies.Box:
+        return bounding_box_hull(points)
+    if len(triangles) <= target_triangles:
+        return _remove_unused_points(points, triangles) if len(triangles) else (points[:0], triangles)
+
+    best = None
+    low, high = 1, max(int(np.ceil(np.sqrt(len(triangles)))) * 2, 2)
+    while low <= high:
+        resolution = (low + high) // 2
+        result = cluster_vertices(points, triangles, resolution)
+        if len(result[1]) <= target_triangles:
+            best = result
+            low = resolution + 1
+        else:
+            high = resolution - 1
+
+    if best is None or not len(best[1]):
+        return bounding_box_hull(points)
+
+    return best
+
+
+def distribute_budget(triangle_counts, total_budget, minimum=BOX_TRIANGLES.shape[0]):
+    """
+    Splits a triangle budget between several meshes proportionally to their triangle count
+    Each mesh gets a minimum budget first and the rest of the budget is split proportionally, so the total never
+    exceeds the budget. If the budget cannot cover the minimum of all the meshes, the smallest meshes are dropped
+    :param triangle_counts: list<int>
+    :param total_budget: int
+    :param minimum: int, minimum budget given to each mesh (or its triangle count, if it is smaller)
+    :return: numpy.ndarray, budget of each mesh. Dropped meshes get a budget of 0
+    """
+
+    triangle_counts = np.asarray(triangle_counts, dtype=np.int64)
+    minimums = np.minimum(triangle_counts, minimum)
+    kept = np.ones(len(triangle_counts), dtype=bool)
+    for index in np.argsort(triangle_counts, kind='stable'):
+        if minimums[kept].sum() <= total_budget:
+            break
+        kept[index] = False
+
+    budgets = np.where(kept, minimums, 0)
+    extra = np.where(kept, triangle_counts - minimums, 0)
+    remaining = total_budget - budgets.sum()
+    if extra.sum() and remaining > 0:
+        budgets += np.minimum(np.floor(extra / float(extra.sum()) * remaining).astype(np.int64), extra)
+
+    return budgets
+
+
+def decimate_mesh(mesh_data, target_triangles, strategy=Strategies.Cluster, name=None):
+    """
+    Returns a decimated copy of the given mesh
+    :param mesh_data: meshdata.MeshData
+    :param target_triangles: int
+    :param strategy: str, Strategies.Cluster or Strategies.Box
+    :param name: str or None, name of the decimated mesh
+    :return: meshdata.MeshData
+    """
+
+    points, triangles = decimate(mesh_data.points, mesh_data.triangulate(), target_triangles, strategy=strategy)
+
+    return meshdata.MeshData(
+        name=name or mesh_data.name, points=points, counts=np.full(len(triangles), 3, dtype=np.int64),
+        connects=triangles.reshape(-1), matrix=mesh_data.matrix)
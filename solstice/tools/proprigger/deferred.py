@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to store hires geometry of rigs in deferred references
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import os
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+from . import profiles
+from . import utils
+
+
+class HiresModes(object):
+    Embedded = 'embedded'
+    Deferred = 'deferred'
+
+
+class DisplayTypes(object):
+    Proxy = 0
+    Hires = 1
+    Both = 2
+
+
+HIRES_REFERENCE_ATTR = 'hires_reference'
+HIRES_PARENT_ATTR = 'hires_parent'
+SWITCH_SCRIPT_NODE = 'hires_switch_script'
+SWITCH_SCRIPT = 'import solstice.tools.proprigger.deferred as deferred\ndeferred.install_switches()'
+
+# Script jobs installed in the current session, keyed by main group
+_SWITCH_JOBS = dict()
+
+
+def get_default_hires_file(asset_name):
+    """
+    Returns default path where hires geometry of the given asset is exported to
+    :param asset_name: str
+    :return: str
+    """
+
+    scene_path = mc.file(query=True, sceneName=True)
+    if scene_path:
+        root_path = os.path.dirname(scene_path)
+    else:
+        root_path = mc.workspace(expandName=mc.workspace(fileRuleEntry='scene') or 'scenes')
+
+    return os.path.join(root_path, '{}_hires.ma'.format(asset_name))
+
+
+def get_reference_path(file_path):
+    """
+    Returns the path used to reference the given file. Files located in the current workspace are referenced with
+    a path relative to the workspace root, so rigs keep loading their hires geometry if the project is moved
+    :param file_path: str
+    :return: str
+    """
+
+    file_path = os.path.abspath(file_path)
+    root_path = mc.workspace(query=True, rootDirectory=True)
+    if root_path:
+        root_path = os.path.abspath(root_path)
+        if os.path.normcase(file_path).startswith(os.path.normcase(os.path.join(root_path, ''))):
+            file_path = os.path.relpath(file_path, root_path)
+
+    return file_path.replace('\\', '/')
+
+
+def defer_hires(main_grp, hires_asset_grp, file_path):
+    """
+    Exports the hires geometry of the rig into a file and replaces it with an unloaded reference to that file
+    :param main_grp: str, rig main group
+    :param hires_asset_grp: str, group where hires geometry is located
+    :param file_path: str, file where hires geometry is exported. It is referenced with a workspace relative path
+        if possible (see get_reference_path)
+    :return: str, reference node
+    """
+
+    children = mc.listRelatives(hires_asset_grp, children=True, fullPath=True, type='transform') or list()
+    if not children:
+        return None
+
+    content_grp = mc.group(children, name='{}_content'.format(hires_asset_grp.split('|')[-1]))
+    content_grp = mc.parent(content_grp, world=True)[0]
+    profiles.export_nodes(
+        [content_grp], file_path, type='mayaAscii', preserveReferences=False, shader=True, constructionHistory=False)
+    mc.delete(content_grp)
+
+    namespace = '{}_hires'.format(main_grp.split('|')[-1])
+    reference_file = mc.file(get_reference_path(file_path), reference=True, deferReference=True, namespace=namespace)
+    reference_node = mc.referenceQuery(reference_file, referenceNode=True)
+
+    for attr_name in [HIRES_REFERENCE_ATTR, HIRES_PARENT_ATTR]:
+        if not mc.attributeQuery(attr_name, node=main_grp, exists=True):
+            mc.addAttr(main_grp, ln=attr_name, at='message')
+    # Rigs rebuilt from a spec already have the hires parent connected
+    for source, attr_name in [(reference_node, HIRES_REFERENCE_ATTR), (hires_asset_grp, HIRES_PARENT_ATTR)]:
+        source_plug = '{}.message'.format(source)
+        target_plug = '{}.{}'.format(main_grp, attr_name)
+        if not mc.isConnected(source_plug, target_plug):
+            mc.connectAttr(source_plug, target_plug, force=True)
+
+    if not mc.objExists(SWITCH_SCRIPT_NODE):
+        mc.scriptNode(scriptType=1, beforeScript=SWITCH_SCRIPT, sourceType='python', name=SWITCH_SCRIPT_NODE)
+
+    return reference_node
+
+
+def get_hires_reference(main_grp):
+    """
+    Returns deferred hires reference node of the given rig
+    :param main_grp: str
+    :return: str or None
+    """
+
+    if not mc.attributeQuery(HIRES_REFERENCE_ATTR, node=main_grp, exists=True):
+        return None
+
+    references = mc.listConnections('{}.{}'.format(main_grp, HIRES_REFERENCE_ATTR), source=True, destination=False)
+
+    return references[0] if references else None
+
+
+def set_hires_loaded(main_grp, loaded):
+    """
+    Loads or unloads deferred hires geometry of the given rig
+    :param main_grp: str
+    :param loaded: bool
+    """
+
+    reference_node = get_hires_reference(main_grp)
+    if not reference_node:
+        return
+
+    is_loaded = mc.referenceQuery(reference_node, isLoaded=True)
+    if loaded and not is_loaded:
+        new_nodes = mc.file(loadReference=reference_node, returnNewNodes=True) or list()
+        parents = mc.listConnections('{}.{}'.format(main_grp, HIRES_PARENT_ATTR), source=True, destination=False)
+        roots = [node for node in mc.ls(new_nodes, type='transform', long=True) if node.count('|') == 1]
+        if parents and roots:
+            mc.parent(roots, parents[0], relative=True)
+    elif not loaded and is_loaded:
+        mc.file(unloadReference=reference_node)
+
+
+def sync_hires(main_grp):
+    """
+    Loads or unloads deferred hires geometry depending on the current display type of the rig
+    :param main_grp: str
+    """
+
+    display_type = mc.getAttr('{}.type'.format(main_grp))
+    set_hires_loaded(main_grp, display_type in [DisplayTypes.Hires, DisplayTypes.Both])
+
+
+def install_switches():
+    """
+    Installs script jobs that load/unload deferred hires geometry when the display type of the rigs changes
+    Called by the script node stored in rigs with deferred hires geometry
+    """
+
+    main_grps = mc.ls('*.{}'.format(HIRES_REFERENCE_ATTR), recursive=True, objectsOnly=True, long=True) or list()
+    for main_grp in main_grps:
+        job = _SWITCH_JOBS.get(main_grp)
+        if job is None or not mc.scriptJob(exists=job):
+            _SWITCH_JOBS[main_grp] = mc.scriptJob(
+                attributeChange=['{}.type'.format(main_grp), lambda node=main_grp: sync_hires(node)],
+                killWithScene=True)
+        sync_hires(main_grp)
+
+
+def footprint_report(proxy_meshes, hires_meshes):
+    """
+    Returns the estimated memory used by the geometry of a rig for each display type and hires mode
+    :param proxy_meshes: list<meshdata.MeshData>
+    :param hires_meshes: list<meshdata.MeshData>
+    :return: dict
+    """
+
+    proxy_bytes = sum(mesh.estimate_bytes() for mesh in proxy_meshes)
+    hires_bytes = sum(mesh.estimate_bytes() for mesh in hires_meshes)
+
+    return {
+        'proxy': {HiresModes.Embedded: proxy_bytes + hires_bytes, HiresModes.Deferred: proxy_bytes},
+        'hires': {HiresModes.Embedded: proxy_bytes + hires_bytes, HiresModes.Deferred: proxy_bytes + hires_bytes},
+        'both': {HiresModes.Embedded: proxy_bytes + hires_bytes, HiresModes.Deferred: proxy_bytes + hires_bytes}
+    }
+
+
+def get_footprint_report(proxy_asset_grp, hires_asset_grp):
+    """
+    Returns memory footprint report of the geometry currently located in the given rig groups
+    :param proxy_asset_grp: str
+    :param hires_asset_grp: str
+    :return: dict
+    """
+
+    return footprint_report(
+        [utils.get_mesh_data(mesh) for mesh in utils.get_meshes([proxy_asset_grp])],
+        [utils.get_mesh_data(mesh) for mesh in utils.get_meshes([hires_asset_grp])])
@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains structural fingerprints of rigs used to check that rigs are built identically between builds
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import json
+import hashlib
+from collections import OrderedDict
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+from . import utils
+
+
+FINGERPRINT_VERSION = 3
+
+# Name of the virtual node that stores all the non DAG nodes of the rig
+DG_ROOT = '@dg'
+
+# Relative name of the rig main group, used in the plugs of its connections
+ROOT_NAME = '@root'
+
+# Number of decimals float attribute values are rounded to before hashing
+PRECISION = 6
+
+
+def _hash(*values):
+    hasher = hashlib.sha1()
+    for value in values:
+        hasher.update(value.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+class FingerprintNode(object):
+    """
+    Node of a rig fingerprint tree. The hash of each node depends on its own record and the hashes of its children,
+    so two subtrees with the same hash are identical
+    """
+
+    def __init__(self, name, record=None):
+        super(FingerprintNode, self).__init__()
+
+        self.name = name
+        self.record = record or dict()
+        self.children = OrderedDict()
+        self.local_hash = None
+        self.hash = None
+
+    def update_hash(self):
+        """
+        Recomputes hashes of this node and all its children
+        :return: str
+        """
+
+        self.local_hash = _hash(json.dumps(self.record, sort_keys=True))
+        children_hashes = ['{}:{}'.format(name, self.children[name].update_hash()) for name in sorted(self.children)]
+        self.hash = _hash(self.local_hash, *children_hashes)
+
+        return self.hash
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'record': self.record,
+            'hash': self.hash,
+            'children': [child.to_dict() for child in self.children.values()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        node = cls(data['name'], record=data.get('record'))
+        for child_data in data.get('children', list()):
+            node.children[child_data['name']] = cls.from_dict(child_data)
+        node.update_hash()
+
+        return node
+
+
+def build_fingerprint(records, name='root'):
+    """
+    Builds a fingerprint tree from the given node records
+    :param records: dict(str, dict), records keyed by node path relative to the rig root ('rig|control_grp')
+    :param name: str, name of the root node
+    :return: FingerprintNode
+    """
+
+    root = FingerprintNode(name)
+    for path in sorted(records, key=lambda item: item.count('|')):
+        parent = root
+        tokens = path.split('|')
+        for token in tokens[:-1]:
+            parent = parent.children.setdefault(token, FingerprintNode(token))
+        node = parent.children.setdefault(tokens[-1], FingerprintNode(tokens[-1]))
+        node.record = records[path]
+    root.update_hash()
+
+    return root
+
+
+def _diff_records(record_a, record_b):
+    changes = dict()
+    for key in sorted(set(record_a) | set(record_b)):
+        value_a = record_a.get(key)
+        value_b = record_b.get(key)
+        if value_a == value_b:
+            continue
+        if isinstance(value_a, dict) and isinstance(value_b, dict):
+            changes[key] = dict(
+                (sub_key, {'before': value_a.get(sub_key), 'after': value_b.get(sub_key)})
+                for sub_key in sorted(set(value_a) | set(value_b)) if value_a.get(sub_key) != value_b.get(sub_key))
+        elif isinstance(value_a, list) and isinstance(value_b, list):
+            set_a = set(json.dumps(item, sort_keys=True) for item in value_a)
+            set_b = set(json.dumps(item, sort_keys=True) for item in value_b)
+            changes[key] = {
+                'added': [json.loads(item) for item in sorted(set_b - set_a)],
+                'removed': [json.loads(item) for item in sorted(set_a - set_b)]}
+        else:
+            changes[key] = {'before': value_a, 'after': value_b}
+
+    return changes
+
+
+def diff_fingerprints(fingerprint_a, fingerprint_b, path=None):
+    """
+    Returns the differences between two fingerprints
+    Subtrees with equal hashes are skipped, so only changed branches are visited
+    :param fingerprint_a: FingerprintNode, reference fingerprint
+    :param fingerprint_b: FingerprintNode, new fingerprint
+    :param path: str or None, path of the compared nodes
+    :return: list<dict>
+    """
+
+    if fingerprint_a.hash == fingerprint_b.hash:
+        return list()
+
+    differences = list()
+    if fingerprint_a.local_hash != fingerprint_b.local_hash:
+        differences.append({
+            'path': path or fingerprint_b.name, 'kind': 'changed',
+            'changes': _diff_records(fingerprint_a.record, fingerprint_b.record)})
+
+    for name in sorted(set(fingerprint_a.children) | set(fingerprint_b.children)):
+        child_path = '{}|{}'.format(path, name) if path else name
+        child_a = fingerprint_a.children.get(name)
+        child_b = fingerprint_b.children.get(name)
+        if child_a is None:
+            differences.append({'path': child_path, 'kind': 'added'})
+        elif child_b is None:
+            differences.append({'path': child_path, 'kind': 'removed'})
+        else:
+            differences.extend(diff_fingerprints(child_a, child_b, path=child_path))
+
+    return differences
+
+
+def write_fingerprint(fingerprint, file_path):
+    """
+    Writes given fingerprint into a JSON file
+    :param fingerprint: FingerprintNode
+    :param file_path: str
+    """
+
+    with open(file_path, 'w') as fh:
+        json.dump({'version': FINGERPRINT_VERSION, 'fingerprint': fingerprint.to_dict()}, fh, sort_keys=True)
+
+
+def read_fingerprint(file_path):
+    """
+    Reads a fingerprint from a JSON file
+    Fingerprints written by other versions name and record nodes differently, so they cannot be compared and
+    are rejected
+    :param file_path: str
+    :return: FingerprintNode
+    """
+
+    with open(file_path, 'r') as fh:
+        data = json.load(fh)
+
+    version = data.get('version')
+    if version != FINGERPRINT_VERSION:
+        raise ValueError('Fingerprint file {} has version {}, expected version {}. Fingerprint it again'.format(
+            file_path, version, FINGERPRINT_VERSION))
+
+    return FingerprintNode.from_dict(data['fingerprint'])
+
+
+def _round_value(value):
+    if isinstance(value, float):
+        return round(value, PRECISION)
+    if isinstance(value, (list, tuple)):
+        return [_round_value(item) for item in value]
+
+    return value
+
+
+def _strip_namespace(name):
+    return '|'.join(token.split(':')[-1] for token in name.split('|'))
+
+
+def get_relative_name(long_name, root):
+    """
+    Returns the name of a node relative to the rig main group, without namespaces
+    :param long_name: str, long name of the node
+    :param root: str, long name of the rig main group
+    :return: str
+    """
+
+    if long_name == root:
+        return ROOT_NAME
+    if long_name.startswith(root + '|'):
+        return _strip_namespace(long_name[len(root) + 1:])
+
+    return '{}|{}'.format(DG_ROOT, _strip_namespace(long_name.split('|')[-1]))
+
+
+def _get_token(relative_name):
+    if relative_name.startswith(DG_ROOT + '|'):
+        return relative_name[len(DG_ROOT) + 1:]
+
+    return relative_name.replace('|', '/')
+
+
+def get_dg_names(dg_nodes, relative_name_fn):
+    """
+    Returns rig relative names of the given DG nodes. DG nodes are named after the plug they drive or, if they do
+    not drive any named node, after the plug that drives them, so names do not depend on the names Maya generates
+    for them (unitConversion1, unitConversion3 ...) nor on their namespaces
+    Nodes are named in rounds, each round only uses names of the previous rounds, so names do not depend on the
+    order nodes are visited in
+    :param dg_nodes: list<str>
+    :param relative_name_fn: callable, function that converts DAG node scene names into rig relative names
+    :return: dict(str, str)
+    """
+
+    dg_nodes = set(dg_nodes)
+    names = dict()
+
+    def _get_named(node):
+        if node in dg_nodes:
+            return names.get(node)
+        relative_name = relative_name_fn(node)
+        return None if relative_name.startswith(DG_ROOT + '|') else relative_name
+
+    candidates = dict()
+    for downstream, separator in [(True, '<'), (False, '>')]:
+        while True:
+            round_names = dict()
+            for node in dg_nodes - set(names):
+                plugs = mc.listConnections(
+                    node, source=not downstream, destination=downstream, connections=True, plugs=True) or list()
+                node_candidates = list()
+                for own_plug, other_plug in zip(plugs[::2], plugs[1::2]):
+                    other_node, other_attr = other_plug.split('.', 1)
+                    other_name = _get_named(other_node)
+                    if other_name:
+                        node_candidates.append('{}.{}{}{}'.format(
+                            _get_token(other_name), other_attr, separator, own_plug.split('.', 1)[-1]))
+                if node_candidates:
+                    candidates[node] = sorted(node_candidates)
+                    round_names[node] = '{}|{}'.format(DG_ROOT, candidates[node][0])
+            if not round_names:
+                break
+            names.update(round_names)
+
+    for node in dg_nodes - set(names):
+        names[node] = '{}|{}'.format(DG_ROOT, _strip_namespace(node.split('|')[-1]))
+
+    # A plug drives several nodes, so nodes named after the plug that drives them can share the same name
+    nodes_by_name = dict()
+    for node, name in names.items():
+        nodes_by_name.setdefault(name, list()).append(node)
+    for name, nodes in nodes_by_name.items():
+        if len(nodes) < 2:
+            continue
+        nodes.sort(key=lambda item: (mc.nodeType(item), candidates.get(item, list()), item))
+        for index, node in enumerate(nodes):
+            names[node] = '{}#{}'.format(name, index)
+
+    return names
+
+
+def get_node_record(node, relative_name_fn):
+    """
+    Returns the record (type, attribute values, lock states and input connections) of the given node
+    :param node: str
+    :param relative_name_fn: callable, function that converts scene names into rig relative names
+    :return: dict
+    """
+
+    attrs = dict()
+    attr_names = set(mc.listAttr(node, keyable=True) or list()) | set(mc.listAttr(node, userDefined=True) or list())
+    for attr_name in sorted(attr_names):
+        try:
+            attrs[attr_name] = _round_value(mc.getAttr('{}.{}'.format(node, attr_name)))
+        except Exception:
+            continue
+
+    connections = list()
+    plugs = mc.listConnections(node, source=True, destination=False, connections=True, plugs=True) or list()
+    for target_plug, source_plug in zip(plugs[::2], plugs[1::2]):
+        source_node, source_attr = source_plug.split('.', 1)
+        connections.append(['{}.{}'.format(relative_name_fn(source_node), source_attr), target_plug.split('.', 1)[-1]])
+
+    return {
+        'type': mc.nodeType(node),
+        'attrs': attrs,
+        'locked': sorted(mc.listAttr(node, locked=True) or list()),
+        'connections': sorted(connections)
+    }
+
+
+def get_rig_fingerprint(root):
+    """
+    Returns the fingerprint of a rig in the current scene
+    :param root: str, rig main group
+    :return: FingerprintNode
+    """
+
+    root = mc.ls(root, long=True)[0]
+    dag_nodes = [root] + (mc.listRelatives(root, allDescendents=True, fullPath=True) or list())
+    history = mc.ls(mc.listHistory(dag_nodes, pruneDagObjects=True) or list(), long=True)
+    dg_nodes = sorted(set(node for node in history if '|' not in node))
+
+    def _dag_relative_name(node):
+        return get_relative_name((mc.ls(node, long=True) or [node])[0], root)
+
+    # DG nodes are named after their connections, their own names are generated by Maya and change between sessions
+    dg_names = get_dg_names(dg_nodes, _dag_relative_name)
+
+    def _relative_name(node):
+        if node in dg_names:
+            return dg_names[node]
+        return _dag_relative_name(node)
+
+    records = dict()
+    for node in dag_nodes[1:] + dg_nodes:
+        records[_relative_name(node)] = get_node_record(node, _relative_name)
+
+    fingerprint = build_fingerprint(records, name=_strip_namespace(root.split('|')[-1]))
+    fingerprint.record = get_node_record(root, _relative_name)
+    fingerprint.update_hash()
+
+    return fingerprint
+
+
+def fingerprint_file(file_path, root=None, force=False):
+    """
+    Opens a rig file and returns the fingerprint of its rigs
+    :param file_path: str
+    :param root: str or None, rig main group. If not given, all root transforms of the file are fingerprinted
+    :param force: bool, Whether to discard unsaved changes of the current scene when opening the file
+    :return: dict(str, FingerprintNode)
+    """
+
+    utils.open_file(file_path, force=force)
+
+    roots = [root] if root else mc.ls(assemblies=True, long=True)
+    roots = [node for node in roots if not mc.listRelatives(node, shapes=True)]
+
+    return dict((node.split('|')[-1], get_rig_fingerprint(node)) for node in roots)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains vectorized geometry quality checks for hires and proxy meshes
+Checks work with MeshData, so they can run on mesh data exported from Maya outside the DCC
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import numpy as np
+
+from . import meshdata
+
+
+class Checks(object):
+    UnfrozenTransform = 'unfrozen_transform'
+    ZeroAreaFaces = 'zero_area_faces'
+    LaminaFaces = 'lamina_faces'
+    PolyBudget = 'poly_budget'
+    FarPivot = 'far_pivot'
+    PivotFromOrigin = 'pivot_from_origin'
+
+
+DEFAULT_SETTINGS = {
+    # Faces with an area smaller than this value are considered degenerated
+    'area_tolerance': 1e-10,
+    # Maximum difference between a mesh world matrix and the identity matrix
+    'matrix_tolerance': 1e-6,
+    # Maximum number of triangles of each mesh
+    'mesh_triangle_budget': 100000,
+    # Maximum number of triangles of all the meshes together
+    'total_triangle_budget': 500000,
+    # Maximum distance between the pivot and the mesh bounding box center, relative to the bounding box radius
+    'pivot_distance_ratio': 2.0,
+    # Maximum distance between the pivot and the world origin, assets are expected to be modeled at the origin
+    'pivot_origin_distance': 100.0
+}
+
+
+def get_face_areas(mesh_data):
+    """
+    Returns the area of each one of the mesh faces
+    Faces are fan triangulated, so the area of non planar faces is an approximation
+    :param mesh_data: meshdata.MeshData
+    :return: numpy.ndarray
+    """
+
+    triangles = mesh_data.triangulate()
+    if not len(triangles):
+        return np.zeros(mesh_data.face_count)
+
+    points = mesh_data.points
+    edges_a = points[triangles[:, 1]] - points[triangles[:, 0]]
+    edges_b = points[triangles[:, 2]] - points[triangles[:, 0]]
+    triangle_areas = 0.5 * np.linalg.norm(np.cross(edges_a, edges_b), axis=1)
+    face_index = np.repeat(np.arange(mesh_data.face_count), np.maximum(mesh_data.counts - 2, 0))
+
+    return np.bincount(face_index, weights=triangle_areas, minlength=mesh_data.face_count)
+
+
+def get_lamina_faces(mesh_data):
+    """
+    Returns the indices of the faces that share all their vertices with another face
+    :param mesh_data: meshdata.MeshData
+    :return: numpy.ndarray
+    """
+
+    if mesh_data.face_count < 2:
+        return np.zeros(0, dtype=np.int64)
+
+    # Each face is stored as a row of its sorted vertex indices, padded with -1 to the largest face size
+    face_index = np.repeat(np.arange(mesh_data.face_count), mesh_data.counts)
+    column = np.arange(mesh_data.face_vertex_count) - np.repeat(mesh_data.face_offsets, mesh_data.counts)
+    faces = np.full((mesh_data.face_count, int(mesh_data.counts.max())), -1, dtype=np.int64)
+    faces[face_index, column] = mesh_data.connects
+    faces.sort(axis=1)
+
+    _, inverse, counts = np.unique(faces, axis=0, return_inverse=True, return_counts=True)
+
+    return np.flatnonzero(counts[inverse.reshape(-1)] > 1)
+
+
+def check_mesh(mesh_data, settings=None, pivot=None):
+    """
+    Runs all the geometry checks on the given mesh
+    :param mesh_data: meshdata.MeshData
+    :param settings: dict or None, overrides of DEFAULT_SETTINGS
+    :param pivot: list<float> or None, world space pivot of the mesh. If not given, mesh world matrix position is used
+    :return: list<dict>, findings
+    """
+
+    settings = dict(DEFAULT_SETTINGS, **(settings or dict()))
+    findings = list()
+
+    if not np.allclose(mesh_data.matrix, np.identity(4), atol=settings['matrix_tolerance']):
+        findings.append({'check': Checks.UnfrozenTransform, 'message': 'Mesh transform is not frozen'})
+
+    zero_area = np.flatnonzero(get_face_areas(mesh_data) <= settings['area_tolerance'])
+    if len(zero_area):
+        findings.append({'check': Checks.ZeroAreaFaces, 'faces': zero_area.tolist(),
+                         'message': '{} faces with zero area'.format(len(zero_area))})
+
+    lamina = get_lamina_faces(mesh_data)
+    if len(lamina):
+        findings.append({'check': Checks.LaminaFaces, 'faces': lamina.tolist(),
+                         'message': '{} lamina faces'.format(len(lamina))})
+
+    triangle_count = mesh_data.triangle_count
+    if triangle_count > settings['mesh_triangle_budget']:
+        findings.append({'check': Checks.PolyBudget, 'message': '{} triangles exceed budget of {}'.format(
+            triangle_count, settings['mesh_triangle_budget'])})
+
+    if mesh_data.vertex_count:
+        world_points = mesh_data.world_points
+        bounds_min = world_points.min(axis=0)
+        bounds_max = world_points.max(axis=0)
+        center = (bounds_min + bounds_max) * 0.5
+        radius = max(float(np.linalg.norm(bounds_max - bounds_min)) * 0.5, 1e-6)
+        pivot = np.asarray(pivot if pivot is not None else mesh_data.matrix[3, :3], dtype=np.float64)
+        distance = float(np.linalg.norm(pivot - center))
+        if distance > radius * settings['pivot_distance_ratio']:
+            findings.append({'check': Checks.FarPivot, 'distance': distance,
+                             'message': 'Pivot is {:.3f} units away from the mesh center'.format(distance)})
+        origin_distance = float(np.linalg.norm(pivot))
+        if origin_distance > settings['pivot_origin_distance']:
+            findings.append({'check': Checks.PivotFromOrigin, 'distance': origin_distance,
+                             'message': 'Pivot is {:.3f} units away from the world origin'.format(origin_distance)})
+
+    return findings
+
+
+def run_qc(meshes_data, settings=None, pivots=None):
+    """
+    Runs geometry checks on the given meshes and returns a report with per mesh findings and poly budgets
+    :param meshes_data: list<meshdata.MeshData>
+    :param settings: dict or None, overrides of DEFAULT_SETTINGS
+    :param pivots: dict(str, list<float>) or None, world space pivot of each mesh
+    :return: dict
+    """
+
+    settings = dict(DEFAULT_SETTINGS, **(settings or dict()))
+    pivots = pivots or dict()
+
+    meshes = dict()
+    for mesh_data in meshes_data:
+        meshes[mesh_data.name] = {
+            'triangles': mesh_data.triangle_count,
+            'findings': check_mesh(mesh_data, settings=settings, pivot=pivots.get(mesh_data.name))
+        }
+
+    total_triangles = sum(mesh['triangles'] for mesh in meshes.values())
+    for mesh in meshes.values():
+        mesh['budget_share'] = round(mesh['triangles'] / total_triangles, 4) if total_triangles else 0.0
+
+    return {
+        'meshes': meshes,
+        'total_triangles': total_triangles,
+        'total_triangle_budget': settings['total_triangle_budget'],
+        'over_budget': total_triangles > settings['total_triangle_budget'],
+        'findings_count': sum(len(mesh['findings']) for mesh in meshes.values())
+    }
+
+
+def run_qc_files(file_paths, settings=None):
+    """
+    Runs geometry checks on mesh data stored in NumPy .npz files (see MeshData.save)
+    :param file_paths: list<str>
+    :param settings: dict or None, overrides of DEFAULT_SETTINGS
+    :return: dict
+    """
+
+    return run_qc([meshdata.MeshData.load(file_path) for file_path in file_paths], settings=settings)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains duplicated geometry detection used to instance repeated meshes
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+from collections import OrderedDict
+
+import numpy as np
+
+from . import bbox
+
+
+def mesh_hash(mesh_data, decimals=5):
+    """
+    Returns a hash that identifies the topology and the object space points of the given mesh
+    Points are rounded so meshes that only differ by floating point noise share the same hash
+    :param mesh_data: meshdata.MeshData
+    :param decimals: int, number of decimals points are rounded to
+    :return: str
+    """
+
+    # Adding 0.0 removes negative zeros, otherwise -0.0 and 0.0 would produce different bytes
+    points = np.round(mesh_data.points, decimals) + 0.0
+    uvs = np.round(mesh_data.uvs, decimals) + 0.0
+
+    return bbox.geometry_hash(mesh_data.counts, mesh_data.connects, points, uvs)
+
+
+def find_duplicates(meshes_data, decimals=5):
+    """
+    Groups given meshes by their geometry
+    :param meshes_data: list<meshdata.MeshData>
+    :param decimals: int, number of decimals points are rounded to
+    :return: list<tuple(MeshData, list<MeshData>)>, master mesh and its duplicates
+    """
+
+    groups = OrderedDict()
+    for mesh_data in meshes_data:
+        groups.setdefault(mesh_hash(mesh_data, decimals=decimals), list()).append(mesh_data)
+
+    return [(group[0], group[1:]) for group in groups.values() if len(group) > 1]
+
+
+class InstancingReport(object):
+    """
+    Summary of the savings obtained by instancing duplicated meshes
+    """
+
+    def __init__(self, duplicates):
+        super(InstancingReport, self).__init__()
+
+        self._duplicates = duplicates
+
+    def __str__(self):
+        return 'Instanced {} meshes into {} shapes. Memory saved: {:.2f} MB. File size saved: {:.2f} MB'.format(
+            self.instanced_count, self.master_count,
+            self.memory_saved / (1024.0 * 1024.0), self.file_size_saved / (1024.0 * 1024.0))
+
+    @property
+    def master_count(self):
+        return len(self._duplicates)
+
+    @property
+    def instanced_count(self):
+        return sum(len(duplicates) for _, duplicates in self._duplicates)
+
+    @property
+    def memory_saved(self):
+        return sum(mesh.estimate_bytes() for _, duplicates in self._duplicates for mesh in duplicates)
+
+    @property
+    def file_size_saved(self):
+        return sum(mesh.estimate_bytes(ascii=True) for _, duplicates in self._duplicates for mesh in duplicates)
+
+    def as_dict(self):
+        return {
+            'masters': self.master_count,
+            'instanced': self.instanced_count,
+            'memory_saved': self.memory_saved,
+            'file_size_saved': self.file_size_saved,
+            'groups': {master.name: [mesh.name for mesh in duplicates] for master, duplicates in self._duplicates}
+        }
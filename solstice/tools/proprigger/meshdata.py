@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains DCC agnostic mesh data containers
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import numpy as np
+
+
+# Approximated amount of bytes stored per component in a binary/ASCII scene file
+POINT_BYTES = 12
+FACE_VERTEX_BYTES = 8
+FACE_BYTES = 4
+UV_BYTES = 8
+ASCII_POINT_BYTES = 36
+ASCII_FACE_VERTEX_BYTES = 14
+ASCII_FACE_BYTES = 10
+ASCII_UV_BYTES = 24
+
+
+class MeshData(object):
+    """
+    Stores points and topology of a polygon mesh as NumPy arrays
+    """
+
+    def __init__(self, name, points, counts, connects, uvs=None, matrix=None):
+        super(MeshData, self).__init__()
+
+        self.name = name
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.counts = np.asarray(counts, dtype=np.int64).reshape(-1)
+        self.connects = np.asarray(connects, dtype=np.int64).reshape(-1)
+        self.uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2) if uvs is not None else np.zeros((0, 2))
+        self.matrix = np.asarray(matrix, dtype=np.float64).reshape(4, 4) if matrix is not None else np.identity(4)
+
+    def __repr__(self):
+        return 'MeshData({}, vertices={}, faces={})'.format(self.name, self.vertex_count, self.face_count)
+
+    @property
+    def vertex_count(self):
+        return len(self.points)
+
+    @property
+    def face_count(self):
+        return len(self.counts)
+
+    @property
+    def face_vertex_count(self):
+        return len(self.connects)
+
+    @property
+    def triangle_count(self):
+        return int(np.maximum(self.counts - 2, 0).sum())
+
+    @property
+    def face_offsets(self):
+        """
+        Returns the index in the connects array where each face starts
+        :return: numpy.ndarray
+        """
+
+        offsets = np.zeros(len(self.counts), dtype=np.int64)
+        if len(self.counts):
+            offsets[1:] = np.cumsum(self.counts)[:-1]
+        return offsets
+
+    @property
+    def world_points(self):
+        """
+        Returns mesh points transformed by the mesh world matrix
+        :return: numpy.ndarray
+        """
+
+        return self.points.dot(self.matrix[:3, :3]) + self.matrix[3, :3]
+
+    def triangulate(self):
+        """
+        Returns fan triangulation of all the mesh faces
+        :return: numpy.ndarray, (N, 3) array of vertex indices
+        """
+
+        tri_counts = np.maximum(self.counts - 2, 0)
+        total = int(tri_counts.sum())
+        if not total:
+            return np.zeros((0, 3), dtype=np.int64)
+
+        face_index = np.repeat(np.arange(len(self.counts)), tri_counts)
+        tri_starts = np.zeros(len(tri_counts), dtype=np.int64)
+        tri_starts[1:] = np.cumsum(tri_counts)[:-1]
+        local = np.arange(total) - np.repeat(tri_starts, tri_counts)
+        offsets = self.face_offsets[face_index]
+
+        return np.stack([
+            self.connects[offsets],
+            self.connects[offsets + local + 1],
+            self.connects[offsets + local + 2]], axis=1)
+
+    def estimate_bytes(self, ascii=False):
+        """
+        Returns an estimation of the memory (or file size) used by this mesh
+        :param ascii: bool, Whether to estimate size in an ASCII scene file or in memory
+        :return: int
+        """
+
+        counts = [self.vertex_count, self.face_vertex_count, self.face_count, len(self.uvs)]
+        if ascii:
+            sizes = [ASCII_POINT_BYTES, ASCII_FACE_VERTEX_BYTES, ASCII_FACE_BYTES, ASCII_UV_BYTES]
+        else:
+            sizes = [POINT_BYTES, FACE_VERTEX_BYTES, FACE_BYTES, UV_BYTES]
+
+        return int(sum(count * size for count, size in zip(counts, sizes)))
+
+    def save(self, file_path):
+        """
+        Stores mesh data in a NumPy .npz file
+        :param file_path: str
+        """
+
+        np.savez_compressed(
+            file_path, name=np.array(self.name), points=self.points, counts=self.counts,
+            connects=self.connects, uvs=self.uvs, matrix=self.matrix)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads mesh data from a NumPy .npz file
+        :param file_path: str
+        :return: MeshData
+        """
+
+        with np.load(file_path) as data:
+            return cls(
+                name=str(data['name']), points=data['points'], counts=data['counts'],
+                connects=data['connects'], uvs=data['uvs'], matrix=data['matrix'])
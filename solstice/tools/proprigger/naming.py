@@ -28,12 +28,17 @@ class Names(object):
     ConstraintGroup = 'constraint'
     RootGroup = 'root'
     DecomposeMatrix = 'decomposeMatrix'
+    MultMatrix = 'multMatrix'
 
 
 def build_name(*args):
     return Names.Separator.join(args)
 
 
+# Cache of already resolved alphabetic values, keyed by number
+_ALPHAS = dict()
+
+
 def get_alpha(value, capital=False):
     """
     Returns an alphabetic value from a number. Eg: a-z, aa-zz
@@ -42,6 +47,14 @@ def get_alpha(value, capital=False):
     :return: str, alphabet character
     """
 
+    alpha = _ALPHAS.get(value)
+    if alpha is None:
+        alpha = _ALPHAS[value] = _resolve_alpha(value)
+
+    return alpha.upper() if capital else alpha
+
+
+def _resolve_alpha(value):
     base_power = base_start = base_end = 0
     while value >= base_end:
         base_power += 1
@@ -52,9 +65,8 @@ def get_alpha(value, capital=False):
     alphas = ['a'] * base_power
     for index in range(base_power - 1, -1, -1):
         alphas[index] = chr(97 + (base_index % 26))
-        base_index /= 26
+        base_index //= 26
 
-    if capital: return ''.join(alphas).upper()
     return ''.join(alphas)
 
 
@@ -73,3 +85,117 @@ def remove_suffix(name):
     name_no_suffix = name[:-len(suffix)]
 
     return name_no_suffix
+
+
+class NameRegistry(object):
+    """
+    Keeps track of the names claimed during a build so unique names can be generated without querying the scene
+    Nodes created by Maya on behalf of the build (shapes, constraints ...) do not claim their names, so if an exists
+    function is given, names missing in the registry are checked in the scene before claiming them
+    """
+
+    def __init__(self, names=None, namespace=None, exists_fn=None):
+        super(NameRegistry, self).__init__()
+
+        self._namespace = namespace.strip(':') if namespace else None
+        self._exists_fn = exists_fn
+        self._names = set()
+        self._counters = dict()
+
+        self.update(names or list())
+
+    def __contains__(self, name):
+        return self._normalize(name) in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def update(self, names):
+        """
+        Registers the given existing names, names out of the registry namespace are ignored
+        :param names: list<str>
+        """
+
+        for name in names:
+            name = self._normalize(name)
+            if name:
+                self._names.add(name)
+
+    def register(self, name):
+        """
+        Registers the given name as used, even if it was already claimed
+        :param name: str
+        :return: str
+        """
+
+        self.update([name])
+
+        return name
+
+    def release(self, name):
+        """
+        Releases the given name so it can be claimed again
+        :param name: str
+        """
+
+        self._names.discard(self._normalize(name))
+
+    def claim(self, name):
+        """
+        Returns an unique name based on the given one and registers it
+        If the name is already used, an alphabetic suffix is added (nameA, nameB, ...)
+        :param name: str
+        :return: str
+        """
+
+        if not self._is_used(name):
+            self._names.add(name)
+            return name
+
+        # Counters remember the last suffix used for each base name, so each claim checks few candidates
+        index = self._counters.get(name, 0)
+        candidate = '{}{}'.format(name, get_alpha(index, capital=True))
+        while self._is_used(candidate):
+            index += 1
+            candidate = '{}{}'.format(name, get_alpha(index, capital=True))
+        self._counters[name] = index + 1
+        self._names.add(candidate)
+
+        return candidate
+
+    def _is_used(self, name):
+        """
+        Internal function that returns whether the given name is registered or, if not, whether a node with that
+        name exists in the scene. Existing names are registered, so the scene is only checked once per name
+        """
+
+        if name in self._names:
+            return True
+        if not self._exists_fn:
+            return False
+
+        scene_name = '{}:{}'.format(self._namespace, name) if self._namespace else name
+        if not self._exists_fn(scene_name):
+            return False
+        self._names.add(name)
+
+        return True
+
+    def _normalize(self, name):
+        """
+        Internal function that returns the name relative to the registry namespace or None if the name is not
+        located in the registry namespace
+        """
+
+        name = name.split('|')[-1]
+        if not self._namespace:
+            return name if ':' not in name.lstrip(':') else None
+
+        prefix = '{}:'.format(self._namespace)
+        name = name.lstrip(':')
+        if not name.startswith(prefix):
+            return None
+
+        name = name[len(prefix):]
+
+        return name if ':' not in name else None
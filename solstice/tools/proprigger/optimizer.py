@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains post build optimizations used to reduce rig node count and file size
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import os
+import tempfile
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+from . import naming
+from . import profiles
+from . import tag
+from . import utils
+
+IDENTITY_MATRIX = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+# Suffixes of RigControl groups that can be removed if nothing drives or reads them
+COLLAPSIBLE_SUFFIXES = [naming.Names.AutoGroup, naming.Names.ConstraintGroup]
+
+
+def _get_rig_nodes(main_grp):
+    nodes = [main_grp] + (mc.listRelatives(main_grp, allDescendents=True, fullPath=True) or list())
+    history = mc.listHistory(nodes, pruneDagObjects=True) or list()
+
+    return set(mc.ls(nodes + history, long=True))
+
+
+def _is_identity(node):
+    matrix = mc.xform(node, query=True, matrix=True, objectSpace=True)
+    pivots = mc.xform(node, query=True, rotatePivot=True, objectSpace=True) + mc.xform(
+        node, query=True, scalePivot=True, objectSpace=True)
+
+    return all(abs(a - b) < 1e-6 for a, b in zip(matrix, IDENTITY_MATRIX)) and all(abs(p) < 1e-6 for p in pivots)
+
+
+def _has_connections(node):
+    connections = mc.listConnections(node, source=True, destination=True, skipConversionNodes=True) or list()
+    return bool([connection for connection in connections if connection != node])
+
+
+def get_shading_nodes(nodes=None):
+    """
+    Returns shading engines and materials of the scene or, if nodes are given, shading engines assigned to them
+    :param nodes: list<str> or None
+    :return: set(str)
+    """
+
+    if nodes is None:
+        return set((mc.ls(type='shadingEngine') or list()) + (mc.ls(materials=True) or list()))
+    if not nodes:
+        return set()
+
+    return set(mc.listConnections(list(nodes), source=False, destination=True, type='shadingEngine') or list())
+
+
+def get_file_size(nodes):
+    """
+    Returns the size of the ASCII file that stores the given nodes
+    :param nodes: list<str>
+    :return: int
+    """
+
+    file_handle, file_path = tempfile.mkstemp(suffix='.ma')
+    os.close(file_handle)
+    try:
+        profiles.export_nodes(
+            nodes, file_path, type='mayaAscii', preserveReferences=True, shader=True, channels=True,
+            constraints=True, expressions=True, constructionHistory=True)
+        return os.path.getsize(file_path)
+    finally:
+        os.remove(file_path)
+
+
+class RigOptimizer(object):
+    """
+    Removes or collapses rig nodes that do not contribute to any deformation, control or visibility path
+    Main group, rig groups connected to the tag data node and controls connected to the main group are never removed
+    """
+
+    def __init__(self, main_grp, empty_groups=None, measure_file_size=False, shading_nodes=None):
+        super(RigOptimizer, self).__init__()
+
+        self._main_grp = main_grp
+        self._empty_groups = empty_groups or list()
+        self._shading_nodes = shading_nodes or set()
+        self._measure_file_size = measure_file_size
+        self._report = dict()
+
+    @property
+    def report(self):
+        return self._report
+
+    def get_protected_nodes(self):
+        """
+        Returns nodes that are part of the pipeline contract of the rig and cannot be removed
+        :return: set(str)
+        """
+
+        protected = [self._main_grp]
+        tag_data_node = tag.get_tag_data_node(self._main_grp)
+        if tag_data_node:
+            protected.append(tag_data_node)
+            protected.extend(mc.listConnections(tag_data_node, source=True, destination=True) or list())
+        protected.extend(mc.listConnections(self._main_grp, source=True, destination=False, type='transform') or [])
+
+        return set(mc.ls(protected, long=True))
+
+    def optimize(self):
+        """
+        Runs all the optimizations and returns a report with the node count and file size reduction
+        :return: dict
+        """
+
+        rig_nodes = _get_rig_nodes(self._main_grp)
+        nodes_before = len(rig_nodes)
+        size_before = get_file_size([self._main_grp]) if self._measure_file_size else None
+
+        protected = self.get_protected_nodes()
+        self._report = {
+            'removed_groups': self.remove_empty_groups(protected),
+            'collapsed_groups': self.collapse_control_groups(protected),
+            'deleted_history': self.delete_history(),
+            'deleted_shading_nodes': self.delete_unused_shading_nodes(self._shading_nodes)
+        }
+
+        nodes_after = len(_get_rig_nodes(self._main_grp))
+        self._report.update({'nodes_before': nodes_before, 'nodes_after': nodes_after})
+        if self._measure_file_size:
+            size_after = get_file_size([self._main_grp])
+            self._report.update({'file_size_before': size_before, 'file_size_after': size_after})
+
+        tp.logger.info('Rig optimized: {} nodes -> {} nodes{}'.format(
+            nodes_before, nodes_after, ', {} bytes -> {} bytes'.format(
+                size_before, self._report['file_size_after']) if self._measure_file_size else ''))
+
+        return self._report
+
+    def remove_empty_groups(self, protected):
+        """
+        Removes given groups if they have no children and nothing is connected to them
+        :param protected: set(str)
+        :return: list<str>, removed groups
+        """
+
+        removed = list()
+        for grp in mc.ls(self._empty_groups, long=True):
+            if grp in protected or mc.listRelatives(grp, children=True) or _has_connections(grp):
+                continue
+            mc.delete(grp)
+            removed.append(grp)
+
+        return removed
+
+    def collapse_control_groups(self, protected):
+        """
+        Removes control auto/constraint groups that have an identity transform and nothing connected to them,
+        parenting their children to their parent
+        :param protected: set(str)
+        :return: list<str>, collapsed groups
+        """
+
+        candidates = list()
+        for suffix in COLLAPSIBLE_SUFFIXES:
+            pattern = '*{}{}'.format(naming.Names.Separator, suffix)
+            candidates.extend(mc.ls(pattern, type='transform', long=True, recursive=True) or list())
+
+        # Deepest groups are collapsed first, so parent paths of the pending candidates remain valid
+        root_path = '{}|'.format(mc.ls(self._main_grp, long=True)[0])
+        collapsed = list()
+        for grp in sorted(set(candidates), key=lambda node: -node.count('|')):
+            if not grp.startswith(root_path) or grp in protected:
+                continue
+            if _has_connections(grp) or not _is_identity(grp):
+                continue
+            parent = mc.listRelatives(grp, parent=True, fullPath=True)
+            children = mc.listRelatives(grp, children=True, fullPath=True) or list()
+            if not parent:
+                continue
+            if children:
+                mc.parent(children, parent[0], relative=True)
+            mc.delete(grp)
+            collapsed.append(grp)
+
+        return collapsed
+
+    def delete_history(self):
+        """
+        Deletes construction history of the rig meshes that are not deformed
+        :return: list<str>, meshes whose history was deleted
+        """
+
+        cleaned = list()
+        for mesh in utils.get_meshes([self._main_grp]):
+            history = mc.listHistory(mesh, pruneDagObjects=True) or list()
+            if not history or mc.ls(history, type='geometryFilter'):
+                continue
+            mc.delete(mesh, constructionHistory=True)
+            cleaned.append(mesh)
+
+        return cleaned
+
+    def delete_unused_shading_nodes(self, shading_nodes):
+        """
+        Deletes the given shading engines that have no geometry assigned and the given materials that only feed
+        those shading engines, together with the nodes of their shading networks that nothing else uses
+        Shading nodes that are not given (shaders of the user) are never deleted
+        :param shading_nodes: set(str), shading engines and materials imported by the build or left behind by
+            deferred hires geometry
+        :return: int, number of deleted nodes
+        """
+
+        default_nodes = set(mc.ls(defaultNodes=True) or list())
+        candidates = list(set(mc.ls(list(shading_nodes)) or list()) - default_nodes)
+        if not candidates:
+            return 0
+
+        def _get_future(node, **kwargs):
+            return set(mc.ls(mc.listHistory(node, future=True) or list(), **kwargs) or list())
+
+        unused = set(engine for engine in mc.ls(candidates, type='shadingEngine') or list()
+                     if not mc.sets(engine, query=True))
+        unused.update(material for material in mc.ls(candidates, materials=True) or list()
+                      if _get_future(material, type='shadingEngine').issubset(unused))
+        if not unused:
+            return 0
+
+        network = set(mc.ls(mc.listHistory(list(unused)) or list()) or list())
+        network -= unused | default_nodes | set(mc.ls(list(network), dag=True) or list())
+        deleted = sorted(unused) + mc.ls(
+            mc.listConnections(list(unused), source=False, destination=True) or list(), type='materialInfo')
+        for node in sorted(network):
+            if _get_future(node, type='shadingEngine').issubset(unused) and _get_future(
+                    node, materials=True).issubset(unused):
+                deleted.append(node)
+        mc.delete(deleted)
+
+        return len(deleted)
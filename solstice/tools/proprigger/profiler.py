@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains rig complexity profiler used to compare rig costs between builds
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import json
+from collections import Counter, defaultdict, deque
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+from . import utils
+
+
+REPORT_VERSION = 1
+
+# Estimated relative cost of evaluating each node type once per frame
+NODE_WEIGHTS = {
+    'transform': 1.0,
+    'joint': 1.5,
+    'nurbsCurve': 0.5,
+    'parentConstraint': 4.0,
+    'scaleConstraint': 3.0,
+    'orientConstraint': 3.0,
+    'pointConstraint': 2.5,
+    'aimConstraint': 4.0,
+    'animCurveUU': 1.0,
+    'animCurveUL': 1.0,
+    'animCurveUA': 1.0,
+    'animCurveTL': 1.0,
+    'animCurveTA': 1.0,
+    'animCurveTU': 1.0,
+    'decomposeMatrix': 1.0,
+    'multMatrix': 1.0,
+    'skinCluster': 2.0,
+    'unitConversion': 0.2,
+}
+DEFAULT_NODE_WEIGHT = 0.5
+
+# Cost per vertex of the meshes that are deformed (meshes with connected inputs) each frame
+DEFORMED_VERTEX_WEIGHT = 0.001
+
+
+def _get_components(nodes, outputs):
+    """
+    Returns the strongly connected component of each node of the graph (iterative Tarjan's algorithm)
+    :param nodes: list<str>
+    :param outputs: dict(str, set(str)), targets of each node
+    :return: dict(str, str), node and the root node of its component
+    """
+
+    index = dict()
+    low = dict()
+    stack = list()
+    on_stack = set()
+    components = dict()
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(outputs.get(root, ())))]
+        while work:
+            node, targets = work[-1]
+            for target in targets:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(outputs.get(target, ()))))
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        components[member] = node
+                        if member == node:
+                            break
+
+    return components
+
+
+def get_dg_depth(nodes, edges):
+    """
+    Returns the length of the longest dependency chain of the graph
+    Nodes of a cycle are measured as a single node, so nodes downstream of a cycle are still measured
+    :param nodes: list<str>
+    :param edges: list<tuple(str, str)>, source and target nodes of each dependency
+    :return: int
+    """
+
+    outputs = defaultdict(set)
+    node_set = set(nodes)
+    for source, target in set(edges):
+        if source != target and source in node_set and target in node_set:
+            outputs[source].add(target)
+
+    components = _get_components(list(node_set), outputs)
+    component_outputs = defaultdict(set)
+    in_degree = dict((component, 0) for component in set(components.values()))
+    for source, targets in outputs.items():
+        for target in targets:
+            source_component, target_component = components[source], components[target]
+            if source_component != target_component and target_component not in component_outputs[source_component]:
+                component_outputs[source_component].add(target_component)
+                in_degree[target_component] += 1
+
+    depth = dict((component, 1) for component in in_degree)
+    queue = deque(component for component, degree in in_degree.items() if degree == 0)
+    while queue:
+        component = queue.popleft()
+        for target in component_outputs[component]:
+            depth[target] = max(depth[target], depth[component] + 1)
+            in_degree[target] -= 1
+            if not in_degree[target]:
+                queue.append(target)
+
+    return max(depth.values()) if depth else 0
+
+
+def analyze_graph(nodes, connections, hierarchy=None, vertex_counts=None, name=None):
+    """
+    Returns a complexity report of the given rig graph
+    :param nodes: dict(str, str), node names and their types
+    :param connections: list<tuple(str, str)>, source and target nodes of each connection
+    :param hierarchy: list<tuple(str, str)>, parent and child of each DAG relationship
+    :param vertex_counts: dict(str, int), vertex count of each mesh
+    :param name: str or None, name of the profiled rig
+    :return: dict
+    """
+
+    vertex_counts = vertex_counts or dict()
+    connections = [(source, target) for source, target in connections if source in nodes and target in nodes]
+    connected_targets = set(target for _, target in connections)
+
+    # Children that drive their parent (constraints parented under the constrained node) do not depend on it
+    driven = set(connections)
+    hierarchy = [(parent, child) for parent, child in hierarchy or list() if (child, parent) not in driven]
+
+    evaluation_weight = 0.0
+    for node, node_type in nodes.items():
+        if node_type == 'mesh':
+            if node in connected_targets:
+                evaluation_weight += vertex_counts.get(node, 0) * DEFORMED_VERTEX_WEIGHT
+            continue
+        evaluation_weight += NODE_WEIGHTS.get(node_type, DEFAULT_NODE_WEIGHT)
+
+    return {
+        'version': REPORT_VERSION,
+        'name': name,
+        'node_count': len(nodes),
+        'node_types': dict(Counter(nodes.values())),
+        'connection_count': len(connections),
+        'dg_depth': get_dg_depth(list(nodes.keys()), connections + hierarchy),
+        'evaluation_weight': round(evaluation_weight, 3)
+    }
+
+
+def compare_reports(report_a, report_b):
+    """
+    Returns the differences between two complexity reports
+    :param report_a: dict, reference report
+    :param report_b: dict, new report
+    :return: dict
+    """
+
+    diff = dict()
+    for key in ['node_count', 'connection_count', 'dg_depth', 'evaluation_weight']:
+        value_a = report_a.get(key, 0)
+        value_b = report_b.get(key, 0)
+        if value_a != value_b:
+            diff[key] = {'before': value_a, 'after': value_b, 'delta': round(value_b - value_a, 3)}
+
+    types_a = report_a.get('node_types', dict())
+    types_b = report_b.get('node_types', dict())
+    type_diff = dict()
+    for node_type in sorted(set(types_a) | set(types_b)):
+        delta = types_b.get(node_type, 0) - types_a.get(node_type, 0)
+        if delta:
+            type_diff[node_type] = delta
+    if type_diff:
+        diff['node_types'] = type_diff
+
+    return diff
+
+
+def check_budget(report, budget):
+    """
+    Returns the report values that exceed the given budget
+    :param report: dict
+    :param budget: dict, maximum allowed value for report keys (node_count, evaluation_weight ...)
+    :return: dict
+    """
+
+    return dict((key, {'value': report.get(key), 'budget': limit})
+                for key, limit in budget.items() if report.get(key) is not None and report.get(key) > limit)
+
+
+def write_report(report, file_path):
+    """
+    Writes given report into a JSON file
+    :param report: dict
+    :param file_path: str
+    """
+
+    with open(file_path, 'w') as fh:
+        json.dump(report, fh, indent=4, sort_keys=True)
+
+
+def read_report(file_path):
+    """
+    Reads a report from a JSON file
+    :param file_path: str
+    :return: dict
+    """
+
+    with open(file_path, 'r') as fh:
+        return json.load(fh)
+
+
+def collect_graph(root):
+    """
+    Returns the nodes, connections and hierarchy of a rig in the current scene
+    :param root: str, rig main group
+    :return: tuple(dict, list, list, dict)
+    """
+
+    dag_nodes = mc.ls([root] + (mc.listRelatives(root, allDescendents=True, fullPath=True) or list()), long=True)
+    history = mc.ls(mc.listHistory(dag_nodes, pruneDagObjects=True) or list(), long=True)
+    node_names = list(set(dag_nodes) | set(history))
+
+    typed = mc.ls(node_names, showType=True, long=True) or list()
+    nodes = dict(zip(typed[::2], typed[1::2]))
+
+    long_names = dict()
+
+    def _get_long_name(plug):
+        node = plug.split('.')[0]
+        if node not in long_names:
+            found = mc.ls(node, long=True)
+            long_names[node] = found[0] if found else None
+        return long_names[node]
+
+    connections = list()
+    plugs = mc.listConnections(list(nodes.keys()), connections=True, plugs=True, source=True, destination=False) or []
+    for target_plug, source_plug in zip(plugs[::2], plugs[1::2]):
+        source = _get_long_name(source_plug)
+        target = _get_long_name(target_plug)
+        if source and target:
+            connections.append((source, target))
+
+    hierarchy = list()
+    for node in dag_nodes:
+        parent = node.rsplit('|', 1)[0]
+        if parent in nodes:
+            hierarchy.append((parent, node))
+
+    vertex_counts = dict()
+    for node, node_type in nodes.items():
+        if node_type == 'mesh':
+            vertex_counts[node] = mc.polyEvaluate(node, vertex=True)
+
+    return nodes, connections, hierarchy, vertex_counts
+
+
+def profile_rig(root):
+    """
+    Returns the complexity report of a rig in the current scene
+    :param root: str, rig main group
+    :return: dict
+    """
+
+    nodes, connections, hierarchy, vertex_counts = collect_graph(root)
+
+    return analyze_graph(nodes, connections, hierarchy=hierarchy, vertex_counts=vertex_counts,
+                         name=root.split('|')[-1])
+
+
+def profile_file(file_path, root=None, force=False):
+    """
+    Opens a rig file and returns the complexity report of its rigs
+    :param file_path: str
+    :param root: str or None, rig main group. If not given, all root transforms of the file are profiled
+    :param force: bool, Whether to discard unsaved changes of the current scene when opening the file
+    :return: dict(str, dict)
+    """
+
+    utils.open_file(file_path, force=force)
+
+    roots = [root] if root else mc.ls(assemblies=True, long=True)
+    roots = [node for node in roots if not mc.listRelatives(node, shapes=True)]
+
+    return dict((node.split('|')[-1], profile_rig(node)) for node in roots)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains build profiles that control viewport and selection side effects of rig builds
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+
+
+class Profiles(object):
+    Interactive = 'interactive'
+    Batch = 'batch'
+    Benchmark = 'benchmark'
+
+
+PROFILE_SETTINGS = {
+    Profiles.Interactive: {'refresh': True, 'frame': True, 'animate': True, 'suspend_refresh': False, 'report': False},
+    Profiles.Batch: {'refresh': False, 'frame': False, 'animate': False, 'suspend_refresh': True, 'report': False},
+    Profiles.Benchmark: {'refresh': False, 'frame': False, 'animate': False, 'suspend_refresh': True, 'report': True}
+}
+
+
+@contextmanager
+def keep_selection():
+    """
+    Context manager that restores the selection of the user once the wrapped code is executed
+    """
+
+    selection = mc.ls(selection=True, long=True)
+    try:
+        yield
+    finally:
+        if selection:
+            mc.select(selection, replace=True)
+        else:
+            mc.select(clear=True)
+
+
+def export_nodes(nodes, file_path, **kwargs):
+    """
+    Exports given nodes into a file. Maya only exports selected nodes, so the selection of the user is restored
+    after the export
+    :param nodes: list<str>
+    :param file_path: str
+    :param kwargs: dict, flags of the Maya file command (type, shader, constructionHistory, etc)
+    :return: str, exported file path
+    """
+
+    with keep_selection():
+        mc.select(nodes, replace=True)
+        return mc.file(file_path, force=True, exportSelected=True, **kwargs)
+
+
+class BuildProfile(object):
+    """
+    Class that gathers all viewport and selection side effects of a build, so they can be disabled in batch builds,
+    and records the time spent in each build stage
+    """
+
+    def __init__(self, name=None):
+        super(BuildProfile, self).__init__()
+
+        if name is None:
+            name = Profiles.Batch if mc.about(batch=True) else Profiles.Interactive
+        if name not in PROFILE_SETTINGS:
+            raise ValueError('Build profile "{}" is not valid. Valid profiles: {}'.format(
+                name, ', '.join(sorted(PROFILE_SETTINGS.keys()))))
+
+        self._name = name
+        self._settings = PROFILE_SETTINGS[name]
+        self._timings = OrderedDict()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def timings(self):
+        """
+        Returns time (in seconds) spent in each one of the build stages
+        :return: OrderedDict
+        """
+
+        return self._timings
+
+    def refresh(self):
+        """
+        Forces a viewport refresh, only in profiles that draw the viewport
+        """
+
+        if self._settings['refresh']:
+            mc.refresh()
+
+    def frame(self, nodes=None):
+        """
+        Frames given nodes in the viewport, only in profiles that draw the viewport
+        Selection is restored after framing the nodes
+        :param nodes: list<str> or None, nodes to frame. If not given, all the scene is framed
+        """
+
+        if not self._settings['frame']:
+            return
+
+        with keep_selection():
+            if nodes:
+                mc.select(nodes, replace=True)
+                mc.viewFit(animate=self._settings['animate'])
+            else:
+                mc.viewFit(allObjects=True, animate=self._settings['animate'])
+
+    def begin(self):
+        """
+        Starts recording the timings of a new build
+        """
+
+        self._timings = OrderedDict()
+
+    def end(self):
+        """
+        Ends the current build, logging its timings in profiles that report them
+        """
+
+        if self._settings['report']:
+            tp.logger.info(self.report())
+
+    @contextmanager
+    def stage(self, stage_name):
+        """
+        Context manager used to time a build stage. Suspends viewport refreshes in profiles that do not need them.
+        Refreshes are only suspended while the stage runs, so builds executed one stage at a time do not freeze
+        the viewport between stages
+        :param stage_name: str
+        """
+
+        suspend = self._settings['suspend_refresh'] and not mc.about(batch=True)
+        if suspend:
+            mc.refresh(suspend=True)
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self._timings[stage_name] = self._timings.get(stage_name, 0.0) + time.time() - start_time
+            if suspend:
+                mc.refresh(suspend=False)
+
+    def report(self):
+        """
+        Returns a text report with the time spent in each build stage
+        :return: str
+        """
+
+        total = sum(self._timings.values())
+        lines = ['Build timings ({} profile):'.format(self._name)]
+        for stage_name, stage_time in self._timings.items():
+            lines.append('\t{:<30} {:>8.3f}s ({:5.1f}%)'.format(
+                stage_name, stage_time, stage_time / total * 100.0 if total else 0.0))
+        lines.append('\t{:<30} {:>8.3f}s'.format('total', total))
+
+        return '\n'.join(lines)
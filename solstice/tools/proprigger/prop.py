@@ -25,6 +25,8 @@ class PropRig(rig.AssetRig):
                  import_scenes=True,
                  model_grp=None,
                  proxy_grp=None,
-                 builder_grp=None
+                 builder_grp=None,
+                 **kwargs
                  ):
-        super(PropRig, self).__init__(asset_name=asset_name, import_scenes=import_scenes, model_grp=model_grp, proxy_grp=proxy_grp, builder_grp=builder_grp)
+        super(PropRig, self).__init__(asset_name=asset_name, import_scenes=import_scenes, model_grp=model_grp, proxy_grp=proxy_grp, builder_grp=builder_grp,
+                                      **kwargs)
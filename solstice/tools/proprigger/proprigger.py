@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 
 """
-Tool that allows to import/export XGen data
+Tool that allows to build prop rigs
 """
 
 from __future__ import print_function, division, absolute_import
@@ -15,78 +15,151 @@ __maintainer__ = "Enrique Velasco"
 __email__ = "enriquevelmai@hotmail.com"
 
 import os
-import json
-import stat
-import shutil
 import logging
-from functools import partial
 
-from Qt.QtWidgets import *
+LOGGER = logging.getLogger()
 
-import tpDccLib as tp
+# Path of the tool .ui file, resolved the first time the tool UI is created
+_UI_FILE = None
 
-import artellapipe
-from artellapipe.libs import artella
-from artellapipe.utils import resource
+# Widget class generated from the tool .ui file. The file is only parsed the first time the tool UI is created
+_UI_CLASS = None
 
-if tp.is_maya():
-    import maya.cmds as mc
-    import xgenm as xg
-    import xgenm.XgExternalAPI as xge
-    import xgenm.xgGlobal as xgg
+# Tool and widget classes are created the first time they are requested, so importing this module does not load
+# Qt nor artellapipe
+_WIDGET_CLASS = None
+_TOOL_CLASS = None
 
-LOGGER = logging.getLogger()
 
+def get_ui_file():
+    """
+    Returns path of the Prop Rigger .ui file. Path is resolved once and cached
+    :return: str
+    """
+
+    global _UI_FILE
+    if _UI_FILE is None:
+        _UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'uis', 'proprigger.ui')
+
+    return _UI_FILE
+
+
+def get_ui_class():
+    """
+    Returns widget class generated from the Prop Rigger .ui file. Class is generated once and cached
+    :return: type or None
+    """
+
+    global _UI_CLASS
+    if _UI_CLASS is None:
+        ui_file = get_ui_file()
+        if not os.path.isfile(ui_file):
+            return None
+
+        from Qt import QtCompat
+
+        form_class, base_class = QtCompat.loadUiType(ui_file)
+
+        def __init__(self, parent=None):
+            base_class.__init__(self, parent)
+            self.setupUi(self)
+
+        _UI_CLASS = type('PropRiggerForm', (form_class, base_class), {'__init__': __init__})
+
+    return _UI_CLASS
+
+
+def load_ui(parent=None):
+    """
+    Creates a new widget from the Prop Rigger .ui file
+    :param parent: QWidget or None
+    :return: QWidget or None
+    """
+
+    ui_class = get_ui_class()
+    if not ui_class:
+        return None
+
+    return ui_class(parent)
+
+
+def get_widget_class():
+    """
+    Returns Prop Rigger main widget class. Class is created once and cached
+    :return: type
+    """
+
+    global _WIDGET_CLASS
+    if _WIDGET_CLASS is None:
+        from Qt.QtWidgets import QWidget, QVBoxLayout
+
+        ################################################################################################################
+        # class definition
+        ################################################################################################################
+        class ControlXgenUi(QWidget, object):
+
+            ############################################################################################################
+            # class constructor
+            ############################################################################################################
+            def __init__(self, project, parent=None):
+                self.shaders_dict = dict()
+                self.scalps_list = list()
+                self.collection_name = None
+                self._project = project
+                super(ControlXgenUi, self).__init__(parent=parent)
+
+                self.ui()
+
+            ############################################################################################################
+            # ui definitions
+            ############################################################################################################
+            def ui(self):
+                self.main_layout = QVBoxLayout()
+                self.main_layout.setContentsMargins(0, 0, 0, 0)
+                self.main_layout.setSpacing(0)
+                self.setLayout(self.main_layout)
+
+                self.ui = load_ui()
+                if not self.ui:
+                    LOGGER.error('Error while loading Prop Rigger UI ...')
+                    return
+
+                self.main_layout.addWidget(self.ui)
 
-########################################################################################################################
-# class definition
-########################################################################################################################
-class ControlXgenUi(QWidget, object):
+                self._populate_data()
+                self._connect_componets_to_actions()
 
-    ####################################################################################################################
-    # class constructor
-    ####################################################################################################################
-    def __init__(self, project, parent=None):
-        self.shaders_dict = dict()
-        self.scalps_list = list()
-        self.collection_name = None
-        self._project = project
-        super(ControlXgenUi, self).__init__(parent=parent)
+            def _populate_data(self):
+                pass
 
-        self.ui()
+            def _connect_componets_to_actions(self):
+                pass
 
-    ####################################################################################################################
-    # ui definitions
-    ####################################################################################################################
-    def ui(self):
-        self.main_layout = QVBoxLayout()
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
-        self.setLayout(self.main_layout)
+        _WIDGET_CLASS = ControlXgenUi
 
-        self.ui = resource.ResourceManager().gui('proprigger')
-        if not self.ui:
-            LOGGER.error('Error while loading Prop Rigger UI ...')
-            return
+    return _WIDGET_CLASS
 
-        self.main_layout.addWidget(self.ui)
 
-        self._populate_data()
-        self._connect_componets_to_actions()
+def get_tool_class():
+    """
+    Returns Prop Rigger artellapipe tool class. Class is created once and cached
+    :return: type
+    """
 
-    def _populate_data(self):
-        pass
+    global _TOOL_CLASS
+    if _TOOL_CLASS is None:
+        import artellapipe
 
-    def _connect_componets_to_actions(self):
-        pass
+        class PropRigger(artellapipe.Tool, object):
+            def __init__(self, project, config):
+                super(PropRigger, self).__init__(project=project, config=config)
 
+            def ui(self):
+                super(PropRigger, self).ui()
 
-class PropRigger(artellapipe.Tool, object):
-    def __init__(self, project, config):
-        super(PropRigger, self).__init__(project=project, config=config)
+                self._xgen_ui = get_widget_class()(project=self._project)
+                self.main_layout.addWidget(self._xgen_ui)
 
-    def ui(self):
-        super(PropRigger, self).ui()
+        _TOOL_CLASS = PropRigger
 
-        self._xgen_ui = ControlXgenUi(project=self._project)
-        self.main_layout.addWidget(self._xgen_ui)
+    return _TOOL_CLASS
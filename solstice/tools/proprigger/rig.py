@@ -16,15 +16,41 @@ __email__ = "tpoveda@cgart3d.com"
 import os
 import sys
 import json
-import math
+from functools import partial
 
+from . import bbox
+from . import binding
+from . import cache
 from . import control
+from . import deferred
+from . import naming
+from . import profiles
+from . import tag
+from . import transaction
 from . import utils
 
 import maya.cmds as mc
 import tpDccLib as tp
 from tpMayaLib.core import scene
-from artellapipe.core import asset
+
+# Rig groups and their paths relative to the main group. Asset groups are formatted with the asset name
+RIG_GROUPS = [
+    ('_rig_grp', 'rig'),
+    ('_proxy_grp', 'proxy'),
+    ('_hires_grp', 'hires'),
+    ('_ctrl_grp', 'rig|control_grp'),
+    ('_extra_grp', 'rig|extra_grp'),
+    ('_joint_proxy_grp', 'proxy|joint_proxy'),
+    ('_mesh_proxy_grp', 'proxy|mesh_proxy'),
+    ('_proxy_asset_grp', 'proxy|mesh_proxy|{}_proxy_grp'),
+    ('_joint_hires_grp', 'hires|joint_hires'),
+    ('_mesh_hires_grp', 'hires|mesh_hires'),
+    ('_hires_asset_grp', 'hires|mesh_hires|{}_hires_grp')
+]
+
+# Message attributes of the main group connected to the main controls
+RIG_CONTROLS = [('_root_ctrl', 'root_ctrl'), ('_main_ctrl', 'main_ctrl')]
+
 
 class AssetRig(object):
     """
@@ -36,7 +62,20 @@ class AssetRig(object):
                  import_scenes=True,
                  model_grp=None,
                  proxy_grp=None,
-                 builder_grp=None
+                 builder_grp=None,
+                 instance_duplicates=False,
+                 generate_proxy=False,
+                 proxy_triangle_budget=5000,
+                 hires_mode=deferred.HiresModes.Embedded,
+                 hires_file=None,
+                 namespace=None,
+                 transactional=False,
+                 profile=None,
+                 optimize=False,
+                 geometry_qc=False,
+                 qc_settings=None,
+                 binding_mode=binding.BindingModes.Constraint,
+                 shaders_file=None
                  ):
         super(AssetRig, self).__init__()
 
@@ -56,10 +95,14 @@ class AssetRig(object):
         self._root_ctrl = None
         self._main_ctrl = None
 
+        self._asset = None
         self._geo = dict()
         self._builder_grp = None
         self._builder_locators = list()
         self._main_constraints = list()
+        self._bbox_cache = bbox.get_session_cache()
+        self._query_cache = cache.SceneQueryCache()
+        self._name_registry = naming.NameRegistry()
 
         # map in utilities
         self._asset_name = asset_name
@@ -67,74 +110,324 @@ class AssetRig(object):
         self._in_model_grp = model_grp
         self._in_proxy_grp = proxy_grp
         self._in_builder_grp = builder_grp
-
-    def build(self, force_new=True):
+        self._instance_duplicates = instance_duplicates
+        self._generate_proxy = generate_proxy
+        self._proxy_triangle_budget = proxy_triangle_budget
+        self._hires_mode = hires_mode
+        self._hires_file = hires_file
+        self._footprint = dict()
+        self._namespace = namespace
+        self._transactional = transactional
+        self._optimize = optimize
+        self._geometry_qc = geometry_qc
+        self._qc_settings = qc_settings
+        self._qc_report = dict()
+        self._instancing_report = None
+        self._optimization_report = dict()
+        self._shading_nodes = set()
+        self._binding_mode = binding_mode
+        self._shaders_file = shaders_file
+        self._transaction = None
+        self._profile = profile if isinstance(profile, profiles.BuildProfile) else profiles.BuildProfile(profile)
+
+    def build(self, force_new=True, new_scene=True, rig_spec=None):
         """
         Main function to build the rig
+        :param force_new: bool, Whether to discard unsaved changes when creating a new scene
+        :param new_scene: bool, Whether to start the build in a new scene. Multi asset builds disable it to build
+            several rigs in the same session
+        :param rig_spec: spec.RigSpec or None, if given, the rig is recreated from the spec instead of being built
         """
 
-        if self._import_scenes:
+        stages = self.get_spec_build_stages(rig_spec) if rig_spec else self.get_build_stages()
+
+        self.begin_build(force_new=force_new, new_scene=new_scene)
+        try:
+            for stage_name, stage_fn in stages:
+                self.run_stage(stage_name, stage_fn)
+        except Exception:
+            self.end_build(error=sys.exc_info()[1])
+            raise
+
+        self.end_build()
+
+    def begin_build(self, force_new=True, new_scene=True):
+        """
+        Prepares the scene for a new build. Stages are executed with run_stage and the build is closed with
+        end_build, so a build can be executed one stage at a time
+        :param force_new: bool, Whether to discard unsaved changes when creating a new scene
+        :param new_scene: bool, Whether to start the build in a new scene
+        """
+
+        if self._import_scenes and new_scene:
             mc.file(force=force_new, new=True)
 
         print('Building rig for asset {}'.format(self._asset_name))
 
-        self.create_main_groups()
+        # In transactional builds undo is not recorded and, if the build fails, created nodes and namespaces are
+        # deleted and preserved input nodes are restored
+        self._transaction = transaction.BuildTransaction(enabled=self._transactional)
+
+        if self._namespace and not mc.namespace(exists=':{}'.format(self._namespace)):
+            mc.namespace(add=self._namespace, parent=':')
+
+        # Scene names are queried once, from now on unique names are resolved by the registry
+        self._query_cache.invalidate()
+        self._name_registry = naming.NameRegistry(mc.ls(), namespace=self._namespace, exists_fn=mc.objExists)
+
+        # Shading nodes imported by the build or left behind by deferred hires, the optimizer deletes unused ones
+        self._shading_nodes = set()
+
+        self._profile.begin()
+
+    def run_stage(self, stage_name, stage_fn):
+        """
+        Executes a single build stage inside the rig namespace
+        Build transaction is only active while the stage runs, so nodes the user creates between stages of a
+        deferred build are not journaled nor deleted if the build is rolled back
+        :param stage_name: str
+        :param stage_fn: callable
+        """
+
+        if self._namespace:
+            mc.namespace(setNamespace=':{}'.format(self._namespace))
+        try:
+            with self._profile.stage(stage_name), self._transaction:
+                stage_fn()
+        finally:
+            if self._namespace:
+                mc.namespace(setNamespace=':')
+
+    def end_build(self, error=None):
+        """
+        Closes a build started with begin_build
+        :param error: Exception or None, error that stopped the build. If given, transactional builds are rolled back
+        """
+
+        build_transaction, self._transaction = self._transaction, None
+        try:
+            if build_transaction and error is not None:
+                build_transaction.abort()
+            elif build_transaction:
+                build_transaction.commit()
+        finally:
+            self._profile.end()
+        if error is not None:
+            return
+
+        tp.logger.debug('Scene query cache stats: {}'.format(self._query_cache.stats()))
+
+        self._profile.frame([self._main_grp])
+
+    def get_build_stages(self):
+        """
+        Returns the ordered stages executed to build the rig
+        :return: list<tuple(str, callable)>
+        """
+
+        stages = [('create_main_groups', self.create_main_groups)]
+        if self._import_scenes:
+            stages.extend([
+                ('import_model', self.import_model),
+                ('import_proxy', self.import_proxy),
+                ('import_builder', self.import_builder)])
+        else:
+            stages.append(('generate_input_data_structure', self._generate_input_data_structure))
+        stages.extend([
+            ('create_main_controls', self.create_main_controls),
+            ('create_main_attributes', self.create_main_attributes),
+            ('connect_main_controls', self.connect_main_controls),
+            ('clean_model_group', self.clean_model_group),
+            ('clean_proxy_group', self.clean_proxy_group)])
+        if self._binding_mode == binding.BindingModes.Joint:
+            stages.append(('bind_geometry', self.bind_geometry))
+        stages.extend([
+            ('setup', self.setup),
+            ('finish', self.finish)])
+        if self._optimize:
+            stages.append(('optimize', partial(self.optimize, measure_file_size=True)))
+
+        return stages
+
+    def get_spec_build_stages(self, rig_spec):
+        """
+        Returns the ordered stages executed to recreate the rig from a spec
+        :param rig_spec: spec.RigSpec
+        :return: list<tuple(str, callable)>
+        """
 
         if self._import_scenes:
-            self.import_model()
-            self.import_proxy()
-            self.import_builder()
+            stages = [
+                ('import_model', self.import_model),
+                ('import_proxy', self.import_proxy),
+                ('import_builder', self.import_builder)]
         else:
-            self._generate_input_data_structure()
+            stages = [('generate_input_data_structure', self._generate_input_data_structure)]
+        stages.extend([
+            ('build_from_spec', partial(self.build_from_spec, rig_spec)),
+            ('finish', self.finish)])
+
+        return stages
+
+    def build_from_spec(self, rig_spec):
+        """
+        Function that recreates the rig from a spec and moves the asset geometry into it. Bounding boxes, geometry
+        checks and validations are skipped, because the spec already stores their results. Rig is bound to the new
+        nodes, so the finish stage can run as in a full build (recreating the deferred hires reference if needed)
+        :param rig_spec: spec.RigSpec
+        """
+
+        from . import spec
+
+        geometry = dict()
+        source_groups = list()
+        for geo_type, input_grp, suffix in [
+                ('model', self._in_model_grp, 'MODEL'), ('proxy', self._in_proxy_grp, 'PROXY')]:
+            source_grp = self._get_input_group(suffix, input_grp)
+            if not mc.objExists(source_grp):
+                continue
+            geometry[geo_type] = mc.listRelatives(source_grp, children=True, type='transform', fullPath=True) or []
+            source_groups.append(source_grp)
+
+        builder_grp = self._get_input_group('BUILDER', self._in_builder_grp)
+        if mc.objExists(builder_grp):
+            source_groups.append(builder_grp)
+        self._preserve_input_groups(source_groups)
+
+        nodes = spec.build_spec(rig_spec, geometry=geometry)
+        if source_groups:
+            mc.delete(source_groups)
+
+        self.load_rig(nodes[rig_spec.nodes[0]['key']])
+        if self._binding_mode == binding.BindingModes.Joint:
+            self._rebind_geometry()
+
+    def load_rig(self, main_grp):
+        """
+        Binds the rig groups and controls to the nodes of an already existing rig, such as a rig rebuilt from a
+        spec, so the rig can be finished, optimized, captured or exported as if it was built in this session
+        Groups removed from the rig (by the optimizer) are set to None
+        :param main_grp: str, rig main group
+        """
+
+        main_grp = mc.ls(main_grp, long=True)[0]
+        short_name = main_grp.split('|')[-1]
+        prefix = short_name.rsplit(':', 1)[0] + ':' if ':' in short_name else ''
+
+        self._main_grp = main_grp
+        for attr_name, group_path in RIG_GROUPS:
+            grp = '|'.join([main_grp] + [prefix + token for token in group_path.format(self._asset_name).split('|')])
+            setattr(self, attr_name, grp if mc.objExists(grp) else None)
+
+        for attr_name, ctrl_attr in RIG_CONTROLS:
+            ctrls = None
+            if mc.attributeQuery(ctrl_attr, node=main_grp, exists=True):
+                ctrls = mc.listConnections('{}.{}'.format(main_grp, ctrl_attr), source=True, destination=False)
+            setattr(self, attr_name, control.RigControl.from_node(ctrls[0]) if ctrls else None)
+
+        asset_grps = [grp for grp in [self._proxy_asset_grp, self._hires_asset_grp] if grp]
+        self._main_constraints = sorted(set(
+            mc.listConnections(asset_grps, source=True, destination=False, type='constraint') or list()))
 
-        self.create_main_controls()
-        self.create_main_attributes()
-        self.connect_main_controls()
+        self._query_cache.invalidate()
 
-        self.clean_model_group()
-        self.clean_proxy_group()
+    def get_spec(self, source_key=None):
+        """
+        Returns the spec of the built rig, used to recreate it without running the full build
+        :param source_key: str or None, key of the source files the rig was built from (see spec.get_source_key)
+        :return: spec.RigSpec
+        """
+
+        from . import spec
+
+        return spec.capture_spec(
+            self._main_grp, geometry_groups={'model': self._hires_asset_grp, 'proxy': self._proxy_asset_grp},
+            name=self._asset_name, source_key=source_key)
+
+    @property
+    def profile(self):
+        """
+        Returns build profile used by the rig
+        :return: profiles.BuildProfile
+        """
 
-        self.setup()
+        return self._profile
 
-        self.finish()
+    @property
+    def asset_name(self):
+        """
+        Returns name of the rigged asset
+        :return: str
+        """
+
+        return self._asset_name
+
+    @property
+    def main_group(self):
+        """
+        Returns rig main group
+        :return: str
+        """
 
-        mc.select(mc.ls())
-        mc.viewFit(animate=True)
-        mc.select(clear=True)
+        return self._main_grp
+
+    @property
+    def query_cache(self):
+        """
+        Returns scene query cache used during the build
+        :return: cache.SceneQueryCache
+        """
+
+        return self._query_cache
+
+    @property
+    def namespace(self):
+        """
+        Returns namespace where the rig is built
+        :return: str or None
+        """
+
+        return self._namespace
 
     def create_main_groups(self):
         """
         Function that creates main rig groups
         """
 
-        self._main_grp = mc.group(name=self._asset_name, empty=True, world=True)
-        self._rig_grp = mc.group(name='rig', empty=True, parent=self._main_grp)
-        self._proxy_grp = mc.group(name='proxy', empty=True, parent=self._main_grp)
-        self._hires_grp = mc.group(name='hires', empty=True, parent=self._main_grp)
-        self._ctrl_grp = mc.group(name='control_grp', empty=True, parent=self._rig_grp)
-        self._extra_grp = mc.group(name='extra_grp', empty=True, parent=self._rig_grp)
-        self._joint_proxy_grp = mc.group(name='joint_proxy', empty=True, parent=self._proxy_grp)
-        self._mesh_proxy_grp = mc.group(name='mesh_proxy', empty=True, parent=self._proxy_grp)
-        self._proxy_asset_grp = mc.group(name='{}_proxy_grp'.format(self._main_grp), empty=True,
-                                         parent=self._mesh_proxy_grp)
-        self._joint_hires_grp = mc.group(name='joint_hires', empty=True, parent=self._hires_grp)
-        self._mesh_hires_grp = mc.group(name='mesh_hires', empty=True, parent=self._hires_grp)
-        self._hires_asset_grp = mc.group(name='{}_hires_grp'.format(self._main_grp), empty=True,
-                                         parent=self._mesh_hires_grp)
+        self._main_grp = self._query_cache.group(name=self._asset_name, empty=True, world=True)
+        self._rig_grp = self._query_cache.group(name='rig', empty=True, parent=self._main_grp)
+        self._proxy_grp = self._query_cache.group(name='proxy', empty=True, parent=self._main_grp)
+        self._hires_grp = self._query_cache.group(name='hires', empty=True, parent=self._main_grp)
+        self._ctrl_grp = self._query_cache.group(name='control_grp', empty=True, parent=self._rig_grp)
+        self._extra_grp = self._query_cache.group(name='extra_grp', empty=True, parent=self._rig_grp)
+        self._joint_proxy_grp = self._query_cache.group(name='joint_proxy', empty=True, parent=self._proxy_grp)
+        self._mesh_proxy_grp = self._query_cache.group(name='mesh_proxy', empty=True, parent=self._proxy_grp)
+        self._proxy_asset_grp = self._query_cache.group(name='{}_proxy_grp'.format(self._asset_name), empty=True,
+                                                        parent=self._mesh_proxy_grp)
+        self._joint_hires_grp = self._query_cache.group(name='joint_hires', empty=True, parent=self._hires_grp)
+        self._mesh_hires_grp = self._query_cache.group(name='mesh_hires', empty=True, parent=self._hires_grp)
+        self._hires_asset_grp = self._query_cache.group(name='{}_hires_grp'.format(self._asset_name), empty=True,
+                                                        parent=self._mesh_hires_grp)
+
+        self._name_registry.update([
+            self._main_grp, self._rig_grp, self._proxy_grp, self._hires_grp, self._ctrl_grp, self._extra_grp,
+            self._joint_proxy_grp, self._mesh_proxy_grp, self._proxy_asset_grp, self._joint_hires_grp,
+            self._mesh_hires_grp, self._hires_asset_grp])
 
     def create_main_controls(self):
         """
         Function that creates main rig controls
         """
 
-        xmin, ymin, zmin, xmax, ymax, zmax = mc.exactWorldBoundingBox(self._geo['model'])
-        a = [xmin, 0, 0]
-        b = [xmax, 0, 0]
-        radius = (math.sqrt(pow(a[0] - b[0], 2) + pow(a[1] - b[1], 2) + pow(a[2] - b[2], 2)))
+        radius = self.get_bounds('model').control_radius(axis=1)
 
-        self._root_ctrl = control.Circle('root', normal=[0, 1, 0], radius=radius, color_index=29)
-        self._main_ctrl = control.Circle('main', normal=[0, 1, 0], radius=radius - 6, color_index=16)
-        self._main_ctrl.translate_control_shapes(0, 1, 0)
+        self._root_ctrl = control.Circle(
+            'root', normal=[0, 1, 0], radius=radius, color_index=29,
+            query_cache=self._query_cache, name_registry=self._name_registry)
+        self._main_ctrl = control.Circle(
+            'main', normal=[0, 1, 0], radius=radius * 0.8, color_index=16,
+            query_cache=self._query_cache, name_registry=self._name_registry)
+        self._main_ctrl.translate_control_shapes(0, radius * 0.05, 0)
 
         mc.addAttr(self._main_grp, ln='root_ctrl', at='message')
         mc.addAttr(self._main_grp, ln='main_ctrl', at='message')
@@ -143,12 +436,29 @@ class AssetRig(object):
         mc.connectAttr(self._root_ctrl.node + '.message', self._main_grp + '.root_ctrl')
         mc.connectAttr(self._main_ctrl.node + '.message', self._main_grp + '.main_ctrl')
 
+    def get_bounds(self, geo_type='model'):
+        """
+        Returns world bounding box of the given geometry type, reusing cached per mesh bounds
+        :param geo_type: str, model or proxy
+        :return: bbox.BoundingBox
+        """
+
+        meshes = utils.get_meshes(self._geo.get(geo_type))
+        if not meshes:
+            tp.logger.warning('No {} meshes found to compute bounding box from!'.format(geo_type))
+
+        # Points are only read for meshes whose vertex count, object space bounds or world matrix changed since
+        # they were cached by this or any other rig built in the session. Cached boxes are world space boxes
+        meshes_keys = dict((mesh, utils.get_mesh_key(mesh)) for mesh in meshes)
+
+        return self._bbox_cache.bounds(meshes_keys, utils.get_mesh_points)
+
     def create_main_attributes(self):
         """
         Function that create main rig attributes
         """
 
-        assert self._main_grp and mc.objExists(self._main_grp)
+        assert self._main_grp and self._query_cache.exists(self._main_grp)
 
         mc.addAttr(self._main_grp, ln='type', at='enum', en='proxy:hires:both')
         mc.setAttr('{}.type'.format(self._main_grp), edit=True, keyable=False)
@@ -175,23 +485,50 @@ class AssetRig(object):
         Function that connects main controls
         """
 
-        assert self._main_ctrl and mc.objExists(self._main_ctrl.node)
-        assert self._root_ctrl and mc.objExists(self._root_ctrl.node)
-        assert self._proxy_asset_grp and mc.objExists(self._proxy_asset_grp)
-        assert self._hires_asset_grp and mc.objExists(self._hires_asset_grp)
+        assert self._main_ctrl and self._query_cache.exists(self._main_ctrl.node)
+        assert self._root_ctrl and self._query_cache.exists(self._root_ctrl.node)
+        assert self._proxy_asset_grp and self._query_cache.exists(self._proxy_asset_grp)
+        assert self._hires_asset_grp and self._query_cache.exists(self._hires_asset_grp)
+
+        self._query_cache.parent(self._main_ctrl.offset, self._root_ctrl.node)
+        self._query_cache.parent(self._root_ctrl.offset, self._ctrl_grp)
 
-        mc.parent(self._main_ctrl.offset, self._root_ctrl.node)
-        mc.parent(self._root_ctrl.offset, self._ctrl_grp)
+        # In joint binding mode geometry is bound once it is cleaned up
+        if self._binding_mode == binding.BindingModes.Constraint:
+            self._constrain_asset_group(self._proxy_asset_grp)
+            self._constrain_asset_group(self._hires_asset_grp)
+
+    def bind_geometry(self):
+        """
+        Function that creates a joint per main control in joint groups and binds rigidly each asset mesh to the
+        main control joint. Hires geometry that is going to be deferred or that is instanced keeps constraints
+        """
 
-        self._main_constraints.append(mc.parentConstraint(self._main_ctrl.node, self._proxy_asset_grp, mo=False))
-        self._main_constraints.append(mc.scaleConstraint(self._main_ctrl.node, self._proxy_asset_grp, mo=False))
-        self._main_constraints.append(mc.parentConstraint(self._main_ctrl.node, self._hires_asset_grp, mo=False))
-        self._main_constraints.append(mc.scaleConstraint(self._main_ctrl.node, self._hires_asset_grp, mo=False))
+        controls = [(self._root_ctrl.node, None), (self._main_ctrl.node, self._root_ctrl.node)]
+        drivers = dict()
+        for geo_type, asset_grp, joint_grp in [
+                ('proxy', self._proxy_asset_grp, self._joint_proxy_grp),
+                ('hires', self._hires_asset_grp, self._joint_hires_grp)]:
+            meshes = utils.get_meshes([asset_grp])
+            instanced = [mesh for mesh in meshes if len(mc.listRelatives(mesh, allParents=True) or list()) > 1]
+            if instanced or (geo_type == 'hires' and self._hires_mode == deferred.HiresModes.Deferred):
+                tp.logger.warning('{} geometry of asset {} cannot be bound to joints. Using constraints ...'.format(
+                    geo_type.capitalize(), self._asset_name))
+                self._constrain_asset_group(asset_grp)
+                continue
+
+            joints = binding.create_joints(controls, joint_grp, geo_type, drivers=drivers)
+            self._query_cache.created(*joints)
+            for mesh in meshes:
+                binding.bind_rigid(mesh, joints, len(joints) - 1)
 
     def import_model(self):
         """
         Function that import latest working file of the asset model
         """
+
+        from . import optimizer
+
         if not tp.is_maya():
             tp.logger.warning('Import model functionality is only available in Maya')
             return
@@ -200,19 +537,23 @@ class AssetRig(object):
 
         track = scene.TrackNodes()
         track.load('transform')
+        shading_nodes = optimizer.get_shading_nodes()
         self._asset.import_model_file(status='working')
-        mc.refresh()
+        self._profile.refresh()
         imported_objs = track.get_delta()
+        self._shading_nodes.update(optimizer.get_shading_nodes() - shading_nodes)
+        self._query_cache.invalidate()
+        self._name_registry.update(mc.ls())
         self._geo['model'] = imported_objs
-        mc.select(imported_objs)
-        mc.viewFit(animate=True)
-        mc.select(clear=True)
+        self._profile.frame(imported_objs)
 
     def import_proxy(self):
         """
         Function that imports latest working file of the asset proxy model
         """
 
+        from . import optimizer
+
         if not tp.is_maya():
             tp.logger.warning('Import model functionality is only available in Maya')
             return
@@ -221,19 +562,23 @@ class AssetRig(object):
 
         track = scene.TrackNodes()
         track.load('transform')
+        shading_nodes = optimizer.get_shading_nodes()
         self._asset.import_proxy_file()
-        mc.refresh()
+        self._profile.refresh()
         imported_objs = track.get_delta()
+        self._shading_nodes.update(optimizer.get_shading_nodes() - shading_nodes)
+        self._query_cache.invalidate()
+        self._name_registry.update(mc.ls())
         self._geo['proxy'] = imported_objs
-        mc.select(imported_objs)
-        mc.viewFit(animate=True)
-        mc.select(clear=True)
+        self._profile.frame(imported_objs)
 
     def import_builder(self):
         """
         Function that imports in the scene the builder file
         """
 
+        from . import optimizer
+
         if not tp.is_maya():
             tp.logger.warning('Import model functionality is only available in Maya')
             return
@@ -242,48 +587,161 @@ class AssetRig(object):
 
         track = scene.TrackNodes()
         track.load('transform')
+        shading_nodes = optimizer.get_shading_nodes()
         self._asset.import_builder_file()
-        mc.refresh()
+        self._profile.refresh()
         imported_objs = track.get_delta()
-        mc.select(imported_objs)
-        mc.viewFit(animate=True)
-        mc.select(clear=True)
+        self._shading_nodes.update(optimizer.get_shading_nodes() - shading_nodes)
+        self._query_cache.invalidate()
+        self._name_registry.update(mc.ls())
+        self._profile.frame(imported_objs)
 
     def clean_model_group(self):
         """
         Function that clean model group contents
         """
 
-        assert self._hires_asset_grp and tp.Dcc.object_exists(self._hires_asset_grp)
+        assert self._hires_asset_grp and self._query_cache.exists(self._hires_asset_grp)
 
-        model_grp = '{}_MODEL'.format(self._asset.name)
-        if not tp.Dcc.object_exists(model_grp):
+        model_grp = self._get_input_group('MODEL', self._in_model_grp)
+        if not self._query_cache.exists(model_grp):
             tp.logger.warning('Model Group with name {} does not exists!'.format(model_grp))
             return
 
-        children = tp.Dcc.list_children(model_grp, full_path=True, all_hierarchy=False, children_type='transform')
-        for child in children:
-            tp.Dcc.set_parent(child, self._hires_asset_grp)
+        self._preserve_input_groups([model_grp])
+        children = self._query_cache.children(model_grp, full_path=True, children_type='transform')
+        if children:
+            self._query_cache.parent(children, self._hires_asset_grp)
+
+        self._query_cache.delete(model_grp)
 
-        tp.Dcc.delete_object(model_grp)
+        if self._geometry_qc:
+            self.check_geometry('model')
+
+        if self._instance_duplicates:
+            self.instance_duplicate_geometry()
+
+    def instance_duplicate_geometry(self):
+        """
+        Function that replaces meshes with identical topology and object space points in the hires group
+        with instances of a single shape
+        :return: instancing.InstancingReport
+        """
+
+        from . import instancing
+
+        meshes_data = list()
+        for mesh in utils.get_meshes([self._hires_asset_grp]):
+            # Meshes with per-face shader assignments cannot be instanced without losing their assignments
+            shading_engines = set(mc.listConnections(mesh, type='shadingEngine') or list())
+            if len(shading_engines) > 1:
+                continue
+            meshes_data.append(utils.get_mesh_data(mesh))
+
+        duplicates = instancing.find_duplicates(meshes_data)
+        for master, meshes in duplicates:
+            for mesh in meshes:
+                self._query_cache.invalidate([mesh.name])
+                utils.replace_with_instance(mesh.name, master.name)
+
+        report = instancing.InstancingReport(duplicates)
+        tp.logger.info(str(report))
+        self._instancing_report = report
+
+        return report
 
     def clean_proxy_group(self):
         """
         Function that clean proxy model group contents
         """
 
-        assert self._proxy_asset_grp and tp.Dcc.object_exists(self._proxy_asset_grp)
+        assert self._proxy_asset_grp and self._query_cache.exists(self._proxy_asset_grp)
 
-        proxy_grp = '{}_PROXY'.format(self._asset.name)
-        if not tp.Dcc.object_exists(proxy_grp):
+        proxy_grp = self._get_input_group('PROXY', self._in_proxy_grp)
+        if not self._query_cache.exists(proxy_grp):
             tp.logger.warning('Proxy Model Group with name {} does not exists!'.format(proxy_grp))
+            if self._generate_proxy:
+                self.generate_proxy()
             return
 
-        children = tp.Dcc.list_children(proxy_grp, full_path=True, all_hierarchy=False, children_type='transform')
-        for child in children:
-            tp.Dcc.set_parent(child, self._proxy_asset_grp)
+        self._preserve_input_groups([proxy_grp])
+        children = self._query_cache.children(proxy_grp, full_path=True, children_type='transform')
+        if children:
+            self._query_cache.parent(children, self._proxy_asset_grp)
+
+        self._query_cache.delete(proxy_grp)
+
+        if self._geometry_qc:
+            self.check_geometry('proxy')
 
-        tp.Dcc.delete_object(proxy_grp)
+    def check_geometry(self, geo_type='model'):
+        """
+        Function that runs vectorized geometry quality checks (unfrozen transforms, zero area and lamina faces,
+        poly budgets and far pivots) on the hires or proxy meshes of the rig
+        :param geo_type: str, model or proxy
+        :return: dict, geometry QC report
+        """
+
+        from . import geoqc
+
+        asset_grp = self._hires_asset_grp if geo_type == 'model' else self._proxy_asset_grp
+        meshes_data = [utils.get_mesh_data(mesh) for mesh in utils.get_meshes([asset_grp])]
+        pivots = dict((mesh_data.name, mc.xform(
+            mesh_data.name.rsplit('|', 1)[0], query=True, rotatePivot=True, worldSpace=True))
+            for mesh_data in meshes_data)
+
+        report = geoqc.run_qc(meshes_data, settings=self._qc_settings, pivots=pivots)
+        for mesh_name, mesh_report in report['meshes'].items():
+            for finding in mesh_report['findings']:
+                tp.logger.warning('Geometry QC ({}) {}: {}'.format(geo_type, mesh_name, finding['message']))
+        if report['over_budget']:
+            tp.logger.warning('Geometry QC ({}): {} triangles exceed budget of {}'.format(
+                geo_type, report['total_triangles'], report['total_triangle_budget']))
+        self._qc_report[geo_type] = report
+
+        return report
+
+    def generate_proxy(self, strategy=None):
+        """
+        Function that generates proxy geometry decimating hires meshes until they fit the proxy triangle budget
+        :param strategy: str or None, decimation strategy (decimate.Strategies). Cluster strategy is used by default
+        :return: list<str>, generated proxy meshes
+        """
+
+        from . import decimate
+
+        assert self._proxy_asset_grp and self._query_cache.exists(self._proxy_asset_grp)
+
+        hires_meshes = utils.get_meshes([self._hires_asset_grp])
+        meshes_data = [utils.get_mesh_data(mesh, world_space=True) for mesh in hires_meshes]
+        if not meshes_data:
+            tp.logger.warning('No hires meshes found to generate proxy from!')
+            return list()
+
+        budgets = decimate.distribute_budget(
+            [mesh_data.triangle_count for mesh_data in meshes_data], self._proxy_triangle_budget)
+
+        dropped = [mesh_data.name for mesh_data, budget in zip(meshes_data, budgets) if not budget]
+        if dropped:
+            tp.logger.warning('Proxy triangle budget {} of asset {} cannot fit all hires meshes. Skipping: {}'.format(
+                self._proxy_triangle_budget, self._asset_name, ', '.join(dropped)))
+
+        proxy_meshes = list()
+        for mesh_data, budget in zip(meshes_data, budgets):
+            if not budget:
+                continue
+            transform_name = mesh_data.name.split('|')[-2]
+            proxy_data = decimate.decimate_mesh(mesh_data, budget, strategy=strategy or decimate.Strategies.Cluster)
+            if not proxy_data.face_count:
+                continue
+            proxy_meshes.append(utils.create_mesh(
+                proxy_data, name='{}_proxy'.format(transform_name), parent=self._proxy_asset_grp))
+
+        if proxy_meshes:
+            self._query_cache.created(*proxy_meshes)
+        tp.logger.info('Generated {} proxy meshes from {} hires meshes'.format(len(proxy_meshes), len(meshes_data)))
+
+        return proxy_meshes
 
     def setup(self):
         """
@@ -291,53 +749,250 @@ class AssetRig(object):
         Use this function to create custom rig code
         """
 
-        builder_grp = '{}_BUILDER'.format(self._asset.name)
-        if not tp.Dcc.object_exists(builder_grp):
+        builder_grp = self._get_input_group('BUILDER', self._in_builder_grp)
+        if not self._query_cache.exists(builder_grp):
             tp.logger.warning('Builder Group with name {} does not exists!'.format(builder_grp))
             return
 
         self._builder_grp = builder_grp
-        self._builder_locators = tp.Dcc.list_children(builder_grp, full_path=False, children_type='transform')
+        self._builder_locators = self._query_cache.children(builder_grp, full_path=False, children_type='transform')
 
     def finish(self):
         """
         Function that is called before ending rig setup
         """
 
-        if self._builder_grp and mc.objExists(self._builder_grp):
-            mc.delete(self._builder_grp)
+        if self._builder_grp and self._query_cache.exists(self._builder_grp):
+            self._preserve_input_groups([self._builder_grp])
+            self._query_cache.delete(self._builder_grp)
 
-        utils.lock_all_transforms(self._rig_grp)
-        utils.lock_all_transforms(self._proxy_grp)
-        utils.lock_all_transforms(self._hires_grp)
-        utils.lock_all_transforms(self._ctrl_grp)
-        utils.lock_all_transforms(self._extra_grp)
-        utils.lock_all_transforms(self._joint_proxy_grp, lock_visibility=True)
-        utils.lock_all_transforms(self._mesh_proxy_grp)
-        utils.lock_all_transforms(self._proxy_asset_grp)
-        utils.lock_all_transforms(self._joint_hires_grp, lock_visibility=True)
-        utils.lock_all_transforms(self._mesh_hires_grp)
-        utils.lock_all_transforms(self._hires_asset_grp)
-        utils.lock_all_transforms(self._main_grp)
+        # Rigs rebuilt from the spec of an optimized rig do not have the groups removed by the optimizer
+        for grp in [self._rig_grp, self._proxy_grp, self._hires_grp, self._ctrl_grp, self._extra_grp,
+                    self._mesh_proxy_grp, self._proxy_asset_grp, self._mesh_hires_grp, self._hires_asset_grp,
+                    self._main_grp]:
+            if grp:
+                utils.lock_all_transforms(grp)
+        for grp in [self._joint_proxy_grp, self._joint_hires_grp]:
+            if grp:
+                utils.lock_all_transforms(grp, lock_visibility=True)
 
         self._setup_tag()
 
+        if self._hires_mode == deferred.HiresModes.Deferred:
+            # Footprint can only be measured while hires geometry is still in the scene
+            self._footprint = deferred.get_footprint_report(self._proxy_asset_grp, self._hires_asset_grp)
+            self.defer_hires()
+
+    def optimize(self, measure_file_size=False):
+        """
+        Function that removes or collapses rig nodes that do not contribute to any deformation, control or
+        visibility path
+        :param measure_file_size: bool, Whether to export the rig before and after the optimization to measure
+            the file size reduction
+        :return: dict, optimization report
+        """
+
+        from . import optimizer
+
+        rig_optimizer = optimizer.RigOptimizer(
+            self._main_grp, empty_groups=[self._extra_grp, self._joint_proxy_grp, self._joint_hires_grp],
+            measure_file_size=measure_file_size, shading_nodes=self._shading_nodes)
+        self._optimization_report = rig_optimizer.optimize()
+
+        # Removed groups and collapsed control groups change the rig nodes and their paths
+        self.load_rig(self._main_grp)
+
+        return self._optimization_report
+
+    def get_complexity_report(self):
+        """
+        Returns node, connection and evaluation weight report of the built rig
+        :return: dict
+        """
+
+        from . import profiler
+
+        return profiler.profile_rig(self._main_grp)
+
+    def get_binding_comparison(self):
+        """
+        Returns estimated cost of the constraint and joint binding modes for the geometry of the built rig
+        :return: dict
+        """
+
+        meshes = utils.get_meshes([self._proxy_asset_grp, self._hires_asset_grp])
+        vertex_counts = [mc.polyEvaluate(mesh, vertex=True) for mesh in meshes]
+        control_count = len([ctrl for ctrl in [self._root_ctrl, self._main_ctrl] if ctrl])
+        comparison = binding.compare_costs(vertex_counts, control_count=control_count)
+        comparison['current'] = self._binding_mode
+
+        return comparison
+
+    def export_transform_cache(self, cache_file, start_frame=None, end_frame=None, step=1.0, rig_file=None):
+        """
+        Bakes world matrices of the transforms that drive the rig geometry into a transform cache
+        :param cache_file: str
+        :param start_frame: float or None, if not given, playback start frame is used
+        :param end_frame: float or None, if not given, playback end frame is used
+        :param step: float
+        :param rig_file: str or None, file where the rig is exported. Proxy and embedded hires geometry are loaded
+            from it. If not given, current scene file is used
+        :return: str, matrices file of the cache
+        """
+
+        from . import xformcache
+
+        rig_file = rig_file or mc.file(query=True, sceneName=True) or None
+        geometry_files = {'proxy': rig_file, 'hires': rig_file}
+        if self._hires_mode == deferred.HiresModes.Deferred:
+            geometry_files['hires'] = self._hires_file or deferred.get_default_hires_file(self._asset_name)
+
+        return xformcache.bake_rig(
+            self._main_grp, cache_file, start_frame=start_frame, end_frame=end_frame, step=step,
+            geometry_files=geometry_files, asset_name=self._asset_name)
+
+    def get_fingerprint(self):
+        """
+        Returns structural fingerprint of the built rig, used to check that rigs are built identically between builds
+        :return: fingerprint.FingerprintNode
+        """
+
+        from . import fingerprint
+
+        return fingerprint.get_rig_fingerprint(self._main_grp)
+
+    @property
+    def qc_report(self):
+        """
+        Returns geometry QC report of each geometry type checked during the build
+        :return: dict
+        """
+
+        return self._qc_report
+
+    @property
+    def instancing_report(self):
+        """
+        Returns report of the hires meshes replaced with instances during the build
+        :return: instancing.InstancingReport or None
+        """
+
+        return self._instancing_report
+
+    @property
+    def optimization_report(self):
+        """
+        Returns node count and file size reduction of the last rig optimization
+        :return: dict
+        """
+
+        return self._optimization_report
+
+    @property
+    def footprint(self):
+        """
+        Returns estimated geometry memory footprint of the rig for each display type and hires mode
+        Rigs with embedded hires geometry compute it the first time it is requested
+        :return: dict
+        """
+
+        if not self._footprint and self._hires_asset_grp and self._hires_mode == deferred.HiresModes.Embedded:
+            self._footprint = deferred.get_footprint_report(self._proxy_asset_grp, self._hires_asset_grp)
+
+        return self._footprint
+
+    def defer_hires(self):
+        """
+        Function that moves hires geometry into an external file that is only loaded when the rig type
+        is switched to hires or both
+        :return: str, hires reference node
+        """
+
+        from . import optimizer
+
+        hires_file = self._hires_file or deferred.get_default_hires_file(self._asset_name)
+        self._shading_nodes.update(optimizer.get_shading_nodes(utils.get_meshes([self._hires_asset_grp])))
+        reference_node = deferred.defer_hires(self._main_grp, self._hires_asset_grp, hires_file)
+        if not reference_node:
+            tp.logger.warning('No hires geometry found to defer for asset {}'.format(self._asset_name))
+            return None
+
+        for display_type, modes in self._footprint.items():
+            tp.logger.info('{} memory footprint: {:.2f} MB ({} mode) / {:.2f} MB ({} mode)'.format(
+                display_type, modes[deferred.HiresModes.Embedded] / (1024.0 * 1024.0), deferred.HiresModes.Embedded,
+                modes[deferred.HiresModes.Deferred] / (1024.0 * 1024.0), deferred.HiresModes.Deferred))
+
+        return reference_node
+
+    def _constrain_asset_group(self, asset_grp):
+        """
+        Internal function that drives given asset group with main control constraints
+        :param asset_grp: str
+        """
+
+        constraints = [
+            mc.parentConstraint(self._main_ctrl.node, asset_grp, mo=False),
+            mc.scaleConstraint(self._main_ctrl.node, asset_grp, mo=False)]
+        for constraint in constraints:
+            self._query_cache.created(*constraint)
+            self._name_registry.update(constraint)
+        self._main_constraints.extend(constraints)
+
+    def _rebind_geometry(self):
+        """
+        Internal function that binds the asset geometry of a rig rebuilt from a spec to the rebuilt joints
+        Skin clusters are part of the asset geometry history, so specs do not store them
+        """
+
+        for asset_grp, joint_grp in [
+                (self._proxy_asset_grp, self._joint_proxy_grp), (self._hires_asset_grp, self._joint_hires_grp)]:
+            joints = mc.listRelatives(
+                joint_grp, allDescendents=True, type='joint', fullPath=True) if asset_grp and joint_grp else None
+            if not joints:
+                continue
+            joints.sort(key=lambda joint: joint.count('|'))
+            for mesh in utils.get_meshes([asset_grp]):
+                binding.bind_rigid(mesh, joints, len(joints) - 1)
+
+    def _preserve_input_groups(self, input_grps):
+        """
+        Internal function that stores input groups before the build moves their contents or deletes them, so
+        transactional builds can restore them if they are rolled back. Imported input groups are not stored
+        :param input_grps: list<str>
+        """
+
+        if self._transaction and input_grps:
+            self._transaction.preserve(input_grps)
+
+    def _get_input_group(self, suffix, input_grp=None):
+        """
+        Internal function that returns the name of an input group (MODEL, PROXY or BUILDER) of the asset
+        Imported groups are located in the rig namespace and, as names are not relative to the current namespace,
+        they are returned with their full namespace
+        :param suffix: str
+        :param input_grp: str or None, group given by the user. If given, it is returned as it is
+        :return: str
+        """
+
+        if input_grp:
+            return input_grp
+
+        group_name = '{}_{}'.format(self._asset_name, suffix)
+        if not self._namespace:
+            return group_name
+
+        return ':{}:{}'.format(self._namespace.strip(':'), group_name)
+
     def _setup_tag(self):
         """
         Internal function used to setup tag attribute in the rig
         """
-        pass
-        valid_obj = None
-        if mc.objExists(self._asset_name):
-            objs = tp.Dcc.list_nodes(node_name=self._asset.name)
-            for obj in objs:
-                parent = tp.Dcc.node_parent(obj)
-                if parent is None:
-                    valid_obj = obj
-            if not valid_obj:
-                mc.error(
-                    'Main group is not valid. Please change it manually to {}'.format(self._asset.name))
-                return False
+
+        # Rig groups are used directly, looking them up by name fails in namespaced builds
+        valid_obj = self._main_grp
+        if not valid_obj or not mc.objExists(valid_obj):
+            mc.error('Main group is not valid. Please change it manually to {}'.format(self._asset_name))
+            return False
 
         # Check if main group has a valid tag node connected
         valid_tag_data = False
@@ -353,9 +1008,7 @@ class AssetRig(object):
         if not valid_tag_data:
             mc.warning('Main group has not a valid tag data node connected to it. Creating it ...')
             try:
-                tp.Dcc.select_object(valid_obj)
-                tagger.SolsticeTagger.create_new_tag_data_node_for_current_selection(self._asset.category)
-                tp.Dcc.clear_selection()
+                tag.create_tag_node(node=valid_obj, category=self._asset.category if self._asset else None)
                 valid_tag_data = False
                 main_group_connections = tp.Dcc.list_source_destination_connections(valid_obj)
                 for connection in main_group_connections:
@@ -373,101 +1026,64 @@ class AssetRig(object):
                 mc.error(str(e))
                 return False
 
-        tag_data_node = tagger.SolsticeTagger.get_tag_data_node_from_curr_sel(new_selection=valid_obj)
+        tag_data_node = tag.get_tag_data_node(valid_obj)
         if not tag_data_node or not mc.objExists(tag_data_node):
-            mc.error('Impossible to get tag data of current selection: {}!'.format(tag_data_node))
+            mc.error('Impossible to get tag data of main group {}: {}!'.format(valid_obj, tag_data_node))
             return False
 
         # Connect proxy group to tag data node
-        valid_connection = tagger.HighProxyEditor.update_proxy_group(tag_data=tag_data_node)
+        valid_connection = tag.update_proxy_group(tag_data_node=tag_data_node, proxy_grp=self._proxy_asset_grp)
         if not valid_connection:
             mc.error(
                 'Error while connecting Proxy Group to tag data node!  Check Maya editor for more info about the error!')
             return False
 
         # Connect hires group to tag data node
-        valid_connection = tagger.HighProxyEditor.update_hires_group(tag_data=tag_data_node)
+        valid_connection = tag.update_hires_group(tag_data_node=tag_data_node, hires_grp=self._hires_asset_grp)
         if not valid_connection:
             mc.error(
                 'Error while connecting hires group to tag data node! Check Maya editor for more info about the error!')
             return False
 
         # Getting shaders info data
-        shaders_file = shaderlibrary.ShaderLibrary.get_asset_shader_file_path(asset=self._asset)
+        shaders_file = self._shaders_file
+        if not shaders_file:
+            tp.logger.warning('No shaders file given for asset {}, skipping shaders data ...'.format(self._asset_name))
+            return True
         if not os.path.exists(shaders_file):
             mc.error(
-                'Shaders JSON file for asset {0} does not exists: {1}'.format(self._asset.name, shaders_file))
+                'Shaders JSON file for asset {0} does not exists: {1}'.format(self._asset_name, shaders_file))
             return False
 
         with open(shaders_file) as f:
             shader_data = json.load(f)
         if shader_data is None:
             mc.error(
-                'Shaders JSON file for asset {0} is not valid: {1}'.format(self._asset.name, shaders_file))
+                'Shaders JSON file for asset {0} is not valid: {1}'.format(self._asset_name, shaders_file))
             return False
 
-        hires_grp = None
-        hires_grp_name = '{}_hires_grp'.format(self._asset.name)
-        children = tp.Dcc.list_relatives(node=valid_obj, all_hierarchy=True, full_path=True,
-                                         relative_type='transform')
-        if children:
-            for child in children:
-                child_name = child.split('|')[-1]
-                if child_name == hires_grp_name:
-                    hires_children = tp.Dcc.list_relatives(node=child_name, all_hierarchy=True,
-                                                           relative_type='transform')
-                    if len(hires_children) > 0:
-                        if hires_grp is None:
-                            hires_grp = child
-                        else:
-                            mc.error('Multiple Hires groups in the file. Please check it!')
-                            return False
-        if not hires_grp:
+        hires_grp = self._hires_asset_grp
+        if not hires_grp or not mc.objExists(hires_grp) or not tp.Dcc.list_relatives(
+                node=hires_grp, all_hierarchy=True, relative_type='transform'):
             mc.error('No hires group found ...')
             return False
         hires_meshes = tp.Dcc.list_relatives(node=hires_grp, all_hierarchy=True, full_path=True,
                                              relative_type='transform')
 
         # Checking if shader data is valid
-        check_meshes = dict()
-        for shading_mesh, shading_group in shader_data.items():
-            shading_name = shading_mesh.split('|')[-1]
-            check_meshes[shading_mesh] = False
-            for model_mesh in hires_meshes:
-                mesh_name = model_mesh.split('|')[-1]
-                if shading_name == mesh_name:
-                    check_meshes[shading_mesh] = True
-
-        valid_meshes = True
-        for mesh_name, mesh_check in check_meshes.items():
-            if mesh_check is False:
-                mc.error('Mesh {} not found in both model and shading file ...'.format(mesh_name))
-                valid_meshes = False
-        if not valid_meshes:
+        from . import validator
+        shader_errors = validator.check_shaders(shader_data, hires_meshes)
+        for shader_error in shader_errors:
+            mc.warning(shader_error)
+        if shader_errors:
             mc.error('Some shading meshes and model hires meshes are missed. Please contact TD!')
             return False
 
-        # Create if necessary shaders attribute in model tag data node
-        if not tag_data_node or not mc.objExists(tag_data_node):
-            mc.error('Tag data does not exists in the current scene!'.format(tag_data_node))
-            return False
-
-        attr_exists = tp.Dcc.attribute_exists(node=tag_data_node, attribute_name='shaders')
-        if attr_exists:
-            tp.Dcc.lock_attribute(node=tag_data_node, attribute_name='shaders')
-        else:
-            tp.Dcc.add_string_attribute(node=tag_data_node, attribute_name='shaders')
-            attr_exists = tp.Dcc.attribute_exists(node=tag_data_node, attribute_name='shaders')
-            if not attr_exists:
-                mc.error('No Shaders attribute found on model tag data node: {}'.format(tag_data_node))
-                return False
-
-        tp.Dcc.unlock_attribute(node=tag_data_node, attribute_name='shaders')
-        tp.Dcc.set_string_attribute_value(node=tag_data_node, attribute_name='shaders',
-                                          attribute_value=shader_data)
-        tp.Dcc.lock_attribute(node=tag_data_node, attribute_name='shaders')
-
-        return True
+        # Store shaders data in model tag data node
+        return tag.update_shaders(tag_data_node=tag_data_node, shader_data=shader_data)
 
     def _generate_input_data_structure(self):
-        pass
+        if self._in_model_grp:
+            self._geo['model'] = [self._in_model_grp]
+        if self._in_proxy_grp:
+            self._geo['proxy'] = [self._in_proxy_grp]
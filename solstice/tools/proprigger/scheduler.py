@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains cooperative scheduling of rig builds, used to build rigs without blocking Maya UI
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import traceback
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.utils
+
+
+class BuildCancelled(Exception):
+    """
+    Exception used to stop a build cancelled by the user
+    """
+
+    pass
+
+
+class Status(object):
+    Pending = 'pending'
+    Running = 'running'
+    Finished = 'finished'
+    Cancelled = 'cancelled'
+    Failed = 'failed'
+
+
+class StageRunner(object):
+    """
+    Class that executes the build stages of a rig one at a time. Each stage is deferred to the Maya idle queue,
+    so the UI is refreshed between stages. Cancellation is applied at stage boundaries
+    """
+
+    def __init__(self, asset_rig, on_progress=None, on_finished=None, defer_fn=None, **build_kwargs):
+        super(StageRunner, self).__init__()
+
+        self._asset_rig = asset_rig
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._defer_fn = defer_fn or maya.utils.executeDeferred
+        self._build_kwargs = build_kwargs
+        self._stages = list()
+        self._index = 0
+        self._status = Status.Pending
+        self._cancel_requested = False
+        self._error = None
+
+    @property
+    def asset_rig(self):
+        return self._asset_rig
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def stage_count(self):
+        return len(self._stages)
+
+    @property
+    def completed_stages(self):
+        return self._index
+
+    @property
+    def current_stage(self):
+        """
+        Returns name of the next stage that will be executed
+        :return: str or None
+        """
+
+        return self._stages[self._index][0] if self._index < len(self._stages) else None
+
+    @property
+    def timings(self):
+        """
+        Returns time (in seconds) spent in each one of the executed stages
+        :return: OrderedDict
+        """
+
+        return self._asset_rig.profile.timings
+
+    def start(self):
+        """
+        Starts the build. First stage is executed in the next idle event
+        """
+
+        if self._status != Status.Pending:
+            return
+
+        self._status = Status.Running
+        try:
+            self._asset_rig.begin_build(**self._build_kwargs)
+            self._stages = list(self._asset_rig.get_build_stages())
+        except Exception as exc:
+            self._error = traceback.format_exc()
+            self._finish(Status.Failed, exc)
+            return
+
+        self._defer_fn(self._run_next)
+
+    def cancel(self):
+        """
+        Requests the build to stop. Build stops after the current stage
+        """
+
+        if self._status == Status.Pending:
+            self._status = Status.Cancelled
+        self._cancel_requested = True
+
+    def _run_next(self):
+        if self._status != Status.Running:
+            return
+        if self._cancel_requested:
+            self._finish(Status.Cancelled, BuildCancelled('Build cancelled by the user'))
+            return
+        if self._index >= len(self._stages):
+            self._finish(Status.Finished)
+            return
+
+        stage_name, stage_fn = self._stages[self._index]
+        try:
+            self._asset_rig.run_stage(stage_name, stage_fn)
+        except Exception as exc:
+            self._error = traceback.format_exc()
+            tp.logger.error('Error while executing build stage {}: {}'.format(stage_name, exc))
+            self._finish(Status.Failed, exc)
+            return
+
+        self._index += 1
+        if self._on_progress:
+            self._on_progress(self)
+
+        self._defer_fn(self._run_next)
+
+    def _finish(self, status, error=None):
+        self._status = status
+        try:
+            self._asset_rig.end_build(error=error)
+        except Exception:
+            self._status = Status.Failed
+            self._error = traceback.format_exc()
+        if self._on_finished:
+            self._on_finished(self)
+
+
+class BuildQueue(object):
+    """
+    Class that builds several rigs one after another with StageRunner
+    """
+
+    def __init__(self, on_progress=None, on_finished=None, on_queue_finished=None, defer_fn=None):
+        super(BuildQueue, self).__init__()
+
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._on_queue_finished = on_queue_finished
+        self._defer_fn = defer_fn
+        self._runners = list()
+        self._current = None
+
+    @property
+    def runners(self):
+        return self._runners
+
+    @property
+    def current(self):
+        return self._current
+
+    def is_running(self):
+        return self._current is not None
+
+    def add(self, asset_rig, **build_kwargs):
+        """
+        Adds a new rig to the queue
+        :param asset_rig: rig.AssetRig
+        :param build_kwargs: dict, arguments passed to the rig begin_build function
+        :return: StageRunner
+        """
+
+        runner = StageRunner(
+            asset_rig, on_progress=self._on_progress, on_finished=self._on_runner_finished,
+            defer_fn=self._defer_fn, **build_kwargs)
+        self._runners.append(runner)
+
+        return runner
+
+    def start(self):
+        """
+        Starts building queued rigs if the queue is not already building
+        """
+
+        if not self._current:
+            self._start_next()
+
+    def cancel(self):
+        """
+        Cancels the current build and all the pending ones
+        """
+
+        for runner in self._runners:
+            if runner.status in (Status.Pending, Status.Running):
+                runner.cancel()
+
+    def report(self):
+        """
+        Returns status, error and stage timings of each queued build
+        :return: list<dict>
+        """
+
+        return [{'asset': runner.asset_rig.asset_name, 'status': runner.status, 'error': runner.error,
+                 'timings': dict(runner.timings)} for runner in self._runners]
+
+    def _start_next(self):
+        pending = [runner for runner in self._runners if runner.status == Status.Pending]
+        if not pending:
+            self._current = None
+            if self._on_queue_finished:
+                self._on_queue_finished(self)
+            return
+
+        self._current = pending[0]
+        self._current.start()
+
+    def _on_runner_finished(self, runner):
+        if self._on_finished:
+            self._on_finished(runner)
+        self._start_next()
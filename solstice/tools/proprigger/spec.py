@@ -0,0 +1,504 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains serializable rig specs, used to rebuild rigs without recomputing the build decisions
+A spec stores the rig nodes (without asset geometry), their attribute values and states, connections and driven keys
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import os
+import json
+import hashlib
+
+import tpDccLib as tp
+
+from . import __version__
+
+if tp.is_maya():
+    import maya.cmds as mc
+    import maya.api.OpenMaya as om
+
+try:
+    string_types = basestring
+except NameError:
+    string_types = str
+
+
+SPEC_VERSION = 1
+
+# Node types that are never stored in specs. Unit conversions are recreated by Maya when connections are restored
+SKIP_TYPES = ['unitConversion', 'reference', 'shadingEngine', 'mesh', 'groupId', 'groupParts']
+
+# Driven key curves are stored as driven keys instead of nodes
+DRIVEN_KEY_TYPES = ['animCurveUA', 'animCurveUL', 'animCurveUT', 'animCurveUU']
+
+# Non keyable attributes that are stored for nodes of each type
+TYPE_ATTRS = {
+    'transform': ['rotateOrder', 'inheritsTransform', 'rotatePivotX', 'rotatePivotY', 'rotatePivotZ',
+                  'scalePivotX', 'scalePivotY', 'scalePivotZ'],
+    'nurbsCurve': ['overrideEnabled', 'overrideColor']
+}
+
+
+class RigSpec(object):
+    """
+    Versioned description of a finished rig
+    """
+
+    def __init__(self, name, nodes=None, connections=None, driven_keys=None, geometry_groups=None,
+                 source_key=None, version=SPEC_VERSION):
+        super(RigSpec, self).__init__()
+
+        self.name = name
+        self.nodes = nodes or list()
+        self.connections = connections or list()
+        self.driven_keys = driven_keys or list()
+        self.geometry_groups = geometry_groups or dict()
+        self.source_key = source_key
+        self.version = version
+
+    def __repr__(self):
+        return 'RigSpec({}, nodes={}, connections={})'.format(self.name, len(self.nodes), len(self.connections))
+
+    @property
+    def hash(self):
+        """
+        Returns hash of the spec contents
+        :return: str
+        """
+
+        return hashlib.sha1(json.dumps(self.to_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'name': self.name,
+            'source_key': self.source_key,
+            'geometry_groups': self.geometry_groups,
+            'nodes': self.nodes,
+            'connections': self.connections,
+            'driven_keys': self.driven_keys
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        version = data.get('version')
+        if version != SPEC_VERSION:
+            raise ValueError('Rig spec version {} is not supported. Supported version: {}'.format(
+                version, SPEC_VERSION))
+
+        return cls(
+            name=data['name'], nodes=data.get('nodes'), connections=[tuple(c) for c in data.get('connections', [])],
+            driven_keys=data.get('driven_keys'), geometry_groups=data.get('geometry_groups'),
+            source_key=data.get('source_key'), version=version)
+
+    def save(self, file_path):
+        """
+        Stores the spec in a JSON file
+        :param file_path: str
+        """
+
+        with open(file_path, 'w') as fh:
+            json.dump(self.to_dict(), fh, separators=(',', ':'), sort_keys=True)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads a spec from a JSON file
+        :param file_path: str
+        :return: RigSpec
+        """
+
+        with open(file_path, 'r') as fh:
+            return cls.from_dict(json.load(fh))
+
+    def validate(self):
+        """
+        Returns structural errors of the spec: parents defined after their children and connections, driven keys
+        or geometry groups that reference unknown nodes
+        :return: list<str>
+        """
+
+        errors = list()
+        keys = set()
+        for node in self.nodes:
+            if node.get('parent') and node['parent'] not in keys:
+                errors.append('Parent {} of node {} is not defined before it'.format(node['parent'], node['key']))
+            keys.add(node['key'])
+
+        plugs = [plug for connection in self.connections for plug in connection]
+        for driven_key in self.driven_keys:
+            plugs.append(driven_key['driver'])
+            plugs.extend(driven_key['driven'])
+        for plug in plugs:
+            if plug.split('.', 1)[0] not in keys:
+                errors.append('Plug {} references an unknown node'.format(plug))
+        for geo_type, key in self.geometry_groups.items():
+            if key not in keys:
+                errors.append('Geometry group {} ({}) is not defined'.format(key, geo_type))
+
+        return errors
+
+
+def get_source_key(file_paths, options=None):
+    """
+    Returns a key that changes when any of the given source files, the build options, the spec version or the
+    rigger version changes, so specs are rebuilt when the rigger is updated
+    :param file_paths: list<str>
+    :param options: dict or None, build options of the rig (rig class, rig arguments ...)
+    :return: str
+    """
+
+    hasher = hashlib.sha1()
+    hasher.update('{}:{}'.format(SPEC_VERSION, __version__.__version__).encode('utf-8'))
+    if options:
+        hasher.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+    for file_path in sorted(file_paths):
+        stat = os.stat(file_path) if os.path.isfile(file_path) else None
+        hasher.update('{}:{}:{}'.format(
+            os.path.normpath(file_path), stat.st_size if stat else -1, stat.st_mtime if stat else -1).encode('utf-8'))
+
+    return hasher.hexdigest()
+
+
+class SpecCache(object):
+    """
+    Stores rig specs in a folder, one file per asset
+    """
+
+    def __init__(self, directory):
+        super(SpecCache, self).__init__()
+
+        self._directory = directory
+
+    def get_spec_file(self, asset_name):
+        return os.path.join(self._directory, '{}.rigspec.json'.format(asset_name))
+
+    def get(self, asset_name, source_key=None):
+        """
+        Returns cached spec of the given asset
+        :param asset_name: str
+        :param source_key: str or None, if given, specs created from other versions of the source files are ignored
+        :return: RigSpec or None
+        """
+
+        spec_file = self.get_spec_file(asset_name)
+        if not os.path.isfile(spec_file):
+            return None
+
+        try:
+            rig_spec = RigSpec.load(spec_file)
+        except ValueError as exc:
+            tp.logger.warning('Ignoring cached rig spec {}: {}'.format(spec_file, exc))
+            return None
+        if source_key is not None and rig_spec.source_key != source_key:
+            return None
+
+        return rig_spec
+
+    def put(self, rig_spec):
+        """
+        Stores given spec in the cache
+        :param rig_spec: RigSpec
+        :return: str, spec file
+        """
+
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+        spec_file = self.get_spec_file(rig_spec.name)
+        rig_spec.save(spec_file)
+
+        return spec_file
+
+
+def _strip_namespace(name):
+    return '|'.join(token.split(':')[-1] for token in name.split('|'))
+
+
+def _get_attr_states(node):
+    attrs = set(mc.listAttr(node, keyable=True) or list())
+    attrs.update(mc.listAttr(node, channelBox=True) or list())
+    attrs.update(mc.listAttr(node, locked=True) or list())
+
+    states = dict()
+    for attr in sorted(attrs):
+        plug = '{}.{}'.format(node, attr)
+        try:
+            states[attr] = [mc.getAttr(plug, lock=True), mc.getAttr(plug, keyable=True),
+                            mc.getAttr(plug, channelBox=True)]
+        except (RuntimeError, ValueError):
+            continue
+
+    return states
+
+
+def _get_user_attrs(node):
+    user_attrs = list()
+    for attr in mc.listAttr(node, userDefined=True) or list():
+        attr_type = mc.getAttr('{}.{}'.format(node, attr), type=True)
+        user_attr = {'name': attr, 'type': attr_type}
+        if attr_type == 'enum':
+            user_attr['enum'] = mc.attributeQuery(attr, node=node, listEnum=True)[0]
+        user_attrs.append(user_attr)
+
+    return user_attrs
+
+
+def _get_values(node, node_type, user_attrs):
+    attrs = set(mc.listAttr(node, keyable=True) or list())
+    attrs.update(TYPE_ATTRS.get(node_type, list()))
+    if mc.objectType(node, isAType='transform'):
+        attrs.update(TYPE_ATTRS['transform'])
+    attrs.update(user_attr['name'] for user_attr in user_attrs if user_attr['type'] != 'message')
+
+    values = dict()
+    for attr in sorted(attrs):
+        try:
+            value = mc.getAttr('{}.{}'.format(node, attr))
+        except (RuntimeError, ValueError):
+            continue
+        if value is not None and not isinstance(value, (list, tuple)):
+            values[attr] = value
+
+    return values
+
+
+def _get_curve_data(node):
+    selection = om.MSelectionList()
+    selection.add(node)
+    curve_fn = om.MFnNurbsCurve(selection.getDagPath(0))
+
+    return {
+        'degree': curve_fn.degree,
+        'form': curve_fn.form,
+        'knots': list(curve_fn.knots()),
+        'cvs': [[point.x, point.y, point.z] for point in curve_fn.cvPositions(om.MSpace.kObject)]
+    }
+
+
+def capture_spec(root, geometry_groups=None, name=None, source_key=None):
+    """
+    Returns the spec of a rig in the current scene
+    Transforms below the geometry groups are asset geometry and they are not stored in the spec
+    :param root: str, rig main group
+    :param geometry_groups: dict(str, str), geometry groups of the rig keyed by geometry type (model, proxy)
+    :param name: str or None, name of the spec. If not given, root name is used
+    :param source_key: str or None, key of the source files the rig was built from
+    :return: RigSpec
+    """
+
+    root = mc.ls(root, long=True)[0]
+    root_parent = root.rsplit('|', 1)[0]
+    geometry_groups = dict(
+        (geo_type, mc.ls(grp, long=True)[0]) for geo_type, grp in (geometry_groups or dict()).items() if grp)
+    geometry_paths = set(geometry_groups.values())
+
+    def _get_key(node):
+        long_name = mc.ls(node, long=True)[0]
+        if long_name.startswith('|'):
+            return _strip_namespace(long_name[len(root_parent):].lstrip('|'))
+        return _strip_namespace(long_name)
+
+    dag_nodes = list()
+    pending = [root]
+    while pending:
+        node = pending.pop(0)
+        dag_nodes.append(node)
+        for child in mc.listRelatives(node, children=True, fullPath=True) or list():
+            child_type = mc.nodeType(child)
+            if child_type in SKIP_TYPES or (node in geometry_paths and child_type == 'transform'):
+                continue
+            pending.append(child)
+
+    history = mc.ls(mc.listHistory(dag_nodes, pruneDagObjects=True) or list(), long=True) or list()
+    dg_nodes = sorted(set(node for node in history if not node.startswith('|') and mc.nodeType(node) not in SKIP_TYPES))
+    driven_key_curves = [node for node in dg_nodes if mc.nodeType(node) in DRIVEN_KEY_TYPES]
+    dg_nodes = [node for node in dg_nodes if node not in driven_key_curves]
+
+    keys = dict((node, _get_key(node)) for node in dag_nodes + dg_nodes)
+    nodes = list()
+    for node in dag_nodes + dg_nodes:
+        node_type = mc.nodeType(node)
+        user_attrs = _get_user_attrs(node)
+        node_spec = {
+            'key': keys[node],
+            'name': keys[node].split('|')[-1],
+            'type': node_type,
+            'dag': node in dag_nodes,
+            'parent': keys.get(node.rsplit('|', 1)[0]) if node in dag_nodes else None,
+            'user_attrs': user_attrs,
+            'values': _get_values(node, node_type, user_attrs),
+            'states': _get_attr_states(node)
+        }
+        if node_type == 'nurbsCurve':
+            node_spec['curve'] = _get_curve_data(node)
+        nodes.append(node_spec)
+
+    short_keys = dict((node.split('|')[-1], key) for node, key in keys.items())
+    short_keys.update(dict((mc.ls(node)[0], key) for node, key in keys.items()))
+
+    def _get_plug_key(plug):
+        node, attr = plug.split('.', 1)
+        key = short_keys.get(node)
+        return '{}.{}'.format(key, attr) if key else None
+
+    connections = list()
+    for node in dag_nodes + dg_nodes:
+        plugs = mc.listConnections(
+            node, source=True, destination=False, connections=True, plugs=True, skipConversionNodes=True) or list()
+        for target_plug, source_plug in zip(plugs[::2], plugs[1::2]):
+            source = _get_plug_key(source_plug)
+            target = _get_plug_key(target_plug)
+            if source and target:
+                connections.append((source, target))
+
+    driven_keys = list()
+    for curve in driven_key_curves:
+        drivers = mc.listConnections(
+            '{}.input'.format(curve), source=True, destination=False, plugs=True, skipConversionNodes=True) or list()
+        driven = mc.listConnections(
+            '{}.output'.format(curve), source=False, destination=True, plugs=True, skipConversionNodes=True) or list()
+        driver = _get_plug_key(drivers[0]) if drivers else None
+        driven = [plug for plug in (_get_plug_key(plug) for plug in driven) if plug]
+        if not driver or not driven:
+            continue
+        driven_keys.append({
+            'driver': driver,
+            'driven': driven,
+            'keys': [list(key) for key in zip(
+                mc.keyframe(curve, query=True, floatChange=True), mc.keyframe(curve, query=True, valueChange=True))],
+            'in_tangent': (mc.keyTangent(curve, query=True, inTangentType=True) or ['auto'])[0],
+            'out_tangent': (mc.keyTangent(curve, query=True, outTangentType=True) or ['auto'])[0]
+        })
+
+    return RigSpec(
+        name=name or _strip_namespace(root.split('|')[-1]), nodes=nodes, connections=connections,
+        driven_keys=driven_keys, source_key=source_key,
+        geometry_groups=dict((geo_type, keys[grp]) for geo_type, grp in geometry_groups.items()))
+
+
+def _get_node_name(mobj):
+    if mobj.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(mobj).fullPathName()
+    return om.MFnDependencyNode(mobj).name()
+
+
+def build_spec(rig_spec, geometry=None):
+    """
+    Creates the rig described by the given spec in the current scene
+    Nodes are created and connected with batched modifier calls
+    :param rig_spec: RigSpec
+    :param geometry: dict(str, list<str>), geometry nodes parented to each geometry group, keyed by geometry type
+    :return: dict(str, str), names of the created nodes keyed by spec node key
+    """
+
+    errors = rig_spec.validate()
+    if errors:
+        raise ValueError('Rig spec {} is not valid:\n\t{}'.format(rig_spec.name, '\n\t'.join(errors)))
+
+    dag_modifier = om.MDagModifier()
+    dg_modifier = om.MDGModifier()
+    objects = dict()
+    for node in rig_spec.nodes:
+        if node['type'] == 'nurbsCurve':
+            continue
+        if node['dag']:
+            parent = objects[node['parent']] if node['parent'] else om.MObject.kNullObj
+            objects[node['key']] = dag_modifier.createNode(node['type'], parent)
+            dag_modifier.renameNode(objects[node['key']], node['name'])
+        else:
+            objects[node['key']] = dg_modifier.createNode(node['type'])
+            dg_modifier.renameNode(objects[node['key']], node['name'])
+    dag_modifier.doIt()
+    dg_modifier.doIt()
+
+    for node in rig_spec.nodes:
+        if node['type'] != 'nurbsCurve':
+            continue
+        curve = node['curve']
+        curve_obj = om.MFnNurbsCurve().create(
+            [om.MPoint(*cv) for cv in curve['cvs']], curve['knots'], curve['degree'], curve['form'],
+            False, True, objects[node['parent']])
+        om.MFnDependencyNode(curve_obj).setName(node['name'])
+        objects[node['key']] = curve_obj
+
+    handles = dict((key, om.MObjectHandle(mobj)) for key, mobj in objects.items())
+
+    def _get_name(key):
+        return _get_node_name(handles[key].object())
+
+    def _get_plug(plug):
+        key, attr = plug.split('.', 1)
+        return '{}.{}'.format(_get_name(key), attr)
+
+    for geo_type, nodes in (geometry or dict()).items():
+        geometry_group = rig_spec.geometry_groups.get(geo_type)
+        if geometry_group and nodes:
+            mc.parent(nodes, _get_name(geometry_group))
+
+    for node in rig_spec.nodes:
+        node_name = _get_name(node['key'])
+        for user_attr in node['user_attrs']:
+            if mc.attributeQuery(user_attr['name'], node=node_name, exists=True):
+                continue
+            if user_attr['type'] == 'enum':
+                mc.addAttr(node_name, longName=user_attr['name'], attributeType='enum', enumName=user_attr['enum'])
+            elif user_attr['type'] in ('string', 'matrix'):
+                mc.addAttr(node_name, longName=user_attr['name'], dataType=user_attr['type'])
+            else:
+                mc.addAttr(node_name, longName=user_attr['name'], attributeType=user_attr['type'])
+
+    driven_plugs = set(target for _, target in rig_spec.connections)
+    for driven_key in rig_spec.driven_keys:
+        driven_plugs.update(driven_key['driven'])
+    for node in rig_spec.nodes:
+        node_name = _get_name(node['key'])
+        for attr, value in node['values'].items():
+            if '{}.{}'.format(node['key'], attr) in driven_plugs:
+                continue
+            plug = '{}.{}'.format(node_name, attr)
+            if isinstance(value, string_types):
+                mc.setAttr(plug, value, type='string')
+            else:
+                mc.setAttr(plug, value)
+
+    # Connections are batched in a single modifier. Plugs that cannot be resolved before connecting them (new
+    # array elements) are connected with commands
+    connect_modifier = om.MDGModifier()
+    pending = list()
+    for source, target in rig_spec.connections:
+        try:
+            selection = om.MSelectionList()
+            selection.add(_get_plug(source))
+            selection.add(_get_plug(target))
+            connect_modifier.connect(selection.getPlug(0), selection.getPlug(1))
+        except (RuntimeError, TypeError):
+            pending.append((source, target))
+    connect_modifier.doIt()
+    for source, target in pending:
+        mc.connectAttr(_get_plug(source), _get_plug(target), force=True)
+
+    for driven_key in rig_spec.driven_keys:
+        for driven in driven_key['driven']:
+            for driver_value, value in driven_key['keys']:
+                mc.setDrivenKeyframe(
+                    _get_plug(driven), currentDriver=_get_plug(driven_key['driver']), driverValue=driver_value,
+                    value=value, inTangentType=driven_key['in_tangent'], outTangentType=driven_key['out_tangent'])
+
+    for node in rig_spec.nodes:
+        node_name = _get_name(node['key'])
+        for attr, (locked, keyable, channel_box) in node['states'].items():
+            plug = '{}.{}'.format(node_name, attr)
+            mc.setAttr(plug, keyable=keyable)
+            if not keyable:
+                mc.setAttr(plug, channelBox=channel_box)
+            mc.setAttr(plug, lock=locked)
+
+    return dict((key, _get_name(key)) for key in handles)
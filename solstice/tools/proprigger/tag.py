@@ -1,4 +1,7 @@
-import maya.cmds as cmds
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as cmds
 
 
 class TagDefinitions(object):
@@ -8,6 +11,10 @@ class TagDefinitions(object):
     NODE_ATTRIBUTE_NAME = 'node'
     TAG_DATA_NODE_NAME = 'tag_data'
     TAG_DATA_SCENE_NAME = 'tag_data_scene'
+    TYPES_ATTRIBUTE_NAME = 'types'
+    PROXY_ATTRIBUTE_NAME = 'proxy'
+    HIRES_ATTRIBUTE_NAME = 'hires'
+    SHADERS_ATTRIBUTE_NAME = 'shaders'
 
 
 def add_string_attribute(node, attribute_name, keyable=False):
@@ -51,8 +58,16 @@ def select_object(node, replace_selection=False, **kwargs):
     cmds.select(node, replace=replace_selection, **kwargs)
 
 
-def create_tag_node():
-    current_selection = cmds.ls(sl=True)[0]
+def get_tag_data_node(node):
+    if not attribute_exists(node=node, attribute_name=TagDefinitions.TAG_DATA_ATTRIBUTE_NAME):
+        return None
+    connections = cmds.listConnections('{}.{}'.format(node, TagDefinitions.TAG_DATA_ATTRIBUTE_NAME),
+                                       source=True, destination=False)
+    return connections[0] if connections else None
+
+
+def create_tag_node(node=None, category=None):
+    current_selection = node or cmds.ls(sl=True)[0]
     tag_data_node = cmds.createNode('network', n='tag_data')
     add_string_attribute(node=tag_data_node, attribute_name=TagDefinitions.TAG_TYPE_ATTRIBUTE_NAME)
     set_string_attribute_value(node=tag_data_node, attribute_name=TagDefinitions.TAG_TYPE_ATTRIBUTE_NAME,
@@ -61,7 +76,10 @@ def create_tag_node():
     hide_attribute(node=tag_data_node, attribute_name=TagDefinitions.TAG_TYPE_ATTRIBUTE_NAME)
     lock_attribute(node=tag_data_node, attribute_name=TagDefinitions.TAG_TYPE_ATTRIBUTE_NAME)
     add_message_attribute(node=tag_data_node, attribute_name=TagDefinitions.NODE_ATTRIBUTE_NAME)
-    print(current_selection)
+    if category:
+        add_string_attribute(node=tag_data_node, attribute_name=TagDefinitions.TYPES_ATTRIBUTE_NAME)
+        set_string_attribute_value(node=tag_data_node, attribute_name=TagDefinitions.TYPES_ATTRIBUTE_NAME,
+                                   attribute_value=category)
     if not attribute_exists(node=current_selection, attribute_name=TagDefinitions.TAG_DATA_ATTRIBUTE_NAME):
         add_message_attribute(node=current_selection, attribute_name=TagDefinitions.TAG_DATA_ATTRIBUTE_NAME)
     unlock_attribute(node=current_selection, attribute_name=TagDefinitions.TAG_DATA_ATTRIBUTE_NAME)
@@ -70,4 +88,35 @@ def create_tag_node():
                       TagDefinitions.TAG_DATA_ATTRIBUTE_NAME)
     lock_attribute(node=current_selection, attribute_name=TagDefinitions.TAG_DATA_ATTRIBUTE_NAME)
     lock_attribute(node=tag_data_node, attribute_name=TagDefinitions.NODE_ATTRIBUTE_NAME)
-    select_object(tag_data_node)
+    if not node:
+        select_object(tag_data_node)
+    return tag_data_node
+
+
+def update_group(tag_data_node, attribute_name, group):
+    if not group or not cmds.objExists(group):
+        return False
+    if not attribute_exists(node=tag_data_node, attribute_name=attribute_name):
+        add_message_attribute(node=tag_data_node, attribute_name=attribute_name)
+    unlock_attribute(node=tag_data_node, attribute_name=attribute_name)
+    connect_attribute(group, 'message', tag_data_node, attribute_name, force=True)
+    lock_attribute(node=tag_data_node, attribute_name=attribute_name)
+    return True
+
+
+def update_proxy_group(tag_data_node, proxy_grp):
+    return update_group(tag_data_node, TagDefinitions.PROXY_ATTRIBUTE_NAME, proxy_grp)
+
+
+def update_hires_group(tag_data_node, hires_grp):
+    return update_group(tag_data_node, TagDefinitions.HIRES_ATTRIBUTE_NAME, hires_grp)
+
+
+def update_shaders(tag_data_node, shader_data):
+    if not attribute_exists(node=tag_data_node, attribute_name=TagDefinitions.SHADERS_ATTRIBUTE_NAME):
+        add_string_attribute(node=tag_data_node, attribute_name=TagDefinitions.SHADERS_ATTRIBUTE_NAME)
+    unlock_attribute(node=tag_data_node, attribute_name=TagDefinitions.SHADERS_ATTRIBUTE_NAME)
+    set_string_attribute_value(node=tag_data_node, attribute_name=TagDefinitions.SHADERS_ATTRIBUTE_NAME,
+                               attribute_value=shader_data)
+    lock_attribute(node=tag_data_node, attribute_name=TagDefinitions.SHADERS_ATTRIBUTE_NAME)
+    return True
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a build transaction that journals created nodes, connections and namespaces so failed builds
+can be rolled back
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import os
+import tempfile
+import traceback
+
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+    import maya.api.OpenMaya as om
+
+from . import profiles
+
+
+def _get_node_name(handle):
+    if not handle.isValid() or not handle.isAlive():
+        return None
+
+    node = handle.object()
+    if node.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(node).fullPathName()
+
+    return om.MFnDependencyNode(node).name()
+
+
+def _get_plug_name(handle, attribute_name):
+    node_name = _get_node_name(handle)
+    if not node_name:
+        return None
+
+    return '{}.{}'.format(node_name, attribute_name)
+
+
+def _get_attribute_name(plug):
+    return plug.partialName(useFullAttributePath=True, useLongNames=True)
+
+
+def _get_namespaces():
+    return set(mc.namespaceInfo(':', listOnlyNamespaces=True, recurse=True, absoluteName=True) or list())
+
+
+class BuildTransaction(object):
+    """
+    Context manager that suspends undo recording and journals every node and connection created while it is active
+    If an exception is raised inside the context, all journaled nodes are deleted, all journaled connections
+    between pre-existing nodes are disconnected, namespaces created by the build are removed and preserved
+    pre-existing nodes are restored, leaving the scene as it was before the build
+    Pre-existing nodes deleted or moved by the build must be preserved (see preserve) before modifying them
+    The context can be entered several times (once per build stage) and the journal is kept between them, so undo
+    and journaling callbacks are only active while the build is running and not while Maya is idle
+    """
+
+    def __init__(self, suspend_undo=True, enabled=True):
+        super(BuildTransaction, self).__init__()
+
+        self._enabled = enabled
+        self._suspend_undo = suspend_undo
+        self._undo_state = None
+        self._callbacks = list()
+        self._nodes = list()
+        self._node_hashes = set()
+        self._connections = dict()
+        self._preserved = list()
+        self._namespaces = _get_namespaces() if enabled else set()
+
+    def __enter__(self):
+        if not self._enabled:
+            return self
+
+        if self._suspend_undo:
+            self._undo_state = mc.undoInfo(query=True, state=True)
+            mc.undoInfo(stateWithoutFlush=False)
+
+        self._callbacks.append(om.MDGMessage.addNodeAddedCallback(self._on_node_added, 'dependNode'))
+        self._callbacks.append(om.MDGMessage.addConnectionCallback(self._on_connection))
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self._enabled:
+            return False
+
+        self._remove_callbacks()
+
+        try:
+            if exc_type is not None:
+                tp.logger.warning('Build failed, rolling back {} nodes and {} connections ...'.format(
+                    len(self._nodes), len(self._connections)))
+                self._safe_rollback()
+        finally:
+            if self._suspend_undo and self._undo_state is not None:
+                mc.undoInfo(stateWithoutFlush=self._undo_state)
+
+        # Original build error is always raised, even if the rollback fails
+        return False
+
+    @property
+    def nodes(self):
+        """
+        Returns names of the journaled nodes that still exist
+        :return: list<str>
+        """
+
+        return [name for name in [_get_node_name(handle) for handle in self._nodes] if name]
+
+    @property
+    def connections(self):
+        """
+        Returns journaled connections that still exist
+        :return: list<tuple(str, str)>
+        """
+
+        connections = list()
+        for (source_handle, source_attr), (target_handle, target_attr) in self._connections.values():
+            source_plug = _get_plug_name(source_handle, source_attr)
+            target_plug = _get_plug_name(target_handle, target_attr)
+            if source_plug and target_plug:
+                connections.append((source_plug, target_plug))
+
+        return connections
+
+    def preserve(self, nodes):
+        """
+        Stores pre-existing nodes, with their descendants, before the build deletes or moves them, so they can be
+        restored if the build is rolled back. Nodes created by the build are not stored
+        :param nodes: list<str>
+        """
+
+        if not self._enabled:
+            return
+
+        created = set(self.nodes)
+        nodes = [node for node in mc.ls(nodes, long=True) or list() if node not in created]
+        if not nodes:
+            return
+
+        for node in nodes:
+            file_handle, file_path = tempfile.mkstemp(suffix='.ma')
+            os.close(file_handle)
+            parent = mc.listRelatives(node, parent=True, fullPath=True)
+            profiles.export_nodes(
+                [node], file_path, type='mayaAscii', preserveReferences=True, shader=True, channels=True,
+                constraints=True, expressions=True, constructionHistory=True)
+            self._preserved.append((file_path, parent[0] if parent else None))
+
+    def commit(self):
+        """
+        Clears the journal once the build succeeds, removing the files of the preserved nodes
+        """
+
+        for file_path, _ in self._preserved:
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+        self._clear()
+
+    def abort(self):
+        """
+        Rolls back the journal outside of the context, used when a build is cancelled or fails between stages
+        :return: bool, Whether the rollback succeeded or not
+        """
+
+        if not self._enabled:
+            return True
+
+        undo_state = mc.undoInfo(query=True, state=True)
+        if self._suspend_undo:
+            mc.undoInfo(stateWithoutFlush=False)
+        try:
+            return self._safe_rollback()
+        finally:
+            if self._suspend_undo:
+                mc.undoInfo(stateWithoutFlush=undo_state)
+
+    def rollback(self):
+        """
+        Deletes all journaled nodes, disconnects journaled connections between pre-existing nodes, removes
+        namespaces created by the build and restores preserved nodes
+        """
+
+        for (source_handle, source_attr), (target_handle, target_attr) in self._connections.values():
+            if source_handle.hashCode() in self._node_hashes or target_handle.hashCode() in self._node_hashes:
+                continue
+            source_plug = _get_plug_name(source_handle, source_attr)
+            target_plug = _get_plug_name(target_handle, target_attr)
+            if source_plug and target_plug and mc.isConnected(source_plug, target_plug):
+                mc.disconnectAttr(source_plug, target_plug)
+
+        # Nodes are deleted in reverse creation order, so children are removed before their parents
+        for node in reversed(self.nodes):
+            if mc.objExists(node):
+                mc.lockNode(node, lock=False)
+                mc.delete(node)
+
+        # Deepest namespaces are removed first. Nodes left in them are moved to the root namespace, never deleted
+        mc.namespace(setNamespace=':')
+        for namespace in sorted(_get_namespaces() - self._namespaces, key=lambda name: -name.count(':')):
+            if mc.namespace(exists=namespace):
+                mc.namespace(removeNamespace=namespace, mergeNamespaceWithRoot=True)
+
+        for file_path, parent in reversed(self._preserved):
+            new_nodes = mc.file(
+                file_path, i=True, namespace=':', mergeNamespacesOnClash=True, preserveReferences=True,
+                returnNewNodes=True) or list()
+            roots = [node for node in mc.ls(new_nodes, type='transform', long=True) or list() if node.count('|') == 1]
+            if parent and roots and mc.objExists(parent):
+                mc.parent(roots, parent)
+            os.remove(file_path)
+
+        self._clear()
+
+    def _safe_rollback(self):
+        """
+        Internal function that rolls back the journal, logging rollback errors instead of raising them, so they do
+        not hide the error that stopped the build
+        :return: bool, Whether the rollback succeeded or not
+        """
+
+        try:
+            self.rollback()
+        except Exception:
+            tp.logger.error('Build rollback failed, scene may contain partial build nodes:\n{}'.format(
+                traceback.format_exc()))
+            return False
+
+        return True
+
+    def _clear(self):
+        self._nodes = list()
+        self._node_hashes = set()
+        self._connections = dict()
+        self._preserved = list()
+
+    def _remove_callbacks(self):
+        for callback in self._callbacks:
+            om.MMessage.removeCallback(callback)
+        self._callbacks = list()
+
+    def _on_node_added(self, node, *args):
+        handle = om.MObjectHandle(node)
+        self._nodes.append(handle)
+        self._node_hashes.add(handle.hashCode())
+
+    def _on_connection(self, source_plug, target_plug, made, *args):
+        key = (source_plug.name(), target_plug.name())
+        if not made:
+            self._connections.pop(key, None)
+            return
+
+        self._connections[key] = (
+            (om.MObjectHandle(source_plug.node()), _get_attribute_name(source_plug)),
+            (om.MObjectHandle(target_plug.node()), _get_attribute_name(target_plug)))
@@ -1,14 +1,19 @@
 from functools import partial
 
 import maya.cmds as mc
-from . import prop
+import tpDccLib as tp
+
+WINDOW_NAME = "PropBaseRigUI"
+
+# widgets of the open window and queue of the rigs built from it
+_WIDGETS = dict()
+_BUILD_QUEUE = None
 
 
 def run_ui():
-    window_name = "PropBaseRigUI"
-    if mc.window(window_name, exists=True):
-        mc.deleteUI(window_name, window=True)
-    window = mc.window(window_name, title="PropBaseRig", widthHeight=(250, 90), sizeable=False)
+    if mc.window(WINDOW_NAME, exists=True):
+        mc.deleteUI(WINDOW_NAME, window=True)
+    window = mc.window(WINDOW_NAME, title="PropBaseRig", widthHeight=(300, 330), sizeable=True)
     main_col = mc.columnLayout(adjustableColumn=True)
     base_lay = mc.rowColumnLayout(numberOfColumns=2, parent=main_col, adjustableColumn=True,
                                   columnWidth=[(1, 50), (2, 200)], columnAlign=[(1, "left")])
@@ -20,33 +25,120 @@ def run_ui():
     proxy_txf = mc.textField(placeholderText="S_PRP_01_shovel_PROXY", parent=base_lay)
     mc.text("Builder:", parent=base_lay)
     builder_txf = mc.textField(placeholderText="S_PRP_01_shovel_BUILDER", parent=base_lay)
-    mc.button(label='Execute', parent=main_col, command=partial(run_logic, name_txf, model_txf, proxy_txf, builder_txf))
+    fields = (name_txf, model_txf, proxy_txf, builder_txf)
+
+    mc.text("Queue:", align="left", parent=main_col)
+    _WIDGETS['queue'] = mc.textScrollList(numberOfRows=4, parent=main_col)
+    buttons_lay = mc.rowLayout(numberOfColumns=3, parent=main_col, adjustableColumn=2)
+    mc.button(label='Add to Queue', parent=buttons_lay, command=partial(add_to_queue, *fields))
+    _WIDGETS['execute'] = mc.button(label='Execute', parent=buttons_lay, command=partial(run_logic, *fields))
+    _WIDGETS['cancel'] = mc.button(label='Cancel', parent=buttons_lay, enable=False, command=cancel_build)
+
+    _WIDGETS['progress'] = mc.progressBar(maxValue=1, parent=main_col)
+    _WIDGETS['status'] = mc.text(label='', align="left", parent=main_col)
+    _WIDGETS['log'] = mc.scrollField(editable=False, wordWrap=False, height=120, parent=main_col)
     mc.showWindow(window)
 
 
-def run_logic(name_txf, model_txf, proxy_txf, builder_txf, *args):
+def _get_queue():
+    global _BUILD_QUEUE
+
+    if _BUILD_QUEUE is None:
+        from . import scheduler
+        _BUILD_QUEUE = scheduler.BuildQueue(
+            on_progress=_on_progress, on_finished=_on_finished, on_queue_finished=_on_queue_finished)
+
+    return _BUILD_QUEUE
+
+
+def _log(message):
+    if mc.scrollField(_WIDGETS.get('log', ''), exists=True):
+        mc.scrollField(_WIDGETS['log'], edit=True, insertionPosition=0, insertText='{}\n'.format(message))
+    tp.logger.info(message)
+
+
+def _set_building(building):
+    if mc.button(_WIDGETS.get('cancel', ''), exists=True):
+        mc.button(_WIDGETS['cancel'], edit=True, enable=building)
+        mc.button(_WIDGETS['execute'], edit=True, enable=not building)
+
+
+def add_to_queue(name_txf, model_txf, proxy_txf, builder_txf, *args):
     # query data
     name = mc.textField(name_txf, q=True, text=True)
     model_grp = mc.textField(model_txf, q=True, text=True)
     proxy_grp = mc.textField(proxy_txf, q=True, text=True)
     builder_grp = mc.textField(builder_txf, q=True, text=True)
+    if not name:
+        return
 
     # check
     if model_grp:
-        assert mc.objExists(model_grp), "object does not exist"
+        assert mc.objExists(model_grp), "object does not exist: {}".format(model_grp)
     if proxy_grp:
-        assert mc.objExists(model_grp), "object does not exist"
+        assert mc.objExists(proxy_grp), "object does not exist: {}".format(proxy_grp)
     if builder_grp:
-        assert mc.objExists(model_grp), "object does not exist"
+        assert mc.objExists(builder_grp), "object does not exist: {}".format(builder_grp)
+
+    # rig modules are only imported when a rig is built
+    from . import prop
 
     prop_autorig = prop.PropRig(
         asset_name=name,
         import_scenes=False,
         model_grp=model_grp,
         proxy_grp=proxy_grp,
-        builder_grp=builder_grp
+        builder_grp=builder_grp,
+        transactional=True
     )
-    prop_autorig.build()
+    _get_queue().add(prop_autorig)
+    if mc.textScrollList(_WIDGETS.get('queue', ''), exists=True):
+        mc.textScrollList(_WIDGETS['queue'], edit=True, append=name)
+    for text_field in (name_txf, model_txf, proxy_txf, builder_txf):
+        mc.textField(text_field, edit=True, text='')
+
+
+def run_logic(name_txf, model_txf, proxy_txf, builder_txf, *args):
+    # current fields are queued too, so a single asset can be built without adding it to the queue first
+    add_to_queue(name_txf, model_txf, proxy_txf, builder_txf)
+
+    build_queue = _get_queue()
+    if build_queue.is_running():
+        return
+    _set_building(True)
+    build_queue.start()
+
+
+def cancel_build(*args):
+    if _BUILD_QUEUE:
+        _log('Cancelling build. It will stop after the current stage ...')
+        _BUILD_QUEUE.cancel()
+
+
+def _on_progress(runner):
+    stage_name, stage_time = list(runner.timings.items())[-1]
+    if mc.progressBar(_WIDGETS.get('progress', ''), exists=True):
+        mc.progressBar(_WIDGETS['progress'], edit=True, maxValue=runner.stage_count, progress=runner.completed_stages)
+        mc.text(_WIDGETS['status'], edit=True, label='{}: {} ({}/{})'.format(
+            runner.asset_rig.asset_name, runner.current_stage or 'done', runner.completed_stages, runner.stage_count))
+    _log('{}: {} {:.3f}s'.format(runner.asset_rig.asset_name, stage_name, stage_time))
+
+
+def _on_finished(runner):
+    _log('{}: build {} ({:.3f}s)'.format(runner.asset_rig.asset_name, runner.status, sum(runner.timings.values())))
+    if runner.error:
+        _log(runner.error)
+    if mc.textScrollList(_WIDGETS.get('queue', ''), exists=True):
+        mc.textScrollList(_WIDGETS['queue'], edit=True, removeIndexedItem=1)
+
 
+def _on_queue_finished(build_queue):
+    global _BUILD_QUEUE
 
-run_ui()
+    _BUILD_QUEUE = None
+    _set_building(False)
+    if mc.textScrollList(_WIDGETS.get('queue', ''), exists=True):
+        mc.textScrollList(_WIDGETS['queue'], edit=True, removeAll=True)
+    if mc.text(_WIDGETS.get('status', ''), exists=True):
+        mc.text(_WIDGETS['status'], edit=True, label='')
+        mc.progressBar(_WIDGETS['progress'], edit=True, progress=0)
@@ -1,4 +1,11 @@
-import maya.cmds as mc
+import numpy as np
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+    import maya.api.OpenMaya as om
+
+from . import meshdata
 
 
 def lock_all_transforms(node, lock_visibility=None):
@@ -10,3 +17,133 @@ def lock_all_transforms(node, lock_visibility=None):
 
     if lock_visibility:
         mc.setAttr("{}.v".format(node), lock=True)
+
+
+def open_file(file_path, force=False):
+    """
+    Opens the given scene file. Unsaved changes of the current scene are never discarded, unless forced or
+    running in batch mode
+    :param file_path: str
+    :param force: bool, Whether to discard unsaved changes of the current scene
+    """
+
+    if not force and not mc.about(batch=True) and mc.file(query=True, modified=True):
+        raise RuntimeError('Current scene has unsaved changes. Save them before opening {}'.format(file_path))
+
+    mc.file(file_path, open=True, force=True)
+
+
+def get_meshes(nodes):
+    """
+    Returns all non intermediate mesh shapes in the hierarchy of the given nodes
+    :param nodes: list<str>
+    :return: list<str>
+    """
+
+    if not nodes:
+        return list()
+
+    meshes = mc.ls(nodes, type='mesh', long=True) or list()
+    meshes.extend(mc.listRelatives(nodes, allDescendents=True, type='mesh', fullPath=True) or list())
+
+    return [mesh for mesh in sorted(set(meshes)) if not mc.getAttr('{}.intermediateObject'.format(mesh))]
+
+
+def _get_dag_path(node):
+    selection = om.MSelectionList()
+    selection.add(node)
+
+    return selection.getDagPath(0)
+
+
+def get_mesh_key(mesh):
+    """
+    Returns a cheap key that changes when the geometry of the given mesh changes, without reading its points
+    Key is built from the vertex count, the object space bounding box stored by Maya and the world matrix of the mesh.
+    Boxes cached with this key are world space boxes, the world matrix makes the key change when the mesh is moved
+    :param mesh: str
+    :return: tuple
+    """
+
+    dag_path = _get_dag_path(mesh)
+    mesh_fn = om.MFnMesh(dag_path)
+    bounds = mesh_fn.boundingBox
+    matrix = dag_path.inclusiveMatrix()
+
+    return (mesh_fn.numVertices, tuple(bounds.min)[:3], tuple(bounds.max)[:3], tuple(matrix))
+
+
+def get_mesh_points(mesh, world_space=True):
+    """
+    Returns the points of the given mesh with a single bulk API query, converted to a NumPy array without
+    iterating the points in Python
+    :param mesh: str
+    :param world_space: bool
+    :return: numpy.ndarray, (N, 3) array
+    """
+
+    mesh_fn = om.MFnMesh(_get_dag_path(mesh))
+    points = mesh_fn.getPoints(om.MSpace.kWorld if world_space else om.MSpace.kObject)
+
+    # MPointArray stores homogeneous points, w component is dropped
+    return np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3]
+
+
+def get_mesh_data(mesh, world_space=False):
+    """
+    Returns points and topology of the given mesh with bulk API queries
+    :param mesh: str
+    :param world_space: bool, Whether to read points in world space or in object space
+    :return: meshdata.MeshData
+    """
+
+    dag_path = _get_dag_path(mesh)
+    mesh_fn = om.MFnMesh(dag_path)
+
+    counts, connects = mesh_fn.getVertices()
+    us, vs = mesh_fn.getUVs()
+    matrix = dag_path.inclusiveMatrix()
+
+    return meshdata.MeshData(
+        name=dag_path.fullPathName(), points=get_mesh_points(mesh, world_space=world_space),
+        counts=list(counts), connects=list(connects), uvs=np.column_stack([list(us), list(vs)]),
+        matrix=[matrix.getElement(i, j) for i in range(4) for j in range(4)])
+
+
+def replace_with_instance(mesh, master_mesh):
+    """
+    Replaces given mesh shape with an instance of the master mesh shape keeping transform and shader assignment
+    :param mesh: str, mesh shape to replace
+    :param master_mesh: str, mesh shape that will be instanced
+    :return: str, new instanced shape
+    """
+
+    transform = mc.listRelatives(mesh, parent=True, fullPath=True)[0]
+    shading_engines = list(set(mc.listConnections(mesh, type='shadingEngine') or list()))
+
+    mc.delete(mesh)
+    instance = mc.parent(master_mesh, transform, add=True, shape=True)[0]
+    for shading_engine in shading_engines:
+        mc.sets(transform, edit=True, forceElement=shading_engine)
+
+    return instance
+
+
+def create_mesh(mesh_data, name, parent=None):
+    """
+    Creates a new mesh from the given mesh data with a single API call
+    :param mesh_data: meshdata.MeshData
+    :param name: str, name of the new mesh transform
+    :param parent: str or None, parent of the new mesh transform
+    :return: str, new mesh transform
+    """
+
+    points = om.MPointArray([om.MPoint(*point) for point in mesh_data.points.tolist()])
+    mesh_obj = om.MFnMesh().create(
+        points, om.MIntArray(mesh_data.counts.tolist()), om.MIntArray(mesh_data.connects.tolist()))
+    transform = mc.rename(om.MFnDagNode(mesh_obj).fullPathName(), name)
+    mc.sets(transform, edit=True, forceElement='initialShadingGroup')
+    if parent:
+        transform = mc.parent(transform, parent)[0]
+
+    return transform
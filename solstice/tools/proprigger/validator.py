@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains pre-rig validation of asset files, used to find broken assets before building their rigs
+Validation does not need Maya: Maya ASCII files and shader JSON files are parsed directly, so the whole asset
+library can be validated in parallel processes
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import io
+import os
+import re
+import sys
+import json
+import shlex
+import traceback
+import multiprocessing
+
+
+REPORT_VERSION = 1
+
+TAG_TYPE_ATTRIBUTE_NAME = 'tag_type'
+TAG_DATA_ATTRIBUTE_NAME = 'tag_data'
+TAG_TYPE = 'SOLSTICE_TAG'
+
+
+class FileTypes(object):
+    Model = 'model'
+    Proxy = 'proxy'
+    Builder = 'builder'
+
+
+# Suffix of the group each one of the asset files must contain
+GROUP_SUFFIXES = {
+    FileTypes.Model: 'MODEL',
+    FileTypes.Proxy: 'PROXY',
+    FileTypes.Builder: 'BUILDER'
+}
+
+
+# Attribute name of a setAttr command ('setAttr -l on ".tag_type" -type "string" ...')
+_ATTR_RE = re.compile(r'"\.([^"]+)"')
+
+
+def _short_name(name):
+    return name.split('|')[-1].split(':')[-1]
+
+
+def _strip_namespaces(path):
+    return '|'.join(token.split(':')[-1] for token in path.strip('|').split('|'))
+
+
+def parse_maya_ascii(file_path):
+    """
+    Returns nodes and connections stored in the given Maya ASCII file
+    Only node creation, string attribute values and connections are parsed, so big data blocks are skipped quickly
+    Nodes are keyed by their full path without namespaces (chair_MODEL|chair_seat), so nodes with the same short name
+    below different parents are validated separately. String values split in several lines are not parsed, their
+    attributes are stored in the multiline_attrs list of the node
+    :param file_path: str
+    :return: tuple(dict(str, dict), list<tuple(str, str)>), nodes (type, parent path, string attributes and not
+        parsed multi-line attributes) keyed by path and source and target plugs of each connection
+    """
+
+    nodes = dict()
+    paths = dict()
+    connections = list()
+    current_node = None
+
+    def _get_parent_path(parent):
+        parent = _strip_namespaces(parent)
+        for path in reversed(paths.get(_short_name(parent), list())):
+            if path == parent or path.endswith('|' + parent):
+                return path
+        return parent
+
+    with io.open(file_path, 'r', encoding='utf-8', errors='replace') as fh:
+        for line in fh:
+            line = line.strip()
+            if line.startswith('createNode '):
+                tokens = shlex.split(line.rstrip(';'))
+                node_type = tokens[1]
+                node_name = parent = None
+                for i, token in enumerate(tokens[2:-1], start=2):
+                    if token in ('-n', '-name'):
+                        node_name = tokens[i + 1]
+                    elif token in ('-p', '-parent'):
+                        parent = _get_parent_path(tokens[i + 1])
+                if not node_name:
+                    current_node = None
+                    continue
+                current_node = _short_name(node_name)
+                if parent:
+                    current_node = '{}|{}'.format(parent, current_node)
+                paths.setdefault(_short_name(current_node), list()).append(current_node)
+                nodes[current_node] = {'type': node_type, 'parent': parent, 'attrs': dict(), 'multiline_attrs': []}
+            elif line.startswith('connectAttr '):
+                current_node = None
+                tokens = [token for token in shlex.split(line.rstrip(';'))[1:] if not token.startswith('-')]
+                if len(tokens) >= 2:
+                    connections.append((tokens[0], tokens[1]))
+            elif line.startswith('setAttr ') and '-type "string"' in line and current_node:
+                if not line.endswith(';'):
+                    attr_name = _ATTR_RE.search(line)
+                    nodes[current_node]['multiline_attrs'].append(attr_name.group(1) if attr_name else None)
+                    continue
+                tokens = shlex.split(line.rstrip(';'))
+                attr_names = [token for token in tokens[1:] if token.startswith('.')]
+                if attr_names:
+                    nodes[current_node]['attrs'][attr_names[0].lstrip('.')] = tokens[-1]
+            elif line.startswith(('select ', 'relationship ', 'fileInfo ')):
+                # setAttr commands after these ones are not applied to the last created node
+                current_node = None
+
+    return nodes, connections
+
+
+def get_descendants(nodes, root):
+    """
+    Returns all the nodes that are parented below the given root node
+    :param nodes: dict(str, dict), nodes returned by parse_maya_ascii
+    :param root: str, path of the root node
+    :return: list<str>
+    """
+
+    children = dict()
+    for node_name, node_data in nodes.items():
+        children.setdefault(node_data['parent'], list()).append(node_name)
+
+    descendants = list()
+    pending = list(children.get(root, list()))
+    while pending:
+        node_name = pending.pop()
+        descendants.append(node_name)
+        pending.extend(children.get(node_name, list()))
+
+    return descendants
+
+
+def check_group(nodes, asset_name, file_type):
+    """
+    Checks that the asset group of the given file type exists and contains transforms
+    :param nodes: dict(str, dict), nodes returned by parse_maya_ascii
+    :param asset_name: str
+    :param file_type: str, FileTypes
+    :return: tuple(list<str>, list<str>), errors and transforms below the group
+    """
+
+    group_name = '{}_{}'.format(asset_name, GROUP_SUFFIXES[file_type])
+    groups = sorted(node for node in nodes if _short_name(node) == group_name)
+    if not groups:
+        return ['{} group with name {} does not exists!'.format(file_type.capitalize(), group_name)], list()
+
+    transforms = [node for node in get_descendants(nodes, groups[0]) if nodes[node]['type'] == 'transform']
+    if not transforms:
+        return ['{} group {} is empty!'.format(file_type.capitalize(), group_name)], list()
+
+    return list(), transforms
+
+
+def check_tag(nodes, connections):
+    """
+    Checks that tag data nodes stored in the file are valid and connected
+    :param nodes: dict(str, dict), nodes returned by parse_maya_ascii
+    :param connections: list<tuple(str, str)>
+    :return: list<str>, errors
+    """
+
+    errors = list()
+    for node_name, node_data in nodes.items():
+        if TAG_TYPE_ATTRIBUTE_NAME not in node_data['attrs']:
+            continue
+        tag_type = node_data['attrs'][TAG_TYPE_ATTRIBUTE_NAME]
+        if tag_type != TAG_TYPE:
+            errors.append('Tag data node {} has an invalid tag type: {}'.format(node_name, tag_type))
+        tagged = [target for source, target in connections
+                  if _short_name(source.split('.')[0]) == _short_name(node_name) and target.endswith(
+                      '.' + TAG_DATA_ATTRIBUTE_NAME)]
+        if not tagged:
+            errors.append('Tag data node {} is not connected to any node!'.format(node_name))
+
+    return errors
+
+
+def check_shaders(shader_data, hires_meshes):
+    """
+    Checks that all the meshes stored in the shader data exist in the hires model
+    :param shader_data: dict, shader JSON file contents
+    :param hires_meshes: list<str>
+    :return: list<str>, errors
+    """
+
+    mesh_names = set(_short_name(mesh) for mesh in hires_meshes)
+
+    return ['Mesh {} not found in both model and shading file ...'.format(shading_mesh)
+            for shading_mesh in sorted(shader_data) if _short_name(shading_mesh) not in mesh_names]
+
+
+def validate_asset(asset_name, model_file=None, proxy_file=None, builder_file=None, shaders_file=None):
+    """
+    Validates the files of an asset with the same rules AssetRig uses during the build
+    Missing proxy and builder groups are reported as warnings because rigs can be built without them
+    :param asset_name: str
+    :param model_file: str or None, Maya ASCII file with the model group
+    :param proxy_file: str or None, Maya ASCII file with the proxy group
+    :param builder_file: str or None, Maya ASCII file with the builder group
+    :param shaders_file: str or None, shaders JSON file
+    :return: dict
+    """
+
+    errors = list()
+    warnings = list()
+    hires_meshes = None
+
+    for file_type, file_path in [
+            (FileTypes.Model, model_file), (FileTypes.Proxy, proxy_file), (FileTypes.Builder, builder_file)]:
+        messages = errors if file_type == FileTypes.Model else warnings
+        if not file_path or not os.path.isfile(file_path):
+            messages.append('{} file for asset {} does not exists: {}'.format(
+                file_type.capitalize(), asset_name, file_path))
+            continue
+        if not file_path.lower().endswith('.ma'):
+            warnings.append('{} file is not a Maya ASCII file and cannot be validated: {}'.format(
+                file_type.capitalize(), file_path))
+            continue
+
+        nodes, connections = parse_maya_ascii(file_path)
+        multiline_count = sum(len(node_data['multiline_attrs']) for node_data in nodes.values())
+        if multiline_count:
+            warnings.append('{} multi-line string attributes of {} file cannot be validated: {}'.format(
+                multiline_count, file_type, file_path))
+        group_errors, transforms = check_group(nodes, asset_name, file_type)
+        messages.extend(group_errors)
+        errors.extend(check_tag(nodes, connections))
+        if file_type == FileTypes.Model and not group_errors:
+            hires_meshes = transforms
+
+    if not shaders_file or not os.path.isfile(shaders_file):
+        errors.append('Shaders JSON file for asset {} does not exists: {}'.format(asset_name, shaders_file))
+    else:
+        try:
+            with open(shaders_file) as fh:
+                shader_data = json.load(fh)
+        except ValueError:
+            shader_data = None
+        if not isinstance(shader_data, dict):
+            errors.append('Shaders JSON file for asset {} is not valid: {}'.format(asset_name, shaders_file))
+        elif hires_meshes is not None:
+            errors.extend(check_shaders(shader_data, hires_meshes))
+
+    return {'asset': asset_name, 'valid': not errors, 'errors': errors, 'warnings': warnings}
+
+
+def _validate_asset_entry(entry):
+    try:
+        return validate_asset(**entry)
+    except Exception:
+        return {'asset': entry.get('asset_name'), 'valid': False, 'errors': [traceback.format_exc()], 'warnings': []}
+
+
+def get_process_executable():
+    """
+    Returns Python executable used to start validation processes
+    Inside an interactive Maya session the current executable is Maya itself, so mayapy is used instead
+    :return: str or None, None if the executable cannot be found and validation cannot run in parallel processes
+    """
+
+    executable_dir, executable_name = os.path.split(sys.executable)
+    name, extension = os.path.splitext(executable_name.lower())
+    if not name.startswith('maya') or name == 'mayapy':
+        return sys.executable
+
+    for mayapy_name in ['mayapy' + extension, 'mayapy']:
+        mayapy = os.path.join(executable_dir, mayapy_name)
+        if os.path.isfile(mayapy):
+            return mayapy
+
+    return None
+
+
+def validate_library(assets, processes=None):
+    """
+    Validates several assets in parallel processes and returns a consolidated report
+    Assets are validated in the current process if processes cannot be started (see get_process_executable)
+    :param assets: list<dict>, validate_asset keyword arguments for each asset
+    :param processes: int or None, number of processes. If not given, one process per CPU is used
+    :return: dict
+    """
+
+    executable = get_process_executable()
+    if processes == 1 or len(assets) < 2 or not executable:
+        results = [_validate_asset_entry(entry) for entry in assets]
+    else:
+        if executable != sys.executable:
+            multiprocessing.set_executable(executable)
+        pool = multiprocessing.Pool(processes=processes)
+        try:
+            results = pool.map(_validate_asset_entry, assets, chunksize=max(1, len(assets) // 32))
+        finally:
+            pool.close()
+            pool.join()
+
+    reports = dict((result['asset'], result) for result in results)
+
+    return {
+        'version': REPORT_VERSION,
+        'assets': reports,
+        'valid': sorted(name for name, report in reports.items() if report['valid']),
+        'invalid': sorted(name for name, report in reports.items() if not report['valid'])
+    }
+
+
+def write_report(report, file_path):
+    """
+    Writes given validation report into a JSON file
+    :param report: dict
+    :param file_path: str
+    """
+
+    with open(file_path, 'w') as fh:
+        json.dump(report, fh, indent=4, sort_keys=True)
+
+
+def read_report(file_path):
+    """
+    Reads a validation report from a JSON file
+    :param file_path: str
+    :return: dict
+    """
+
+    with open(file_path, 'r') as fh:
+        return json.load(fh)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains per-frame rigid transform caches of animated props
+A cache stores the world matrices of the transforms that drive the prop geometry in a memory-mappable .npy file and
+a JSON sidecar with the frames, the cached groups and a reference to the static geometry, so lighting and render
+scenes can place the prop geometry without evaluating its rig
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpoveda@cgart3d.com"
+
+import os
+import json
+import math
+
+import numpy as np
+import tpDccLib as tp
+
+if tp.is_maya():
+    import maya.cmds as mc
+    import maya.api.OpenMaya as om
+
+
+CACHE_VERSION = 1
+
+# Matrices are stored in single precision, which is enough for rigid props and halves cache size
+CACHE_DTYPE = np.float32
+
+# Frames are rounded to this number of decimals, so frames generated with a fractional step can be looked up
+FRAME_DECIMALS = 6
+
+# Geometry types of the rig and the name of the groups that contain their asset group and their joints
+GEOMETRY_GROUPS = [('proxy', 'mesh_proxy', 'joint_proxy'), ('hires', 'mesh_hires', 'joint_hires')]
+
+
+def get_cache_files(cache_file):
+    """
+    Returns matrices and sidecar files of the given cache
+    :param cache_file: str, cache path with or without extension
+    :return: tuple(str, str)
+    """
+
+    root_path = os.path.splitext(cache_file)[0]
+
+    return '{}.npy'.format(root_path), '{}.json'.format(root_path)
+
+
+def get_frame_key(frame):
+    """
+    Returns the value used to store and look up the given frame in a cache
+    :param frame: float
+    :return: float
+    """
+
+    return round(float(frame), FRAME_DECIMALS)
+
+
+def get_frames(start_frame, end_frame, step=1.0):
+    """
+    Returns the frames cached between the given frames. Frames are computed from the start frame instead of being
+    accumulated, so fractional steps do not drift
+    :param start_frame: float
+    :param end_frame: float
+    :param step: float
+    :return: list<float>
+    """
+
+    count = int(math.floor((end_frame - start_frame) / step + 10 ** -FRAME_DECIMALS)) + 1
+
+    return [get_frame_key(start_frame + i * step) for i in range(max(count, 0))]
+
+
+class TransformCacheWriter(object):
+    """
+    Class that writes transform caches one frame at a time, so baked frames are never held in memory
+    """
+
+    def __init__(self, cache_file, groups, frames, geometry=None):
+        """
+        :param cache_file: str
+        :param groups: list<str>, names of the cached groups
+        :param frames: list<float>, cached frames
+        :param geometry: dict or None, reference to the static geometry of each group
+        """
+
+        super(TransformCacheWriter, self).__init__()
+
+        self._matrices_file, self._sidecar_file = get_cache_files(cache_file)
+        self._groups = list(groups)
+        self._frames = [get_frame_key(frame) for frame in frames]
+        self._frame_indices = dict((frame, i) for i, frame in enumerate(self._frames))
+        self._geometry = geometry or dict()
+        self._matrices = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self):
+        """
+        Creates the cache files
+        """
+
+        cache_dir = os.path.dirname(self._matrices_file)
+        if cache_dir and not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        self._matrices = np.lib.format.open_memmap(
+            self._matrices_file, mode='w+', dtype=CACHE_DTYPE, shape=(len(self._frames), len(self._groups), 4, 4))
+        self._matrices[:] = np.identity(4, dtype=CACHE_DTYPE)
+
+        sidecar = {
+            'version': CACHE_VERSION,
+            'matrices': os.path.basename(self._matrices_file),
+            'groups': self._groups,
+            'frames': self._frames,
+            'geometry': self._geometry
+        }
+        with open(self._sidecar_file, 'w') as fh:
+            json.dump(sidecar, fh, indent=4, sort_keys=True)
+
+    def write_frame(self, frame, matrices):
+        """
+        Stores world matrices of all the cached groups in the given frame
+        :param frame: float
+        :param matrices: list or numpy.ndarray, (groups, 4, 4) or (groups, 16) matrices, in group order
+        """
+
+        matrices = np.asarray(matrices, dtype=CACHE_DTYPE).reshape(len(self._groups), 4, 4)
+        self._matrices[self._frame_indices[get_frame_key(frame)]] = matrices
+
+    def close(self):
+        """
+        Flushes and closes the matrices file
+        """
+
+        if self._matrices is not None:
+            self._matrices.flush()
+            self._matrices = None
+
+
+class TransformCache(object):
+    """
+    Class that reads transform caches. Matrices are memory mapped, so only the requested frames are read from disk
+    """
+
+    def __init__(self, cache_file):
+        super(TransformCache, self).__init__()
+
+        self._matrices_file, self._sidecar_file = get_cache_files(cache_file)
+        with open(self._sidecar_file, 'r') as fh:
+            sidecar = json.load(fh)
+        if sidecar.get('version') != CACHE_VERSION:
+            raise ValueError('Transform cache version {} is not supported (expected {})'.format(
+                sidecar.get('version'), CACHE_VERSION))
+
+        self._groups = sidecar['groups']
+        self._frames = sidecar['frames']
+        self._frame_indices = dict((get_frame_key(frame), i) for i, frame in enumerate(self._frames))
+        self._geometry = sidecar.get('geometry', dict())
+        self._matrices = None
+
+    @property
+    def groups(self):
+        return self._groups
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @property
+    def geometry(self):
+        """
+        Returns reference to the static geometry of each cached group
+        :return: dict
+        """
+
+        return self._geometry
+
+    @property
+    def matrices(self):
+        """
+        Returns memory mapped (frames, groups, 4, 4) matrices array. File is opened the first time it is accessed
+        :return: numpy.memmap
+        """
+
+        if self._matrices is None:
+            self._matrices = np.load(self._matrices_file, mmap_mode='r')
+
+        return self._matrices
+
+    def get_frame_matrices(self, frame):
+        """
+        Returns world matrices of all the cached groups in the given frame
+        :param frame: float
+        :return: numpy.ndarray, (groups, 4, 4) matrices
+        """
+
+        frame = get_frame_key(frame)
+        if frame not in self._frame_indices:
+            raise KeyError('Frame {} is not cached'.format(frame))
+
+        return np.array(self.matrices[self._frame_indices[frame]])
+
+    def get_matrix(self, frame, group):
+        """
+        Returns world matrix of the given group in the given frame
+        :param frame: float
+        :param group: str
+        :return: numpy.ndarray, 4x4 matrix
+        """
+
+        return self.get_frame_matrices(frame)[self._groups.index(group)]
+
+    def iter_frames(self, start=None, end=None):
+        """
+        Yields cached frames and their matrices one frame at a time
+        :param start: float or None
+        :param end: float or None
+        :return: generator(tuple(float, numpy.ndarray))
+        """
+
+        for frame in self._frames:
+            if (start is not None and frame < start) or (end is not None and frame > end):
+                continue
+            yield frame, self.get_frame_matrices(frame)
+
+
+def get_driven_transforms(main_grp):
+    """
+    Returns the transforms whose world matrices drive the geometry of each geometry type of a rig.
+    Asset groups are used, unless geometry is bound to joints
+    :param main_grp: str, rig main group
+    :return: list<tuple(str, str)>, geometry type and driven transform
+    """
+
+    descendants = mc.listRelatives(main_grp, allDescendents=True, type='transform', fullPath=True) or list()
+    driven_transforms = list()
+    for geo_type, mesh_grp_name, joint_grp_name in GEOMETRY_GROUPS:
+        asset_grps = [node for node in descendants if node.split('|')[-2].split(':')[-1] == mesh_grp_name]
+        if not asset_grps:
+            continue
+        asset_grp = asset_grps[0]
+
+        joint_grps = [node for node in descendants if node.split('|')[-1].split(':')[-1] == joint_grp_name]
+        joints = mc.listRelatives(joint_grps, allDescendents=True, type='joint', fullPath=True) if joint_grps else None
+        constraints = mc.listConnections(asset_grp, source=True, destination=False, type='constraint')
+        if joints and not constraints:
+            # Rigidly bound geometry follows the deepest joint of the hierarchy
+            driven_transforms.append((geo_type, max(joints, key=lambda joint: joint.count('|'))))
+        else:
+            driven_transforms.append((geo_type, asset_grp))
+
+    return driven_transforms
+
+
+def bake_transforms(transforms, cache_file, start_frame, end_frame, step=1.0, geometry=None):
+    """
+    Bakes world matrices of the given transforms into a transform cache
+    Matrices are evaluated in a DG context of each frame, so current time of the scene is not changed
+    :param transforms: list<tuple(str, str)>, cached group names and their transforms
+    :param cache_file: str
+    :param start_frame: float
+    :param end_frame: float
+    :param step: float
+    :param geometry: dict or None, reference to the static geometry of each group
+    :return: str, matrices file of the cache
+    """
+
+    frames = get_frames(start_frame, end_frame, step=step)
+    plugs = list()
+    for _, transform in transforms:
+        selection = om.MSelectionList()
+        selection.add(transform)
+        plug = om.MFnDependencyNode(selection.getDependNode(0)).findPlug('worldMatrix', False)
+        plugs.append(plug.elementByLogicalIndex(0))
+
+    time_unit = om.MTime.uiUnit()
+    with TransformCacheWriter(cache_file, [name for name, _ in transforms], frames, geometry=geometry) as writer:
+        for frame in frames:
+            context = om.MDGContext(om.MTime(float(frame), time_unit))
+            writer.write_frame(frame, [list(om.MFnMatrixData(plug.asMObject(context)).matrix()) for plug in plugs])
+
+    return get_cache_files(cache_file)[0]
+
+
+def bake_rig(main_grp, cache_file, start_frame=None, end_frame=None, step=1.0, geometry_files=None,
+             asset_name=None):
+    """
+    Bakes the transforms that drive the geometry of a rig into a transform cache
+    :param main_grp: str, rig main group
+    :param cache_file: str
+    :param start_frame: float or None, if not given, playback start frame is used
+    :param end_frame: float or None, if not given, playback end frame is used
+    :param step: float
+    :param geometry_files: dict(str, str) or None, file that contains the static geometry of each geometry type
+    :param asset_name: str or None, asset the geometry belongs to. If not given, main group name is used
+    :return: str, matrices file of the cache
+    """
+
+    start_frame = mc.playbackOptions(query=True, minTime=True) if start_frame is None else start_frame
+    end_frame = mc.playbackOptions(query=True, maxTime=True) if end_frame is None else end_frame
+    geometry_files = geometry_files or dict()
+
+    transforms = get_driven_transforms(main_grp)
+    if not transforms:
+        tp.logger.warning('No driven transforms found in rig {}'.format(main_grp))
+        return None
+
+    asset_name = asset_name or main_grp.split('|')[-1].split(':')[-1]
+    geometry = dict()
+    for geo_type, transform in transforms:
+        if not geometry_files.get(geo_type):
+            tp.logger.warning('No file stores the {} geometry of rig {}'.format(geo_type, main_grp))
+        geometry[geo_type] = {
+            'asset': asset_name,
+            'transform': transform.split('|')[-1].split(':')[-1],
+            'file': geometry_files.get(geo_type)
+        }
+
+    return bake_transforms(transforms, cache_file, start_frame, end_frame, step=step, geometry=geometry)
@@ -0,0 +1,448 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains shared fixtures for solstice-tools-proprigger tests
+"""
+
+import os
+from collections import OrderedDict
+
+import pytest
+
+
+# Parent type of each node type, used to filter nodes by type the same way Maya does (joints are transforms, etc)
+TYPE_PARENTS = {
+    'transform': 'dagNode',
+    'joint': 'transform',
+    'constraint': 'transform',
+    'parentConstraint': 'constraint',
+    'pointConstraint': 'constraint',
+    'orientConstraint': 'constraint',
+    'scaleConstraint': 'constraint',
+    'shape': 'dagNode',
+    'mesh': 'shape',
+    'nurbsCurve': 'shape',
+    'blinn': 'lambert',
+    'phong': 'lambert'
+}
+
+# Node types listed by ls(materials=True), together with the types derived from them
+MATERIAL_TYPES = ['lambert']
+
+
+def _is_type(node_type, base_type):
+    while node_type:
+        if node_type == base_type:
+            return True
+        node_type = TYPE_PARENTS.get(node_type)
+
+    return False
+
+
+def _as_list(nodes):
+    if nodes is None:
+        return list()
+    if isinstance(nodes, (list, tuple, set)):
+        return list(nodes)
+
+    return [nodes]
+
+
+class Cmds(object):
+    """
+    Fake of the maya.cmds module used to test modules without Maya
+    Stores a minimal scene: typed nodes with their DAG hierarchy, attributes, connections between plugs, namespaces
+    and the selection. DAG nodes are stored and always returned by their long name (|chair|seat) and DG nodes by
+    their name. Viewport and file commands are recorded in calls and exported nodes are stored in files, so they can
+    be imported again
+    """
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+        self.connections = list()
+        self.namespaces = list()
+        self.selection = list()
+        self.calls = list()
+        self.deleted = list()
+        self.files = dict()
+        self.batch = False
+        self.modified = False
+        self.scene_path = ''
+        self.root_path = ''
+        self.file_rules = {'scene': 'scenes'}
+        self.undo_state = True
+        self._uuid = 0
+
+    # ==========================================================================================================
+    # SCENE SETUP
+    # ==========================================================================================================
+
+    def add(self, name, node_type='transform', default=False):
+        """
+        Adds a node to the scene. DAG nodes are given by their long name and missing parents are added as transforms
+        :param name: str
+        :param node_type: str
+        :param default: bool, Whether the node is a default node of the scene (lambert1, initialShadingGroup, etc)
+        :return: str
+        """
+
+        if name.startswith('|'):
+            parent = name.rsplit('|', 1)[0]
+            if parent and parent not in self.nodes:
+                self.add(parent)
+
+        self._uuid += 1
+        self.nodes[name] = {'type': node_type, 'attrs': OrderedDict(), 'default': default,
+                            'uuid': 'UUID-{:04d}'.format(self._uuid)}
+
+        return name
+
+    # ==========================================================================================================
+    # NODES
+    # ==========================================================================================================
+
+    def ls(self, *args, **kwargs):
+        if kwargs.get('selection') or kwargs.get('sl'):
+            names = list(self.selection)
+        elif args:
+            names = list()
+            for name in _as_list(args[0]):
+                node = self._find(name)
+                if node and node not in names:
+                    names.append(node)
+        else:
+            names = list(self.nodes)
+
+        if kwargs.get('defaultNodes'):
+            names = [name for name in names if self.nodes[name]['default']]
+        if kwargs.get('assemblies'):
+            names = [name for name in names if name.count('|') == 1]
+        if kwargs.get('dag'):
+            names = [name for name in names if name.startswith('|')]
+        if kwargs.get('type'):
+            names = [name for name in names if _is_type(self.nodes[name]['type'], kwargs['type'])]
+        if kwargs.get('materials'):
+            names = [name for name in names if any(
+                _is_type(self.nodes[name]['type'], material_type) for material_type in MATERIAL_TYPES)]
+        if kwargs.get('uuid'):
+            return [self.nodes[name]['uuid'] for name in names]
+
+        return names
+
+    def objExists(self, name):
+        return self._find(name) is not None
+
+    def nodeType(self, node):
+        return self.nodes[self._get(node)]['type']
+
+    def createNode(self, node_type, n=None, name=None, parent=None):
+        name = n or name or '{}1'.format(node_type)
+        if parent:
+            name = '{}|{}'.format(self._get(parent), name)
+        elif _is_type(node_type, 'dagNode'):
+            name = '|{}'.format(name)
+        base_name, index = name, 1
+        while name in self.nodes:
+            name = '{}{}'.format(base_name, index)
+            index += 1
+
+        return self.add(name, node_type)
+
+    def listRelatives(self, nodes, parent=False, children=False, allDescendents=False, shapes=False, type=None,
+                      fullPath=False):
+        relatives = list()
+        for node in [self._get(name) for name in _as_list(nodes)]:
+            if parent:
+                if node.count('|') > 1:
+                    relatives.append(node.rsplit('|', 1)[0])
+                continue
+            descendants = [name for name in self.nodes if name.startswith(node + '|')]
+            if not allDescendents:
+                descendants = [name for name in descendants if '|' not in name[len(node) + 1:]]
+            if shapes:
+                descendants = [name for name in descendants if _is_type(self.nodes[name]['type'], 'shape')]
+            if type:
+                descendants = [name for name in descendants if _is_type(self.nodes[name]['type'], type)]
+            relatives.extend(descendants)
+
+        return relatives
+
+    def parent(self, nodes, parent=None, world=False, relative=False):
+        parent = '' if world else self._get(parent)
+        parented = list()
+        for node in [self._get(name) for name in _as_list(nodes)]:
+            new_name = '{}|{}'.format(parent, node.split('|')[-1])
+            self._rename(lambda name: new_name + name[len(node):] if name == node or name.startswith(
+                node + '|') else name)
+            parented.append(new_name)
+
+        return parented
+
+    def delete(self, nodes):
+        deleted = [self._get(name) for name in _as_list(nodes)]
+        self.deleted.extend(deleted)
+        for node in deleted:
+            for name in list(self.nodes):
+                if name == node or name.startswith(node + '|'):
+                    self.nodes.pop(name)
+        self.connections = [(source, target) for source, target in self.connections
+                            if source.split('.')[0] in self.nodes and target.split('.')[0] in self.nodes]
+        self.selection = [name for name in self.selection if name in self.nodes]
+
+    def lockNode(self, nodes, lock=False):
+        for name in _as_list(nodes):
+            self._get(name)
+
+    def select(self, nodes=None, replace=False, clear=False):
+        self.selection = list() if clear else [self._get(name) for name in _as_list(nodes)]
+
+    # ==========================================================================================================
+    # ATTRIBUTES
+    # ==========================================================================================================
+
+    def addAttr(self, node, ln=None, dt=None, at=None, k=False):
+        attrs = self.nodes[self._get(node)]['attrs']
+        if ln in attrs:
+            raise RuntimeError('Attribute {}.{} already exists'.format(node, ln))
+        attrs[ln] = {'type': dt or at, 'value': None, 'lock': False, 'keyable': k, 'channelBox': False}
+
+    def attributeQuery(self, attr, node=None, exists=False):
+        return attr in self.nodes[self._get(node)]['attrs']
+
+    def listAttr(self, node, keyable=False, userDefined=False, locked=False):
+        attrs = self.nodes[self._get(node)]['attrs']
+        if keyable:
+            return [attr for attr, attr_data in attrs.items() if attr_data['keyable']]
+        if locked:
+            return [attr for attr, attr_data in attrs.items() if attr_data['lock']]
+
+        return list(attrs)
+
+    def setAttr(self, plug, *args, **kwargs):
+        attr_data = self._get_attr(plug)
+        if args:
+            if attr_data['lock']:
+                raise RuntimeError('The attribute {} is locked'.format(plug))
+            attr_data['value'] = args[0] if len(args) == 1 else list(args)
+        for flag in ['lock', 'keyable', 'channelBox']:
+            if flag in kwargs:
+                attr_data[flag] = kwargs[flag]
+
+    def getAttr(self, plug, lock=False):
+        attr_data = self._get_attr(plug)
+
+        return attr_data['lock'] if lock else attr_data['value']
+
+    # ==========================================================================================================
+    # CONNECTIONS
+    # ==========================================================================================================
+
+    def connectAttr(self, source, target, force=False):
+        source, target = self._get_plug(source), self._get_plug(target)
+        node, attr = target.split('.', 1)
+        if self.nodes[node]['attrs'].get(attr, dict()).get('lock'):
+            raise RuntimeError('The destination attribute {} is locked'.format(target))
+        connected = [connection for connection in self.connections if connection[1] == target]
+        if connected and not force:
+            raise RuntimeError('{} is already connected'.format(target))
+        for connection in connected:
+            self.connections.remove(connection)
+        self.connections.append((source, target))
+
+    def disconnectAttr(self, source, target):
+        self.connections.remove((self._get_plug(source), self._get_plug(target)))
+
+    def isConnected(self, source, target):
+        return (self._get_plug(source), self._get_plug(target)) in self.connections
+
+    def listConnections(self, nodes, source=True, destination=True, connections=False, plugs=False, type=None):
+        found = list()
+        for name in _as_list(nodes):
+            plug = self._get_plug(name) if '.' in name else None
+            node = plug.split('.')[0] if plug else self._get(name)
+            for source_plug, target_plug in self.connections:
+                for own_plug, other_plug, listed in [(target_plug, source_plug, source),
+                                                     (source_plug, target_plug, destination)]:
+                    if not listed or (own_plug != plug if plug else own_plug.split('.')[0] != node):
+                        continue
+                    other_node = other_plug.split('.')[0]
+                    if type and not _is_type(self.nodes[other_node]['type'], type):
+                        continue
+                    if connections:
+                        found.append(own_plug)
+                    found.append(other_plug if plugs else other_node)
+
+        return found
+
+    def listHistory(self, nodes, future=False, pruneDagObjects=False):
+        history = [self._get(name) for name in _as_list(nodes)]
+        for node in history:
+            for source_plug, target_plug in self.connections:
+                from_node, to_node = [plug.split('.')[0] for plug in (
+                    (source_plug, target_plug) if future else (target_plug, source_plug))]
+                if from_node == node and to_node not in history:
+                    history.append(to_node)
+        if pruneDagObjects:
+            history = [node for node in history if not node.startswith('|')]
+
+        return history
+
+    def sets(self, shading_engine, query=False):
+        shading_engine = self._get(shading_engine)
+
+        return [source_plug.split('.')[0] for source_plug, target_plug in self.connections
+                if target_plug.startswith('{}.dagSetMembers'.format(shading_engine))]
+
+    # ==========================================================================================================
+    # NAMESPACES
+    # ==========================================================================================================
+
+    def namespace(self, add=None, parent=None, setNamespace=None, exists=None, moveNamespace=None,
+                  removeNamespace=None, mergeNamespaceWithRoot=False, force=False):
+        if exists:
+            return self._get_namespace(exists) in self.namespaces
+        if add:
+            self.namespaces.append(self._get_namespace('{}:{}'.format(parent or '', add)))
+        if moveNamespace:
+            source, target = [self._get_namespace(namespace) for namespace in moveNamespace]
+            self._move_namespace(source, target)
+        if removeNamespace:
+            namespace = self._get_namespace(removeNamespace)
+            if mergeNamespaceWithRoot:
+                self._move_namespace(namespace, ':')
+            elif self.namespaceInfo(namespace, listNamespace=True):
+                raise RuntimeError('Namespace {} is not empty'.format(namespace))
+            self.namespaces.remove(namespace)
+
+    def namespaceInfo(self, namespace=':', listOnlyNamespaces=False, listOnlyDependencyNodes=False,
+                      listNamespace=False, recurse=False, absoluteName=False, dagPath=False):
+        namespace = self._get_namespace(namespace)
+        prefix = namespace.rstrip(':') + ':'
+        namespaces = [name for name in self.namespaces if name.startswith(prefix) and (
+            recurse or ':' not in name[len(prefix):])]
+        if listOnlyNamespaces:
+            return namespaces if absoluteName else [name[1:] for name in namespaces]
+
+        nodes = [node for node in self.nodes if self._get_node_namespace(node) in [namespace] + (
+            namespaces if recurse else list())]
+
+        return nodes + namespaces if listNamespace else nodes
+
+    # ==========================================================================================================
+    # FILES AND VIEWPORT
+    # ==========================================================================================================
+
+    def file(self, *args, **kwargs):
+        file_path = args[0] if args else None
+        if kwargs.get('query'):
+            return self.scene_path if kwargs.get('sceneName') else self.modified
+        if kwargs.get('new'):
+            self.calls.append(('new',))
+        elif kwargs.get('open'):
+            self.calls.append(('open', file_path))
+            self.scene_path = file_path
+        elif kwargs.get('exportSelected'):
+            self.calls.append(('export', file_path, list(self.selection), dict(
+                (flag, value) for flag, value in kwargs.items() if flag not in ['force', 'exportSelected'])))
+            self.files[file_path] = [
+                (name[len(root.rsplit('|', 1)[0]):], self.nodes[name]['type'])
+                for root in self.selection for name in self.nodes if name == root or name.startswith(root + '|')]
+        elif kwargs.get('i'):
+            self.calls.append(('import', file_path))
+            return [self.add(name, node_type) for name, node_type in self.files.get(file_path, list())]
+        else:
+            raise NotImplementedError('File command mode is not supported: {}'.format(sorted(kwargs)))
+
+        return file_path
+
+    def workspace(self, query=False, rootDirectory=False, expandName=None, fileRuleEntry=None):
+        if rootDirectory:
+            return self.root_path
+        if fileRuleEntry:
+            return self.file_rules.get(fileRuleEntry)
+
+        return os.path.join(self.root_path, expandName)
+
+    def about(self, batch=False):
+        return self.batch
+
+    def undoInfo(self, query=False, state=False, stateWithoutFlush=None):
+        if query:
+            return self.undo_state
+        self.undo_state = stateWithoutFlush
+
+    def refresh(self, suspend=None):
+        self.calls.append(('refresh', suspend))
+
+    def viewFit(self, allObjects=False, animate=False):
+        self.calls.append(('viewFit', animate))
+
+    # ==========================================================================================================
+    # INTERNAL
+    # ==========================================================================================================
+
+    def _find(self, name):
+        if name in self.nodes:
+            return name
+        for node, node_data in self.nodes.items():
+            if node_data['uuid'] == name:
+                return node
+        found = [node for node in self.nodes if node.endswith('|' + name.lstrip('|'))]
+
+        return found[0] if len(found) == 1 else None
+
+    def _get(self, name):
+        node = self._find(name)
+        if node is None:
+            raise ValueError('No object matches name: {}'.format(name))
+
+        return node
+
+    def _get_plug(self, plug):
+        node, attr = plug.split('.', 1)
+
+        return '{}.{}'.format(self._get(node), attr)
+
+    def _get_attr(self, plug):
+        node, attr = self._get_plug(plug).split('.', 1)
+        attrs = self.nodes[node]['attrs']
+        if attr not in attrs:
+            raise ValueError('No attribute matches name: {}'.format(plug))
+
+        return attrs[attr]
+
+    def _rename(self, rename_fn):
+        self.nodes = OrderedDict((rename_fn(name), node_data) for name, node_data in self.nodes.items())
+        self.connections = [tuple('{}.{}'.format(rename_fn(plug.split('.')[0]), plug.split('.', 1)[1])
+                                  for plug in connection) for connection in self.connections]
+        self.selection = [rename_fn(name) for name in self.selection]
+
+    @staticmethod
+    def _get_namespace(namespace):
+        return ':' + namespace.strip(':')
+
+    @staticmethod
+    def _get_node_namespace(node):
+        return ':' + ':'.join(node.split('|')[-1].split(':')[:-1])
+
+    def _move_namespace(self, source, target):
+        source_name, target_name = source.strip(':'), target.strip(':')
+
+        def _move_token(token):
+            if not token.startswith(source_name + ':'):
+                return token
+            return ':'.join([name for name in [target_name, token[len(source_name) + 1:]] if name])
+
+        self._rename(lambda name: '|'.join(_move_token(token) for token in name.split('|')))
+        namespaces = list()
+        for namespace in self.namespaces:
+            namespace = namespace if namespace == source else self._get_namespace(_move_token(namespace.strip(':')))
+            if namespace not in namespaces:
+                namespaces.append(namespace)
+        self.namespaces = namespaces
+
+
+@pytest.fixture
+def cmds():
+    return Cmds()
@@ -0,0 +1,134 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger multi asset batch builds
+"""
+
+import pytest
+
+from solstice.tools.proprigger import batch
+
+
+class _Rig(object):
+    built = list()
+
+    def __init__(self, asset_name, namespace=None, **kwargs):
+        self.asset_name = asset_name
+        self.namespace = namespace
+        self.main_group = ':{}:{}'.format(namespace, asset_name)
+        self.kwargs = kwargs
+
+    def build(self, new_scene=True, rig_spec=None):
+        if self.asset_name == 'broken':
+            raise RuntimeError('Build failed')
+        assert not new_scene
+        _Rig.built.append((self.asset_name, rig_spec))
+
+    def get_spec(self, source_key=None):
+        return {'name': self.asset_name, 'source_key': source_key}
+
+
+class _SpecCache(object):
+    def __init__(self, specs=None):
+        self.specs = specs or dict()
+        self.stored = list()
+
+    def get(self, asset_name, source_key=None):
+        return self.specs.get((asset_name, source_key))
+
+    def put(self, rig_spec):
+        self.stored.append(rig_spec)
+
+
+@pytest.fixture
+def exported(monkeypatch, cmds):
+    _Rig.built = list()
+    exported = list()
+    monkeypatch.setattr(batch, 'mc', cmds, raising=False)
+    monkeypatch.setattr(batch, 'export_rig', lambda main_grp, namespace, file_path, file_type: exported.append(
+        (main_grp, namespace, file_path)))
+    return exported
+
+
+def test_export_rig_removes_nested_namespaces(monkeypatch, cmds, tmpdir):
+    cmds.namespaces.extend([':existing', ':shovel', ':shovel:hires'])
+    cmds.add('existing:user_node', 'network')
+    cmds.add('|shovel:rig|shovel:hires:geo')
+    cmds.add('shovel:hires:wood_mat', 'lambert')
+    monkeypatch.setattr(batch, 'mc', cmds, raising=False)
+    monkeypatch.setattr(batch.profiles, 'mc', cmds, raising=False)
+
+    file_path = str(tmpdir.join('shovel.ma'))
+    batch.export_rig('shovel:rig', 'shovel', file_path)
+    assert cmds.calls[0][:3] == ('export', file_path, ['|rig'])
+    assert cmds.files[file_path] == [('|rig', 'transform'), ('|rig|hires:geo', 'transform')]
+    assert list(cmds.nodes) == ['existing:user_node']
+    assert cmds.namespaces == [':existing']
+
+
+def test_get_namespace():
+    assert batch.get_namespace('S_PRP_01_shovel') == 'S_PRP_01_shovel'
+    assert batch.get_namespace('01 shovel-a') == '_01_shovel_a'
+
+
+def test_add_asset_defaults():
+    builder = batch.BatchBuilder(rig_class=_Rig)
+    builder.add_asset('shovel', 'shovel.ma', profile='benchmark')
+    builder.add_asset('bucket', 'bucket.ma', transactional=False)
+    assert builder._assets[0][3] == {'transactional': True, 'profile': 'benchmark'}
+    assert builder._assets[1][3] == {'transactional': False, 'profile': 'batch'}
+
+
+def test_build_exports_each_rig_in_its_namespace(exported):
+    builder = batch.BatchBuilder(rig_class=_Rig)
+    for asset_name in ['shovel', 'broken', 'bucket 02']:
+        builder.add_asset(asset_name, '{}.ma'.format(asset_name))
+
+    report = builder.build()
+    assert batch.mc.calls == [('new',)]
+    assert report['shovel']['status'] == 'exported'
+    assert report['bucket 02']['status'] == 'exported'
+    assert report['broken']['status'] == 'failed'
+    assert 'Build failed' in report['broken']['error']
+    assert exported == [
+        (':shovel:shovel', 'shovel', 'shovel.ma'), (':bucket_02:bucket 02', 'bucket_02', 'bucket 02.ma')]
+
+
+def test_build_skips_invalid_assets(exported):
+    builder = batch.BatchBuilder(rig_class=_Rig)
+    builder.add_asset('shovel', 'shovel.ma')
+    builder.add_asset('bucket', 'bucket.ma')
+
+    validation_report = {'assets': {'bucket': {'valid': False, 'errors': ['Missing tag']}}}
+    report = builder.build(validation_report=validation_report)
+    assert report['bucket'] == {'status': 'skipped', 'errors': ['Missing tag']}
+    assert [asset_name for asset_name, _ in _Rig.built] == ['shovel']
+
+
+def test_build_uses_spec_cache(exported, tmp_path):
+    source_file = tmp_path / 'shovel_model.ma'
+    source_file.write_text(u'//Maya ASCII')
+    builder = batch.BatchBuilder(rig_class=_Rig, spec_cache=_SpecCache())
+    builder.add_asset('shovel', 'shovel.ma', source_files=[str(source_file)])
+    source_key = builder._assets[0][2]
+
+    report = builder.build()
+    assert report['shovel']['from_spec'] is False
+    assert builder._spec_cache.stored == [{'name': 'shovel', 'source_key': source_key}]
+
+    cached_spec = {'name': 'shovel'}
+    builder._spec_cache = _SpecCache({('shovel', source_key): cached_spec})
+    report = builder.build()
+    assert report['shovel']['from_spec'] is True
+    assert _Rig.built[-1] == ('shovel', cached_spec)
+    assert not builder._spec_cache.stored
+
+
+def test_build_spec_key_depends_on_rig_options(exported, tmp_path):
+    source_file = tmp_path / 'shovel_model.ma'
+    source_file.write_text(u'//Maya ASCII')
+    builder = batch.BatchBuilder(rig_class=_Rig, spec_cache=_SpecCache())
+    builder.add_asset('shovel', 'shovel.ma', source_files=[str(source_file)])
+    builder.add_asset('shovel', 'shovel.ma', source_files=[str(source_file)], hires_mode='deferred')
+    assert builder._assets[0][2] != builder._assets[1][2]
@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger bounding box engine
+"""
+
+import pytest
+import numpy as np
+
+from solstice.tools.proprigger import bbox
+
+
+def test_bounding_box_from_points():
+    box = bbox.BoundingBox.from_points([[-1, 0, -2], [3, 4, 2], [0, 1, 0]])
+    assert box.as_list() == [-1, 0, -2, 3, 4, 2]
+    assert np.allclose(box.center, [1, 2, 0])
+    assert box.footprint_radius(axis=1) == pytest.approx(np.hypot(4, 4) * 0.5)
+
+
+def test_bounding_box_union_ignores_empty_boxes():
+    box = bbox.BoundingBox.union([
+        bbox.BoundingBox.from_points([[0, 0, 0], [1, 1, 1]]),
+        bbox.BoundingBox(),
+        bbox.BoundingBox.from_points([[-2, 0, 0]])])
+    assert box.as_list() == [-2, 0, 0, 1, 1, 1]
+    assert bbox.BoundingBox.union([]).is_empty
+
+
+def test_control_radius_is_never_negative():
+    box = bbox.BoundingBox.from_points([[0, 0, 0], [0.01, 0.01, 0.01]])
+    assert box.control_radius(minimum=0.1) == pytest.approx(0.1)
+    assert bbox.BoundingBox().control_radius(minimum=0.1) == pytest.approx(0.1)
+
+
+def test_bounding_box_cache_only_reads_points_on_misses():
+    cache = bbox.BoundingBoxCache()
+    points = np.random.rand(100, 3)
+    reads = list()
+
+    def _points_fn():
+        reads.append(True)
+        return points
+
+    first = cache.get('mesh', (100, 'matrix'), _points_fn)
+    assert cache.get('mesh', (100, 'matrix'), _points_fn) is first
+    assert (cache.hits, cache.misses, len(reads)) == (1, 1, 1)
+    cache.get('mesh', (100, 'moved'), _points_fn)
+    assert (cache.misses, len(reads)) == (2, 2)
+
+
+def test_bounding_box_cache_bounds():
+    cache = bbox.BoundingBoxCache()
+    meshes_points = {'a': [[0, 0, 0], [1, 1, 1]], 'b': [[-1, 2, 0]]}
+    box = cache.bounds(dict((mesh, (len(points), )) for mesh, points in meshes_points.items()), meshes_points.get)
+    assert box.as_list() == [-1, 0, 0, 1, 2, 1]
+    cache.bounds({'a': (2, )}, meshes_points.get)
+    assert cache.hits == 1
+
+
+def test_session_cache_is_shared():
+    assert bbox.get_session_cache() is bbox.get_session_cache()
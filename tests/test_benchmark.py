@@ -0,0 +1,31 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger import time benchmark
+"""
+
+from solstice.tools.proprigger import benchmark
+
+
+def test_measure_import():
+    result = benchmark.measure_import('solstice.tools.proprigger.validator', repeat=1)
+
+    assert result['module'] == 'solstice.tools.proprigger.validator'
+    assert result['error'] is None
+    assert result['time'] >= 0.0
+    assert result['loaded'] == []
+
+
+def test_measure_import_reports_heavy_modules():
+    result = benchmark.measure_import('solstice.tools.proprigger.meshdata', repeat=1)
+
+    assert result['loaded'] == ['numpy']
+    assert 'solstice.tools.proprigger.meshdata' in benchmark.format_benchmark([result])
+
+
+def test_tool_module_loads_ui_modules_on_first_use():
+    result = benchmark.measure_import('solstice.tools.proprigger.proprigger', repeat=1)
+
+    assert result['error'] is None
+    assert result['loaded'] == []
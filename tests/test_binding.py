@@ -0,0 +1,43 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rigid joint binding
+"""
+
+import numpy as np
+import pytest
+
+from solstice.tools.proprigger import binding
+
+
+def test_rigid_weights():
+    weights = binding.rigid_weights(3, 1, 2)
+    assert weights.tolist() == [0.0, 1.0, 0.0, 1.0, 0.0, 1.0]
+    assert np.allclose(weights.reshape(3, 2).sum(axis=1), 1.0)
+
+
+def test_rigid_weights_invalid_index():
+    with pytest.raises(ValueError):
+        binding.rigid_weights(3, 2, 2)
+
+
+def test_estimate_cost():
+    constraint_cost = binding.estimate_cost([100, 200], 2, binding.BindingModes.Constraint)
+    assert constraint_cost['node_types'] == {'parentConstraint': 2, 'scaleConstraint': 2}
+    assert constraint_cost['deformed_vertices'] == 0
+
+    joint_cost = binding.estimate_cost([100, 200], 2, binding.BindingModes.Joint)
+    assert joint_cost['node_types'] == {'joint': 4, 'decomposeMatrix': 2, 'multMatrix': 1, 'skinCluster': 2}
+    assert joint_cost['node_count'] == 9
+    assert joint_cost['deformed_vertices'] == 300
+
+    with pytest.raises(ValueError):
+        binding.estimate_cost([100], 2, 'blendShape')
+
+
+def test_compare_costs():
+    comparison = binding.compare_costs([100, 200], 2)
+    assert comparison['diff']['node_count'] == {'before': 4, 'after': 9, 'delta': 5}
+    assert comparison['diff']['node_types']['parentConstraint'] == -2
+    assert comparison['diff']['node_types']['skinCluster'] == 2
@@ -0,0 +1,167 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger scene query cache
+"""
+
+from collections import Counter
+
+import pytest
+
+from solstice.tools.proprigger import cache
+
+
+class _Scene(object):
+    """
+    Minimal transform hierarchy that answers the Maya commands used by the cache and counts them
+    """
+
+    def __init__(self):
+        self.parents = dict()
+        self.calls = Counter()
+
+    def _path(self, node):
+        node = node.split('|')[-1]
+        path = '|' + node
+        while self.parents.get(node):
+            node = self.parents[node]
+            path = '|' + node + path
+        return path
+
+    def objExists(self, node):
+        self.calls['objExists'] += 1
+        return node.split('|')[-1] in self.parents
+
+    def listRelatives(self, nodes, children=False, parent=False, allDescendents=False, fullPath=False, **kwargs):
+        self.calls['listRelatives'] += 1
+        nodes = [node.split('|')[-1] for node in ([nodes] if isinstance(nodes, str) else nodes)]
+        if parent:
+            result = [self.parents[node] for node in nodes if self.parents.get(node)]
+        else:
+            result = list()
+            pending = list(nodes)
+            while pending:
+                current = pending.pop(0)
+                found = [child for child, child_parent in self.parents.items() if child_parent == current]
+                result.extend(sorted(found))
+                if allDescendents:
+                    pending.extend(sorted(found))
+        return [self._path(node) if fullPath else node for node in result] or None
+
+    def group(self, *nodes, **kwargs):
+        self.calls['group'] += 1
+        name = kwargs['name']
+        self.parents[name] = kwargs.get('parent', '').split('|')[-1] or None
+        for node in nodes:
+            self.parents[node.split('|')[-1]] = name
+        return name
+
+    def parent(self, nodes, parent=None, world=False):
+        self.calls['parent'] += 1
+        for node in nodes:
+            self.parents[node.split('|')[-1]] = None if world else parent.split('|')[-1]
+        return nodes
+
+    def rename(self, node, new_name):
+        self.calls['rename'] += 1
+        node = node.split('|')[-1]
+        self.parents[new_name] = self.parents.pop(node)
+        for child, child_parent in self.parents.items():
+            if child_parent == node:
+                self.parents[child] = new_name
+        return new_name
+
+    def delete(self, nodes):
+        self.calls['delete'] += 1
+        for node in self.listRelatives(nodes, allDescendents=True) or list():
+            self.parents.pop(node)
+        for node in nodes:
+            self.parents.pop(node.split('|')[-1])
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    scene = _Scene()
+    monkeypatch.setattr(cache, 'mc', scene, raising=False)
+    return scene
+
+
+@pytest.fixture
+def query_cache(scene):
+    query_cache = cache.SceneQueryCache()
+    query_cache.group(name='main', empty=True, world=True)
+    query_cache.group(name='rig', empty=True, parent='main')
+    query_cache.group(name='geo', empty=True, parent='main')
+    return query_cache
+
+
+def test_queries_are_cached(scene, query_cache):
+    assert query_cache.exists('main')
+    assert query_cache.children('main', full_path=False) == ['geo', 'rig']
+    assert query_cache.children('main', full_path=False) == ['geo', 'rig']
+    assert not query_cache.exists('missing')
+    assert not query_cache.exists('missing')
+    assert scene.calls['objExists'] == 1
+    assert scene.calls['listRelatives'] == 1
+    assert query_cache.stats()['hits'] == 3
+
+
+def test_mutations_do_not_query_parents(scene, query_cache):
+    query_cache.children('main')
+    query_cache.group(name='ctrl', empty=True, parent='rig')
+    query_cache.parent('ctrl', 'geo')
+    query_cache.rename('ctrl', 'ctrl_renamed')
+    assert scene.calls['listRelatives'] == 1
+
+
+def test_group_and_parent_invalidate_children(query_cache):
+    query_cache.group(name='ctrl', empty=True, parent='rig')
+    assert query_cache.children('rig', full_path=False) == ['ctrl']
+    assert query_cache.children('geo', full_path=False) == list()
+    assert query_cache.children('ctrl') == list()
+
+    query_cache.parent('ctrl', 'geo')
+    assert query_cache.children('rig', full_path=False) == list()
+    assert query_cache.children('geo', full_path=False) == ['ctrl']
+
+    query_cache.group('ctrl', name='offset', parent='geo')
+    assert query_cache.children('geo') == ['|main|geo|offset']
+    assert query_cache.children('offset') == ['|main|geo|offset|ctrl']
+
+
+def test_rename_invalidates_descendant_paths(query_cache):
+    query_cache.group(name='ctrl', empty=True, parent='rig')
+    assert query_cache.children('main') == ['|main|geo', '|main|rig']
+    assert query_cache.children('rig') == ['|main|rig|ctrl']
+
+    assert query_cache.rename('rig', 'controls') == 'controls'
+    assert not query_cache.exists('rig')
+    assert query_cache.exists('controls')
+    assert query_cache.children('main') == ['|main|controls', '|main|geo']
+    assert query_cache.children('controls') == ['|main|controls|ctrl']
+
+
+def test_delete_invalidates_descendants(query_cache):
+    query_cache.group(name='ctrl', empty=True, parent='rig')
+    assert query_cache.exists('ctrl')
+    assert query_cache.exists('|main|rig|ctrl')
+    query_cache.children('main', full_path=False)
+
+    query_cache.delete('rig')
+    assert not query_cache.exists('rig')
+    assert not query_cache.exists('ctrl')
+    assert not query_cache.exists('|main|rig|ctrl')
+    assert query_cache.children('main', full_path=False) == ['geo']
+
+
+def test_invalidate_only_visits_indexed_entries(query_cache):
+    query_cache.children('main')
+    query_cache.exists('geo')
+    query_cache.invalidate(['rig'])
+    assert ('main', True, None) not in query_cache._children
+    assert 'geo' in query_cache._exists
+
+    query_cache.invalidate()
+    assert not query_cache._exists
+    assert not query_cache._index
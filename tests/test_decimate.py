@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger proxy decimation
+"""
+
+import numpy as np
+
+from solstice.tools.proprigger import meshdata, decimate
+
+
+def _grid(size):
+    xs, zs = np.meshgrid(np.arange(size + 1), np.arange(size + 1), indexing='ij')
+    points = np.column_stack([xs.ravel(), np.sin(xs.ravel() * 0.3), zs.ravel()]).astype(np.float64)
+    ids = np.arange((size + 1) * (size + 1)).reshape(size + 1, size + 1)
+    corners = [ids[:-1, :-1].ravel(), ids[1:, :-1].ravel(), ids[1:, 1:].ravel(), ids[:-1, 1:].ravel()]
+    return meshdata.MeshData('grid', points, counts=np.full(size * size, 4), connects=np.column_stack(corners).ravel())
+
+
+def test_triangulate_quads():
+    mesh = _grid(2)
+    assert mesh.triangle_count == 8
+    assert mesh.triangulate().shape == (8, 3)
+
+
+def test_decimate_fits_triangle_budget():
+    mesh = _grid(40)
+    points, triangles = decimate.decimate(mesh.points, mesh.triangulate(), 500)
+    assert 0 < len(triangles) <= 500
+    assert triangles.max() < len(points)
+    assert np.all(points.min(axis=0) >= mesh.points.min(axis=0) - 1e-9)
+    assert np.all(points.max(axis=0) <= mesh.points.max(axis=0) + 1e-9)
+
+
+def test_decimate_keeps_meshes_under_budget():
+    mesh = _grid(2)
+    points, triangles = decimate.decimate(mesh.points, mesh.triangulate(), 100)
+    assert len(triangles) == 8
+
+
+def test_decimate_falls_back_to_bounding_box_hull():
+    mesh = _grid(10)
+    points, triangles = decimate.decimate(mesh.points, mesh.triangulate(), 1)
+    assert len(points) == 8 and len(triangles) == 12
+
+
+def test_distribute_budget():
+    assert decimate.distribute_budget([1000, 3000], 2000).tolist() == [503, 1496]
+    assert decimate.distribute_budget([10000, 5], 100).tolist() == [95, 5]
+    assert decimate.distribute_budget([100, 200], 1000).tolist() == [100, 200]
+    assert decimate.distribute_budget([0, 0], 100).tolist() == [0, 0]
+
+
+def test_distribute_budget_drops_smallest_meshes():
+    budgets = decimate.distribute_budget([1000, 50, 3000, 20], 30)
+    assert budgets.tolist() == [13, 0, 16, 0]
+    assert budgets.sum() <= 30
+    assert decimate.distribute_budget([1000, 3000], 5).tolist() == [0, 0]
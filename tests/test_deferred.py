@@ -0,0 +1,50 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger deferred hires geometry
+"""
+
+import os
+
+import pytest
+
+from solstice.tools.proprigger import deferred, meshdata
+
+
+def _cube(name):
+    return meshdata.MeshData(
+        name, [[0, 0, 0]] * 8, [4] * 6, [0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 5, 4, 2, 3, 7, 6, 1, 2, 6, 5, 0, 3, 7, 4])
+
+
+def test_footprint_report():
+    proxy_bytes = _cube('proxy').estimate_bytes()
+    hires_bytes = _cube('hires').estimate_bytes() * 2
+
+    report = deferred.footprint_report([_cube('proxy')], [_cube('hires_a'), _cube('hires_b')])
+    assert report['proxy'] == {
+        deferred.HiresModes.Embedded: proxy_bytes + hires_bytes, deferred.HiresModes.Deferred: proxy_bytes}
+    for display_type in ['hires', 'both']:
+        assert report[display_type][deferred.HiresModes.Deferred] == proxy_bytes + hires_bytes
+    assert deferred.footprint_report([], [])['both'][deferred.HiresModes.Embedded] == 0
+
+
+def test_get_default_hires_file(monkeypatch, cmds, tmp_path):
+    cmds.root_path = str(tmp_path)
+    monkeypatch.setattr(deferred, 'mc', cmds, raising=False)
+    assert deferred.get_default_hires_file('chair') == os.path.join(str(tmp_path), 'scenes', 'chair_hires.ma')
+
+    cmds.scene_path = os.path.join(str(tmp_path), 'rigs', 'chair_rig.ma')
+    assert deferred.get_default_hires_file('chair') == os.path.join(str(tmp_path), 'rigs', 'chair_hires.ma')
+
+
+@pytest.mark.parametrize('relative_path, expected', [
+    (os.path.join('scenes', 'chair_hires.ma'), 'scenes/chair_hires.ma'),
+    (os.path.join('..', 'other', 'chair_hires.ma'), None)])
+def test_get_reference_path(monkeypatch, cmds, tmp_path, relative_path, expected):
+    root_path = os.path.join(str(tmp_path), 'project')
+    file_path = os.path.normpath(os.path.join(root_path, relative_path))
+    cmds.root_path = root_path + os.sep
+    monkeypatch.setattr(deferred, 'mc', cmds, raising=False)
+
+    assert deferred.get_reference_path(file_path) == (expected or file_path.replace('\\', '/'))
@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rig structural fingerprints
+"""
+
+import copy
+import json
+
+import pytest
+
+from solstice.tools.proprigger import fingerprint
+
+
+def _rig_records():
+    return {
+        'rig': {'type': 'transform', 'attrs': {'visibility': True}, 'locked': [], 'connections': []},
+        'rig|main_ctrl_root': {'type': 'transform', 'attrs': {}, 'locked': ['translateX'], 'connections': []},
+        'rig|main_ctrl_root|main_ctrl': {
+            'type': 'transform', 'attrs': {'translateX': 0.0, 'proxy': True}, 'locked': [], 'connections': []},
+        'hires|geo': {
+            'type': 'transform', 'attrs': {}, 'locked': [],
+            'connections': [['rig|main_ctrl_root|main_ctrl.proxy', 'visibility']]},
+        '@dg|hires_visibility': {'type': 'animCurveUU', 'attrs': {}, 'locked': [], 'connections': []}
+    }
+
+
+def test_identical_builds_have_same_hash():
+    fingerprint_a = fingerprint.build_fingerprint(_rig_records())
+    fingerprint_b = fingerprint.build_fingerprint(_rig_records())
+
+    assert fingerprint_a.hash == fingerprint_b.hash
+    assert fingerprint.diff_fingerprints(fingerprint_a, fingerprint_b) == list()
+
+
+def test_diff_reports_changed_attributes_only_in_changed_subtree():
+    records = _rig_records()
+    changed = copy.deepcopy(records)
+    changed['rig|main_ctrl_root|main_ctrl']['attrs']['translateX'] = 1.0
+    changed['rig|main_ctrl_root']['locked'] = []
+
+    fingerprint_a = fingerprint.build_fingerprint(records)
+    fingerprint_b = fingerprint.build_fingerprint(changed)
+
+    assert fingerprint_a.children['hires'].hash == fingerprint_b.children['hires'].hash
+    differences = fingerprint.diff_fingerprints(fingerprint_a, fingerprint_b)
+    assert [difference['path'] for difference in differences] == ['rig|main_ctrl_root', 'rig|main_ctrl_root|main_ctrl']
+    assert differences[0]['changes'] == {'locked': {'added': [], 'removed': ['translateX']}}
+    assert differences[1]['changes'] == {'attrs': {'translateX': {'before': 0.0, 'after': 1.0}}}
+
+
+def test_diff_reports_added_and_removed_nodes():
+    records = _rig_records()
+    changed = copy.deepcopy(records)
+    changed.pop('@dg|hires_visibility')
+    changed['rig|extra_grp'] = {'type': 'transform', 'attrs': {}, 'locked': [], 'connections': []}
+
+    differences = fingerprint.diff_fingerprints(
+        fingerprint.build_fingerprint(records), fingerprint.build_fingerprint(changed))
+
+    assert {'path': '@dg', 'kind': 'removed'} in differences
+    assert {'path': 'rig|extra_grp', 'kind': 'added'} in differences
+    assert len(differences) == 2
+
+
+def test_fingerprint_round_trip(tmpdir):
+    fingerprint_a = fingerprint.build_fingerprint(_rig_records())
+    file_path = str(tmpdir.join('fingerprint.json'))
+    fingerprint.write_fingerprint(fingerprint_a, file_path)
+
+    fingerprint_b = fingerprint.read_fingerprint(file_path)
+    assert fingerprint_b.hash == fingerprint_a.hash
+    assert fingerprint.diff_fingerprints(fingerprint_a, fingerprint_b) == list()
+
+
+def test_read_fingerprint_rejects_other_versions(tmpdir):
+    file_path = str(tmpdir.join('fingerprint.json'))
+    fingerprint.write_fingerprint(fingerprint.build_fingerprint(_rig_records()), file_path)
+    with open(file_path) as fh:
+        data = json.load(fh)
+    data['version'] = fingerprint.FINGERPRINT_VERSION - 1
+    with open(file_path, 'w') as fh:
+        json.dump(data, fh)
+
+    with pytest.raises(ValueError):
+        fingerprint.read_fingerprint(file_path)
+
+
+def test_relative_names():
+    assert fingerprint.get_relative_name('|ns:prop', '|ns:prop') == fingerprint.ROOT_NAME
+    assert fingerprint.get_relative_name('|ns:prop|ns:rig|ns:main_ctrl', '|ns:prop') == 'rig|main_ctrl'
+    assert fingerprint.get_relative_name('ns:hires_visibility', '|ns:prop') == '@dg|hires_visibility'
+
+
+def test_root_connections_have_valid_plugs(monkeypatch, cmds):
+    cmds.add('|ns:prop')
+    cmds.add('ns:hires_visibility', 'animCurveUU')
+    cmds.connectAttr('|ns:prop.type', 'ns:hires_visibility.input')
+
+    monkeypatch.setattr(fingerprint, 'mc', cmds, raising=False)
+    record = fingerprint.get_node_record(
+        'ns:hires_visibility', lambda node: fingerprint.get_relative_name(node, '|ns:prop'))
+    assert record['connections'] == [['@root.type', 'input']]
+
+
+def _get_dg_names(monkeypatch, cmds, ns, numbers):
+    conversion_a, conversion_b, conversion_c = ['{}:unitConversion{}'.format(ns, number) for number in numbers]
+    geo = cmds.add('|{0}:prop|{0}:rig|{0}:geo'.format(ns))
+    dg_nodes = [conversion_a, conversion_b, conversion_c, 'other:unitConversion{}'.format(numbers[0]),
+                '{}:blend'.format(ns), '{}:curve'.format(ns)]
+    for node in dg_nodes:
+        cmds.add(node, 'animCurveUU' if node.endswith('curve') else 'unitConversion')
+    for source, target in [
+            (conversion_a + '.output', geo + '.rotateX'),
+            ('other:unitConversion{}.output'.format(numbers[0]), geo + '.rotateY'),
+            (conversion_b + '.output', '{}:blend.input'.format(ns)),
+            ('{}:blend.output'.format(ns), geo + '.translateX'),
+            ('|{}:prop.type'.format(ns), '{}:curve.input'.format(ns)),
+            ('|{}:prop.type'.format(ns), conversion_c + '.input')]:
+        cmds.connectAttr(source, target)
+
+    monkeypatch.setattr(fingerprint, 'mc', cmds, raising=False)
+    names = fingerprint.get_dg_names(
+        dg_nodes, lambda node: fingerprint.get_relative_name(node, '|{}:prop'.format(ns)))
+
+    return dict((node.split(':', 1)[-1].rstrip('0123456789') + str(dg_nodes.index(node)), name)
+                for node, name in names.items())
+
+
+def test_dg_names_do_not_depend_on_generated_names(monkeypatch, cmds):
+    names = _get_dg_names(monkeypatch, cmds, 'ns', [1, 3, 4])
+
+    assert names == _get_dg_names(monkeypatch, cmds, 'other_ns', [7, 2, 5])
+    assert names['unitConversion0'] == '@dg|rig/geo.rotateX<output'
+    assert names['unitConversion3'] == '@dg|rig/geo.rotateY<output'
+    assert names['blend4'] == '@dg|rig/geo.translateX<output'
+    assert names['unitConversion1'] == '@dg|rig/geo.translateX<output.input<output'
+    assert names['curve5'] == '@dg|@root.type>input#0'
+    assert names['unitConversion2'] == '@dg|@root.type>input#1'
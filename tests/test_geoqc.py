@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger geometry quality checks
+"""
+
+import numpy as np
+
+from solstice.tools.proprigger import geoqc
+from solstice.tools.proprigger import meshdata
+
+
+def _quad_mesh(name='quad', matrix=None):
+    points = [[0, 0, 0], [1, 0, 0], [1, 0, 1], [0, 0, 1], [2, 0, 0]]
+    # Second face is the first one with reversed winding (lamina), third one is degenerated
+    counts = [4, 4, 3]
+    connects = [0, 1, 2, 3, 3, 2, 1, 0, 0, 1, 4]
+    return meshdata.MeshData(name, points, counts, connects, matrix=matrix)
+
+
+def _checks(findings):
+    return dict((finding['check'], finding) for finding in findings)
+
+
+def test_face_areas():
+    areas = geoqc.get_face_areas(_quad_mesh())
+    assert np.allclose(areas, [1.0, 1.0, 0.0])
+
+
+def test_lamina_faces():
+    assert geoqc.get_lamina_faces(_quad_mesh()).tolist() == [0, 1]
+
+
+def test_check_mesh_findings():
+    matrix = np.identity(4)
+    matrix[3, :3] = [100.0, 0.0, 0.0]
+    findings = _checks(geoqc.check_mesh(_quad_mesh(matrix=matrix), settings={'mesh_triangle_budget': 4}))
+
+    assert findings[geoqc.Checks.ZeroAreaFaces]['faces'] == [2]
+    assert findings[geoqc.Checks.LaminaFaces]['faces'] == [0, 1]
+    assert geoqc.Checks.UnfrozenTransform in findings
+    assert geoqc.Checks.PolyBudget in findings
+    # The pivot moves with the geometry, so it is not reported as a far pivot
+    assert geoqc.Checks.FarPivot not in findings
+    assert geoqc.Checks.PivotFromOrigin not in findings
+
+    findings = _checks(geoqc.check_mesh(_quad_mesh(), pivot=[50.0, 0.0, 0.0]))
+    assert geoqc.Checks.FarPivot in findings
+    assert geoqc.Checks.UnfrozenTransform not in findings
+
+
+def test_check_mesh_pivot_from_origin():
+    matrix = np.identity(4)
+    matrix[3, :3] = [300.0, 0.0, 400.0]
+    findings = _checks(geoqc.check_mesh(_quad_mesh(matrix=matrix)))
+
+    # The pivot is at the mesh center, but the mesh is far from the world origin
+    assert geoqc.Checks.FarPivot not in findings
+    assert findings[geoqc.Checks.PivotFromOrigin]['distance'] == 500.0
+
+    findings = _checks(geoqc.check_mesh(_quad_mesh(matrix=matrix), settings={'pivot_origin_distance': 1000.0}))
+    assert geoqc.Checks.PivotFromOrigin not in findings
+
+
+def test_run_qc_files(tmpdir):
+    file_paths = list()
+    for name in ['a', 'b']:
+        file_path = str(tmpdir.join('{}.npz'.format(name)))
+        _quad_mesh(name).save(file_path)
+        file_paths.append(file_path)
+
+    report = geoqc.run_qc_files(file_paths, settings={'total_triangle_budget': 8})
+
+    assert report['total_triangles'] == 10
+    assert report['over_budget']
+    assert report['meshes']['a']['budget_share'] == 0.5
+    assert report['findings_count'] == 4
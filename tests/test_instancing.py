@@ -0,0 +1,38 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger duplicated geometry detection
+"""
+
+import numpy as np
+
+from solstice.tools.proprigger import meshdata, instancing
+
+
+def _quad(name, offset=0.0):
+    points = np.array([[0, 0, 0], [1, 0, 0], [1, 0, 1], [0, 0, 1]], dtype=np.float64) + offset
+    return meshdata.MeshData(name, points, counts=[4], connects=[0, 1, 2, 3])
+
+
+def test_identical_meshes_are_grouped():
+    meshes = [_quad('a'), _quad('b'), _quad('c', offset=1e-9), _quad('d', offset=2.0)]
+    duplicates = instancing.find_duplicates(meshes)
+    assert len(duplicates) == 1
+    master, others = duplicates[0]
+    assert master.name == 'a'
+    assert [mesh.name for mesh in others] == ['b', 'c']
+
+
+def test_different_topology_is_not_grouped():
+    quad = _quad('a')
+    flipped = meshdata.MeshData('b', quad.points, counts=[4], connects=[3, 2, 1, 0])
+    assert not instancing.find_duplicates([quad, flipped])
+
+
+def test_instancing_report_savings():
+    meshes = [_quad('a'), _quad('b'), _quad('c')]
+    report = instancing.InstancingReport(instancing.find_duplicates(meshes))
+    assert report.instanced_count == 2
+    assert report.memory_saved == 2 * meshes[0].estimate_bytes()
+    assert report.file_size_saved > report.memory_saved
@@ -0,0 +1,45 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger naming
+"""
+
+import pytest
+
+from solstice.tools.proprigger import naming
+
+
+@pytest.mark.parametrize('value, alpha', [(0, 'a'), (25, 'z'), (26, 'aa'), (27, 'ab'), (701, 'zz'), (702, 'aaa')])
+def test_get_alpha(value, alpha):
+    assert naming.get_alpha(value) == alpha
+    assert naming.get_alpha(value, capital=True) == alpha.upper()
+
+
+def test_name_registry_claims_unique_names():
+    registry = naming.NameRegistry(['main_ctrl', '|grp|main_ctrlA', 'other:main_ctrlB'])
+    assert registry.claim('root_ctrl') == 'root_ctrl'
+    assert registry.claim('main_ctrl') == 'main_ctrlB'
+    assert registry.claim('main_ctrl') == 'main_ctrlC'
+    assert len(set(registry.claim('shape') for _ in range(100))) == 100
+
+
+def test_name_registry_namespace():
+    registry = naming.NameRegistry(['main_ctrl', 'prop:root_ctrl'], namespace='prop')
+    assert registry.claim('main_ctrl') == 'main_ctrl'
+    assert registry.claim('root_ctrl') == 'root_ctrlA'
+
+
+def test_name_registry_checks_unregistered_names_in_scene():
+    scene_names = set(['prop:main_ctrl_parentConstraint1', 'prop:main_ctrlShape'])
+    checked = list()
+
+    def _exists(name):
+        checked.append(name)
+        return name in scene_names
+
+    registry = naming.NameRegistry(['prop:main_ctrl'], namespace='prop', exists_fn=_exists)
+    assert registry.claim('main_ctrlShape') == 'main_ctrlShapeA'
+    assert registry.claim('main_ctrl_parentConstraint1') == 'main_ctrl_parentConstraint1A'
+    assert registry.claim('main_ctrlShape') == 'main_ctrlShapeB'
+    assert checked.count('prop:main_ctrlShape') == 1
@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rig optimizer
+"""
+
+import pytest
+
+from solstice.tools.proprigger import optimizer
+
+
+@pytest.fixture
+def cmds(cmds, monkeypatch):
+    """
+    Shading network graph: chair_SG and chair_mat were imported and lost their geometry during the build, loose_mat
+    was imported without being assigned, user_SG is an unused shader of the user and chair_file is shared with the
+    assigned shared_SG
+    """
+
+    for node, node_type in [
+            ('chair_SG', 'shadingEngine'), ('shared_SG', 'shadingEngine'), ('user_SG', 'shadingEngine'),
+            ('chair_mat', 'lambert'), ('shared_mat', 'blinn'), ('user_mat', 'lambert'), ('loose_mat', 'lambert'),
+            ('chair_file', 'file'), ('chair_bump', 'bump2d'), ('loose_file', 'file'),
+            ('chair_materialInfo', 'materialInfo'), ('|seat|seatShape', 'mesh')]:
+        cmds.add(node, node_type)
+    cmds.add('initialShadingGroup', 'shadingEngine', default=True)
+    cmds.add('lambert1', 'lambert', default=True)
+    for source, target in [
+            ('chair_file.outColor', 'chair_mat.color'), ('chair_bump.outNormal', 'chair_mat.normalCamera'),
+            ('chair_mat.outColor', 'chair_SG.surfaceShader'), ('chair_SG.message', 'chair_materialInfo.shadingGroup'),
+            ('chair_file.outColor', 'shared_mat.color'), ('shared_mat.outColor', 'shared_SG.surfaceShader'),
+            ('seatShape.instObjGroups[0]', 'shared_SG.dagSetMembers[0]'),
+            ('user_mat.outColor', 'user_SG.surfaceShader'),
+            ('lambert1.outColor', 'initialShadingGroup.surfaceShader'), ('loose_file.outColor', 'loose_mat.color')]:
+        cmds.connectAttr(source, target)
+    monkeypatch.setattr(optimizer, 'mc', cmds, raising=False)
+
+    return cmds
+
+
+def test_get_shading_nodes(cmds):
+    assert optimizer.get_shading_nodes() == {
+        'chair_SG', 'shared_SG', 'user_SG', 'initialShadingGroup', 'chair_mat', 'shared_mat', 'user_mat', 'loose_mat',
+        'lambert1'}
+    assert optimizer.get_shading_nodes(['seatShape']) == {'shared_SG'}
+    assert optimizer.get_shading_nodes(list()) == set()
+
+
+def test_delete_unused_shading_nodes_is_limited_to_given_nodes(cmds):
+    rig_optimizer = optimizer.RigOptimizer('chair')
+    deleted = rig_optimizer.delete_unused_shading_nodes({
+        'chair_SG', 'chair_mat', 'chair_file', 'chair_bump', 'shared_SG', 'shared_mat', 'initialShadingGroup',
+        'lambert1'})
+
+    assert deleted == 4
+    assert sorted(cmds.deleted) == ['chair_SG', 'chair_bump', 'chair_mat', 'chair_materialInfo']
+
+
+def test_delete_unused_shading_nodes_deletes_unassigned_materials(cmds):
+    rig_optimizer = optimizer.RigOptimizer('chair')
+
+    assert rig_optimizer.delete_unused_shading_nodes({'loose_mat', 'shared_mat'}) == 2
+    assert sorted(cmds.deleted) == ['loose_file', 'loose_mat']
+
+
+def test_delete_unused_shading_nodes_without_unused_nodes(cmds):
+    rig_optimizer = optimizer.RigOptimizer('chair')
+    assert rig_optimizer.delete_unused_shading_nodes({'shared_SG', 'shared_mat', 'lambert1'}) == 0
+    assert rig_optimizer.delete_unused_shading_nodes(set()) == 0
+    assert not cmds.deleted
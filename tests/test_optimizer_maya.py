@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rig optimizer that need a Maya session
+"""
+
+import pytest
+
+maya_standalone = pytest.importorskip('maya.standalone')
+
+
+@pytest.fixture(scope='module')
+def mc():
+    maya_standalone.initialize()
+    import maya.cmds as cmds
+    return cmds
+
+
+def test_optimize_stage_reports_file_size_and_refreshes_controls(mc):
+    from solstice.tools.proprigger import prop
+
+    mc.file(new=True, force=True)
+    model_grp = mc.group(mc.polyCube(name='seat')[0], name='chair_MODEL')
+    proxy_grp = mc.group(mc.polyCube(name='seat_proxy')[0], name='chair_PROXY')
+    user_shader = mc.shadingNode('lambert', asShader=True, name='user_lambert')
+    rig = prop.PropRig('chair', import_scenes=False, model_grp=model_grp, proxy_grp=proxy_grp, optimize=True)
+    rig.build(new_scene=False)
+
+    report = rig.optimization_report
+    assert report['file_size_before'] and report['file_size_after']
+    assert mc.objExists(user_shader)
+    for ctrl in [rig._root_ctrl, rig._main_ctrl]:
+        assert mc.objExists(ctrl.node)
+        for grp in [ctrl.auto, ctrl.constraint]:
+            assert grp is None or mc.objExists(grp)
+
+
+def test_optimize_stage_deletes_shading_nodes_left_by_deferred_hires(mc, tmp_path):
+    from solstice.tools.proprigger import prop, deferred
+
+    mc.file(new=True, force=True)
+    seat = mc.polyCube(name='seat')[0]
+    model_grp = mc.group(seat, name='chair_MODEL')
+    proxy_grp = mc.group(mc.polyCube(name='seat_proxy')[0], name='chair_PROXY')
+    seat_shader = mc.shadingNode('lambert', asShader=True, name='seat_lambert')
+    seat_sg = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name='seat_SG')
+    mc.connectAttr('{}.outColor'.format(seat_shader), '{}.surfaceShader'.format(seat_sg))
+    mc.sets(seat, edit=True, forceElement=seat_sg)
+    user_shader = mc.shadingNode('lambert', asShader=True, name='user_lambert')
+    rig = prop.PropRig(
+        'chair', import_scenes=False, model_grp=model_grp, proxy_grp=proxy_grp, optimize=True,
+        hires_mode=deferred.HiresModes.Deferred, hires_file=str(tmp_path / 'chair_hires.ma'))
+    rig.build(new_scene=False)
+
+    assert rig.optimization_report['deleted_shading_nodes'] >= 2
+    assert not mc.objExists(seat_shader) and not mc.objExists(seat_sg)
+    assert mc.objExists(user_shader)
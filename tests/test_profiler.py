@@ -0,0 +1,80 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rig complexity profiler
+"""
+
+import pytest
+
+from solstice.tools.proprigger import profiler
+
+
+def _rig_graph():
+    nodes = {
+        '|prop': 'transform', '|prop|rig': 'transform', '|prop|rig|main_ctrl': 'transform',
+        '|prop|hires': 'transform', '|prop|hires|prop_hires_grp': 'transform',
+        '|prop|hires|prop_hires_grp|parentConstraint1': 'parentConstraint',
+        '|prop|hires|prop_hires_grp|geo': 'transform', '|prop|hires|prop_hires_grp|geo|geoShape': 'mesh',
+        'hires_visibility': 'animCurveUU', 'geo_skinCluster': 'skinCluster'}
+    connections = [
+        ('|prop|rig|main_ctrl', '|prop|hires|prop_hires_grp|parentConstraint1'),
+        ('|prop|hires|prop_hires_grp|parentConstraint1', '|prop|hires|prop_hires_grp'),
+        ('|prop', 'hires_visibility'), ('hires_visibility', '|prop|hires'), ('|prop', 'not_in_rig'),
+        ('geo_skinCluster', '|prop|hires|prop_hires_grp|geo|geoShape')]
+    hierarchy = [(node.rsplit('|', 1)[0], node) for node in nodes if node.count('|') > 1]
+    return nodes, connections, hierarchy
+
+
+def test_analyze_graph():
+    nodes, connections, hierarchy = _rig_graph()
+    vertex_counts = {'|prop|hires|prop_hires_grp|geo|geoShape': 1000}
+    report = profiler.analyze_graph(nodes, connections, hierarchy, vertex_counts=vertex_counts, name='prop')
+    assert report['node_count'] == 10
+    assert report['node_types'] == {
+        'transform': 6, 'parentConstraint': 1, 'mesh': 1, 'animCurveUU': 1, 'skinCluster': 1}
+    assert report['connection_count'] == 5
+    assert report['dg_depth'] == 7
+    assert report['evaluation_weight'] == pytest.approx(
+        6 * 1.0 + 4.0 + 1.0 + 2.0 + 1000 * profiler.DEFORMED_VERTEX_WEIGHT)
+
+
+def test_analyze_graph_ignores_vertices_of_undeformed_meshes():
+    nodes, connections, hierarchy = _rig_graph()
+    connections = [connection for connection in connections if connection[0] != 'geo_skinCluster']
+    vertex_counts = {'|prop|hires|prop_hires_grp|geo|geoShape': 1000}
+    report = profiler.analyze_graph(nodes, connections, hierarchy, vertex_counts=vertex_counts)
+    assert report['evaluation_weight'] == pytest.approx(6 * 1.0 + 4.0 + 1.0 + 2.0)
+
+
+def test_dg_depth_with_cycles():
+    assert profiler.get_dg_depth(['a', 'b', 'c'], [('a', 'b'), ('b', 'a'), ('c', 'c')]) == 1
+    assert profiler.get_dg_depth(
+        ['a', 'b', 'c', 'd', 'e'], [('e', 'a'), ('a', 'b'), ('b', 'a'), ('b', 'c'), ('c', 'd')]) == 4
+
+
+def test_compare_reports_and_budget():
+    nodes, connections, hierarchy = _rig_graph()
+    before = profiler.analyze_graph(nodes, connections, hierarchy)
+    nodes['|prop|hires|prop_hires_grp|scaleConstraint1'] = 'scaleConstraint'
+    after = profiler.analyze_graph(nodes, connections, hierarchy)
+    diff = profiler.compare_reports(before, after)
+    assert diff['node_count']['delta'] == 1
+    assert diff['node_types'] == {'scaleConstraint': 1}
+    assert 'dg_depth' not in diff
+    assert profiler.check_budget(after, {'node_count': 10, 'dg_depth': 100}) == {
+        'node_count': {'value': 11, 'budget': 10}}
+
+
+def test_profile_file_keeps_unsaved_changes(monkeypatch, cmds):
+    cmds.modified = True
+    monkeypatch.setattr(profiler.utils, 'mc', cmds, raising=False)
+    monkeypatch.setattr(profiler, 'mc', cmds, raising=False)
+    with pytest.raises(RuntimeError):
+        profiler.profile_file('prop_rig.ma')
+    assert not cmds.calls
+
+    assert profiler.profile_file('prop_rig.ma', force=True) == dict()
+    cmds.batch = True
+    profiler.profile_file('prop_rig.ma')
+    assert cmds.calls == [('open', 'prop_rig.ma'), ('open', 'prop_rig.ma')]
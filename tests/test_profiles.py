@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger build profiles
+"""
+
+import pytest
+
+from solstice.tools.proprigger import profiles
+
+
+@pytest.fixture
+def cmds(cmds, monkeypatch):
+    cmds.add('|chair|geo')
+    cmds.select('|chair')
+    monkeypatch.setattr(profiles, 'mc', cmds, raising=False)
+    return cmds
+
+
+def test_default_profile_depends_on_batch_mode(cmds):
+    assert profiles.BuildProfile().name == profiles.Profiles.Interactive
+    cmds.batch = True
+    assert profiles.BuildProfile().name == profiles.Profiles.Batch
+    with pytest.raises(ValueError):
+        profiles.BuildProfile('fast')
+
+
+def test_interactive_profile_frames_and_restores_selection(cmds):
+    build_profile = profiles.BuildProfile(profiles.Profiles.Interactive)
+    build_profile.refresh()
+    build_profile.frame(['|chair|geo'])
+
+    assert cmds.calls == [('refresh', None), ('viewFit', True)]
+    assert cmds.selection == ['|chair']
+
+
+def test_batch_profile_skips_viewport_side_effects(cmds):
+    build_profile = profiles.BuildProfile(profiles.Profiles.Batch)
+    build_profile.refresh()
+    build_profile.frame(['|chair|geo'])
+    with build_profile.stage('create_main_groups'):
+        assert cmds.calls == [('refresh', True)]
+
+    assert cmds.calls == [('refresh', True), ('refresh', False)]
+    assert list(build_profile.timings) == ['create_main_groups']
+
+
+def test_stage_timings_and_report(cmds):
+    build_profile = profiles.BuildProfile(profiles.Profiles.Benchmark)
+    build_profile.begin()
+    for stage_name in ['create_main_groups', 'setup', 'setup']:
+        with build_profile.stage(stage_name):
+            pass
+    build_profile.end()
+    assert list(build_profile.timings) == ['create_main_groups', 'setup']
+    report = build_profile.report()
+    assert report.startswith('Build timings (benchmark profile):')
+    assert 'total' in report
+
+    with pytest.raises(RuntimeError):
+        with build_profile.stage('finish'):
+            raise RuntimeError('Stage failed')
+    assert 'finish' in build_profile.timings
+    assert cmds.calls[-1] == ('refresh', False)
+
+    build_profile.begin()
+    assert not build_profile.timings
+
+
+def test_export_nodes_keeps_selection(cmds):
+    assert profiles.export_nodes(['|chair|geo'], 'chair.ma', type='mayaAscii') == 'chair.ma'
+    assert cmds.calls == [('export', 'chair.ma', ['|chair|geo'], {'type': 'mayaAscii'})]
+    assert cmds.selection == ['|chair']
+
+    cmds.selection = list()
+    profiles.export_nodes(['|chair|geo'], 'chair.ma')
+    assert not cmds.selection
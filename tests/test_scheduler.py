@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger cooperative build scheduler
+"""
+
+from collections import OrderedDict
+
+from solstice.tools.proprigger import scheduler
+
+
+class _Profile(object):
+    def __init__(self):
+        self.timings = OrderedDict()
+
+
+class _Rig(object):
+    def __init__(self, asset_name, fail_stage=None):
+        self.asset_name = asset_name
+        self.profile = _Profile()
+        self.executed = list()
+        self.end_error = 'not finished'
+        self._fail_stage = fail_stage
+
+    def begin_build(self):
+        self.profile.timings = OrderedDict()
+
+    def get_build_stages(self):
+        return [(name, lambda name=name: self.executed.append(name)) for name in ['groups', 'controls', 'finish']]
+
+    def run_stage(self, stage_name, stage_fn):
+        if stage_name == self._fail_stage:
+            raise RuntimeError('Stage failed')
+        stage_fn()
+        self.profile.timings[stage_name] = 0.1
+
+    def end_build(self, error=None):
+        self.end_error = error
+
+
+class _Deferred(object):
+    def __init__(self):
+        self.calls = list()
+
+    def __call__(self, fn):
+        self.calls.append(fn)
+
+    def run_one(self):
+        self.calls.pop(0)()
+
+    def run_all(self):
+        while self.calls:
+            self.run_one()
+
+
+def test_stage_runner_runs_one_stage_per_deferred_call():
+    deferred = _Deferred()
+    progress = list()
+    asset_rig = _Rig('chair')
+    runner = scheduler.StageRunner(asset_rig, on_progress=lambda r: progress.append(r.completed_stages),
+                                   defer_fn=deferred)
+    runner.start()
+    assert asset_rig.executed == []
+
+    deferred.run_one()
+    assert asset_rig.executed == ['groups']
+    assert runner.current_stage == 'controls'
+
+    deferred.run_all()
+    assert asset_rig.executed == ['groups', 'controls', 'finish']
+    assert progress == [1, 2, 3]
+    assert runner.status == scheduler.Status.Finished
+    assert asset_rig.end_error is None
+
+
+def test_stage_runner_cancels_at_stage_boundary():
+    deferred = _Deferred()
+    asset_rig = _Rig('chair')
+    runner = scheduler.StageRunner(asset_rig, defer_fn=deferred)
+    runner.start()
+    deferred.run_one()
+    runner.cancel()
+    deferred.run_all()
+
+    assert asset_rig.executed == ['groups']
+    assert runner.status == scheduler.Status.Cancelled
+    assert isinstance(asset_rig.end_error, scheduler.BuildCancelled)
+
+
+def test_build_queue():
+    deferred = _Deferred()
+    finished = list()
+    build_queue = scheduler.BuildQueue(on_finished=lambda r: finished.append(r.asset_rig.asset_name), defer_fn=deferred)
+    build_queue.add(_Rig('chair', fail_stage='controls'))
+    build_queue.add(_Rig('table'))
+    build_queue.start()
+    deferred.run_all()
+
+    assert finished == ['chair', 'table']
+    assert not build_queue.is_running()
+    report = build_queue.report()
+    assert [item['status'] for item in report] == [scheduler.Status.Failed, scheduler.Status.Finished]
+    assert 'Stage failed' in report[0]['error']
+    assert report[1]['timings'] == {'groups': 0.1, 'controls': 0.1, 'finish': 0.1}
@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rig specs
+"""
+
+import json
+
+import pytest
+
+from solstice.tools.proprigger import spec
+
+
+def _rig_spec(source_key=None):
+    def _node(key, node_type='transform', dag=True, **kwargs):
+        node = {'key': key, 'name': key.split('|')[-1], 'type': node_type, 'dag': dag,
+                'parent': key.rsplit('|', 1)[0] if '|' in key else None, 'user_attrs': [], 'values': {}, 'states': {}}
+        node.update(kwargs)
+        return node
+
+    nodes = [
+        _node('chair', user_attrs=[{'name': 'type', 'type': 'enum', 'enum': 'proxy:hires:both'}], values={'type': 0}),
+        _node('chair|proxy'),
+        _node('chair|rig'),
+        _node('chair|rig|main_ctrl', states={'visibility': [True, False, False]}),
+        _node('chair|rig|main_ctrl|main_ctrlShape', node_type='nurbsCurve', curve={
+            'degree': 1, 'form': 1, 'knots': [0, 1], 'cvs': [[0, 0, 0], [1, 0, 0]]}),
+        _node('tag_data', node_type='network', dag=False)
+    ]
+    return spec.RigSpec(
+        'chair', nodes=nodes, connections=[('tag_data.node', 'chair.tag_data')],
+        driven_keys=[{'driver': 'chair.type', 'driven': ['chair|proxy.visibility'], 'keys': [[0, 1], [1, 0]],
+                      'in_tangent': 'linear', 'out_tangent': 'step'}],
+        geometry_groups={'proxy': 'chair|proxy'}, source_key=source_key)
+
+
+def test_spec_round_trip(tmpdir):
+    rig_spec = _rig_spec()
+    file_path = str(tmpdir.join('chair.rigspec.json'))
+    rig_spec.save(file_path)
+
+    loaded = spec.RigSpec.load(file_path)
+    assert loaded.hash == rig_spec.hash
+    assert loaded.connections == [('tag_data.node', 'chair.tag_data')]
+    assert loaded.validate() == []
+
+
+def test_spec_version_mismatch():
+    data = _rig_spec().to_dict()
+    data['version'] = spec.SPEC_VERSION + 1
+    with pytest.raises(ValueError):
+        spec.RigSpec.from_dict(data)
+
+
+def test_spec_validate():
+    rig_spec = _rig_spec()
+    rig_spec.nodes.reverse()
+    rig_spec.connections.append(('missing.message', 'chair.tag_data'))
+
+    errors = rig_spec.validate()
+    assert 'Parent chair|rig of node chair|rig|main_ctrl is not defined before it' in errors
+    assert 'Plug missing.message references an unknown node' in errors
+
+
+def test_spec_cache(tmpdir):
+    source_file = tmpdir.join('chair_model.ma')
+    source_file.write('createNode transform -n "chair_MODEL";\n')
+    source_key = spec.get_source_key([str(source_file)])
+    spec_cache = spec.SpecCache(str(tmpdir.join('specs')))
+
+    assert spec_cache.get('chair') is None
+    spec_cache.put(_rig_spec(source_key=source_key))
+    assert spec_cache.get('chair', source_key=source_key).hash == _rig_spec(source_key=source_key).hash
+    assert spec_cache.get('chair', source_key='other') is None
+
+    data = json.loads(open(spec_cache.get_spec_file('chair')).read())
+    data['version'] = 0
+    with open(spec_cache.get_spec_file('chair'), 'w') as fh:
+        json.dump(data, fh)
+    assert spec_cache.get('chair') is None
+
+    source_file.write('createNode transform -n "chair_MODEL";\ncreateNode transform -n "seat";\n')
+    assert spec.get_source_key([str(source_file)]) != source_key
+
+
+def test_spec_source_key_depends_on_versions_and_options(tmpdir, monkeypatch):
+    source_file = tmpdir.join('chair_model.ma')
+    source_file.write('createNode transform -n "chair_MODEL";\n')
+    source_key = spec.get_source_key([str(source_file)])
+
+    assert spec.get_source_key([str(source_file)], options={'rig_class': 'PropRig'}) != source_key
+    monkeypatch.setattr(spec, 'SPEC_VERSION', spec.SPEC_VERSION + 1)
+    assert spec.get_source_key([str(source_file)]) != source_key
+    monkeypatch.undo()
+    monkeypatch.setattr(spec.__version__, '__version__', '99.0.0')
+    assert spec.get_source_key([str(source_file)]) != source_key
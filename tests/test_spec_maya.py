@@ -0,0 +1,67 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger rig specs that need a Maya session
+"""
+
+import pytest
+
+maya_standalone = pytest.importorskip('maya.standalone')
+
+
+@pytest.fixture(scope='module')
+def mc():
+    maya_standalone.initialize()
+    import maya.cmds as cmds
+    return cmds
+
+
+def _create_inputs(mc, asset_name):
+    model_grp = mc.group(mc.polyCube(name='seat')[0], name='{}_MODEL'.format(asset_name))
+    proxy_grp = mc.group(mc.polyCube(name='seat_proxy')[0], name='{}_PROXY'.format(asset_name))
+    return model_grp, proxy_grp
+
+
+def test_spec_capture_and_rebuild(mc):
+    from solstice.tools.proprigger import prop
+
+    mc.file(new=True, force=True)
+    model_grp, proxy_grp = _create_inputs(mc, 'chair')
+    source_rig = prop.PropRig('chair', import_scenes=False, model_grp=model_grp, proxy_grp=proxy_grp)
+    source_rig.build(new_scene=False)
+    rig_spec = source_rig.get_spec(source_key='key')
+
+    mc.file(new=True, force=True)
+    model_grp, proxy_grp = _create_inputs(mc, 'chair')
+    rebuilt_rig = prop.PropRig('chair', import_scenes=False, model_grp=model_grp, proxy_grp=proxy_grp)
+    rebuilt_rig.build(new_scene=False, rig_spec=rig_spec)
+
+    assert rebuilt_rig._root_ctrl and rebuilt_rig._main_ctrl
+    assert rebuilt_rig._hires_asset_grp and rebuilt_rig._proxy_asset_grp
+    assert rebuilt_rig._main_constraints
+    assert mc.listRelatives(rebuilt_rig._hires_asset_grp, children=True)
+    assert rebuilt_rig.get_spec(source_key='key').hash == rig_spec.hash
+    assert rebuilt_rig.get_binding_comparison()
+
+
+def test_spec_rebuild_rebinds_joint_geometry(mc):
+    from solstice.tools.proprigger import prop, binding
+
+    mc.file(new=True, force=True)
+    model_grp, proxy_grp = _create_inputs(mc, 'chair')
+    source_rig = prop.PropRig(
+        'chair', import_scenes=False, model_grp=model_grp, proxy_grp=proxy_grp,
+        binding_mode=binding.BindingModes.Joint)
+    source_rig.build(new_scene=False)
+    rig_spec = source_rig.get_spec()
+
+    mc.file(new=True, force=True)
+    model_grp, proxy_grp = _create_inputs(mc, 'chair')
+    rebuilt_rig = prop.PropRig(
+        'chair', import_scenes=False, model_grp=model_grp, proxy_grp=proxy_grp,
+        binding_mode=binding.BindingModes.Joint)
+    rebuilt_rig.build(new_scene=False, rig_spec=rig_spec)
+
+    assert len(mc.ls(type='skinCluster')) == 2
+    assert rebuilt_rig.get_binding_comparison()['current'] == binding.BindingModes.Joint
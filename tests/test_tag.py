@@ -0,0 +1,65 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger tag data helpers
+"""
+
+import pytest
+
+from solstice.tools.proprigger import tag
+
+
+@pytest.fixture
+def cmds(cmds, monkeypatch):
+    cmds.add('|chair')
+    monkeypatch.setattr(tag, 'cmds', cmds, raising=False)
+    return cmds
+
+
+def test_create_tag_node(cmds):
+    tag_data_node = tag.create_tag_node(node='chair', category='Props')
+
+    assert tag.get_tag_data_node('chair') == tag_data_node
+    tag_type_plug = '{}.{}'.format(tag_data_node, tag.TagDefinitions.TAG_TYPE_ATTRIBUTE_NAME)
+    assert cmds.getAttr(tag_type_plug) == 'SOLSTICE_TAG'
+    assert cmds.getAttr(tag_type_plug, lock=True)
+    assert cmds.getAttr('{}.{}'.format(tag_data_node, tag.TagDefinitions.TYPES_ATTRIBUTE_NAME)) == 'Props'
+    assert cmds.getAttr('chair.{}'.format(tag.TagDefinitions.TAG_DATA_ATTRIBUTE_NAME), lock=True)
+    assert not cmds.selection
+
+
+def test_create_tag_node_for_selection(cmds):
+    cmds.select('chair')
+    tag_data_node = tag.create_tag_node()
+
+    assert tag.get_tag_data_node('chair') == tag_data_node
+    assert not cmds.attributeQuery(tag.TagDefinitions.TYPES_ATTRIBUTE_NAME, node=tag_data_node, exists=True)
+    assert cmds.selection == [tag_data_node]
+
+
+def test_get_tag_data_node_without_tag(cmds):
+    assert tag.get_tag_data_node('chair') is None
+
+
+def test_update_groups(cmds):
+    tag_data_node = tag.create_tag_node(node='chair')
+    cmds.add('|chair_proxy_grp')
+
+    assert tag.update_proxy_group(tag_data_node, 'chair_proxy_grp')
+    assert tag.update_proxy_group(tag_data_node, 'chair_proxy_grp')
+    proxy_plug = '{}.{}'.format(tag_data_node, tag.TagDefinitions.PROXY_ATTRIBUTE_NAME)
+    assert cmds.listConnections(proxy_plug, source=True, destination=False) == ['|chair_proxy_grp']
+    assert cmds.getAttr(proxy_plug, lock=True)
+    assert not tag.update_hires_group(tag_data_node, 'chair_hires_grp')
+    assert not tag.update_hires_group(tag_data_node, None)
+
+
+def test_update_shaders(cmds):
+    tag_data_node = tag.create_tag_node(node='chair')
+
+    assert tag.update_shaders(tag_data_node, {'seat': 'chair_SG'})
+    assert tag.update_shaders(tag_data_node, {'seat': 'seat_SG'})
+    shaders_plug = '{}.{}'.format(tag_data_node, tag.TagDefinitions.SHADERS_ATTRIBUTE_NAME)
+    assert cmds.getAttr(shaders_plug) == str({'seat': 'seat_SG'})
+    assert cmds.getAttr(shaders_plug, lock=True)
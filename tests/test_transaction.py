@@ -0,0 +1,105 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger build transactions
+"""
+
+import os
+
+import pytest
+
+from solstice.tools.proprigger import profiles, transaction
+
+
+class _Messages(object):
+    @staticmethod
+    def addNodeAddedCallback(*args):
+        return 'node_added'
+
+    @staticmethod
+    def addConnectionCallback(*args):
+        return 'connection'
+
+    @staticmethod
+    def removeCallback(callback):
+        pass
+
+
+class _OpenMaya(object):
+    MDGMessage = _Messages
+    MMessage = _Messages
+
+
+@pytest.fixture
+def cmds(cmds, monkeypatch):
+    cmds.namespaces.append(':existing')
+    cmds.add('|inputs|chair_MODEL|seat')
+    cmds.select(cmds.add('|user_node'))
+    monkeypatch.setattr(transaction, 'mc', cmds, raising=False)
+    monkeypatch.setattr(profiles, 'mc', cmds, raising=False)
+    monkeypatch.setattr(transaction, 'om', _OpenMaya, raising=False)
+    return cmds
+
+
+def test_rollback_removes_created_namespaces(cmds):
+    build_transaction = transaction.BuildTransaction()
+    cmds.namespaces.extend([':chair', ':chair:hires'])
+    cmds.add('chair:hires:wood_mat', 'lambert')
+
+    with pytest.raises(ValueError):
+        with build_transaction:
+            raise ValueError('Build failed')
+
+    assert cmds.namespaces == [':existing']
+    assert cmds.objExists('wood_mat')
+    assert cmds.undo_state is True
+
+
+def test_rollback_restores_preserved_nodes(cmds):
+    build_transaction = transaction.BuildTransaction()
+    build_transaction.preserve(['|inputs|chair_MODEL'])
+    file_path = build_transaction._preserved[0][0]
+    assert cmds.calls[0][:3] == ('export', file_path, ['|inputs|chair_MODEL'])
+    assert cmds.selection == ['|user_node']
+
+    cmds.delete('|inputs|chair_MODEL')
+    assert build_transaction.abort()
+    assert cmds.calls[-1] == ('import', file_path)
+    assert cmds.objExists('|inputs|chair_MODEL|seat')
+    assert not os.path.isfile(file_path)
+    assert not build_transaction._preserved
+
+
+def test_commit_removes_preserved_files(cmds):
+    build_transaction = transaction.BuildTransaction()
+    build_transaction.preserve(['|inputs|chair_MODEL'])
+    file_path = build_transaction._preserved[0][0]
+
+    build_transaction.commit()
+    assert not os.path.isfile(file_path)
+    assert build_transaction.abort()
+    assert [call[0] for call in cmds.calls] == ['export']
+
+
+def test_rollback_errors_do_not_hide_build_errors(cmds, monkeypatch):
+    build_transaction = transaction.BuildTransaction()
+
+    def _rollback():
+        raise RuntimeError('Rollback failed')
+
+    monkeypatch.setattr(build_transaction, 'rollback', _rollback)
+    with pytest.raises(ValueError):
+        with build_transaction:
+            raise ValueError('Build failed')
+    assert cmds.undo_state is True
+    assert build_transaction.abort() is False
+
+
+def test_disabled_transaction(cmds):
+    build_transaction = transaction.BuildTransaction(enabled=False)
+    with build_transaction:
+        cmds.namespaces.append(':chair')
+    build_transaction.preserve(['|inputs|chair_MODEL'])
+    assert build_transaction.abort()
+    assert not cmds.calls
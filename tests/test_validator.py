@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger pre-rig validator
+"""
+
+import json
+
+from solstice.tools.proprigger import validator
+
+
+MODEL_FILE = '''//Maya ASCII 2018 scene
+requires maya "2018";
+createNode transform -n "chair_MODEL";
+    rename -uid "A1";
+createNode transform -n "chair_seat" -p "chair_MODEL";
+createNode mesh -n "chair_seatShape" -p "|chair_MODEL|chair_seat";
+    setAttr -k off ".v";
+    setAttr ".uvst[0].uvsn" -type "string" "map1";
+createNode transform -n "chair_leg" -p "chair_MODEL";
+createNode transform -n "chair_leg" -p "chair_seat";
+createNode network -n "tag_data";
+    addAttr -ci true -sn "tag_type" -ln "tag_type" -dt "string";
+    setAttr -l on ".tag_type" -type "string" "{tag_type}";
+select -ne :time1;
+    setAttr ".tag_type" -type "string" "NOT_A_TAG";
+connectAttr "tag_data.node" "chair_MODEL.tag_data";
+'''
+
+
+def _write_asset(tmpdir, tag_type='SOLSTICE_TAG', shader_meshes=('chair_seat', 'chair_leg')):
+    model_file = tmpdir.join('chair_model.ma')
+    model_file.write(MODEL_FILE.format(tag_type=tag_type))
+    proxy_file = tmpdir.join('chair_proxy.ma')
+    proxy_file.write('createNode transform -n "chair_PROXY";\ncreateNode transform -n "seat" -p "chair_PROXY";\n')
+    shaders_file = tmpdir.join('chair_shaders.json')
+    shaders_file.write(json.dumps(dict(('|chair_MODEL|{}'.format(mesh), 'wood_SG') for mesh in shader_meshes)))
+
+    return {'asset_name': 'chair', 'model_file': str(model_file), 'proxy_file': str(proxy_file),
+            'shaders_file': str(shaders_file)}
+
+
+def test_parse_maya_ascii(tmpdir):
+    entry = _write_asset(tmpdir)
+    nodes, connections = validator.parse_maya_ascii(entry['model_file'])
+
+    assert nodes['chair_MODEL|chair_seat|chair_seatShape']['parent'] == 'chair_MODEL|chair_seat'
+    assert nodes['chair_MODEL|chair_seat|chair_leg']['parent'] == 'chair_MODEL|chair_seat'
+    assert nodes['tag_data']['attrs'] == {'tag_type': 'SOLSTICE_TAG'}
+    assert connections == [('tag_data.node', 'chair_MODEL.tag_data')]
+    assert sorted(validator.get_descendants(nodes, 'chair_MODEL')) == [
+        'chair_MODEL|chair_leg', 'chair_MODEL|chair_seat', 'chair_MODEL|chair_seat|chair_leg',
+        'chair_MODEL|chair_seat|chair_seatShape']
+
+
+def test_multi_line_string_values_are_reported_as_warnings(tmpdir):
+    entry = _write_asset(tmpdir)
+    with open(entry['model_file'], 'a') as fh:
+        fh.write('createNode script -n "uiConfigurationScriptNode";\n')
+        fh.write('    setAttr ".b" -type "string" (\n        "// Maya Mel UI Configuration File.\\n"\n        + "");\n')
+    nodes, _ = validator.parse_maya_ascii(entry['model_file'])
+
+    assert nodes['uiConfigurationScriptNode']['multiline_attrs'] == ['b']
+    assert nodes['uiConfigurationScriptNode']['attrs'] == {}
+    report = validator.validate_asset(**entry)
+    assert report['valid']
+    assert '1 multi-line string attributes of model file cannot be validated: {}'.format(
+        entry['model_file']) in report['warnings']
+
+
+def test_valid_asset_reports_missing_builder_as_warning(tmpdir):
+    report = validator.validate_asset(**_write_asset(tmpdir))
+
+    assert report['valid']
+    assert report['errors'] == []
+    assert len(report['warnings']) == 1
+
+
+def test_invalid_tag_and_shader_meshes(tmpdir):
+    report = validator.validate_asset(**_write_asset(tmpdir, tag_type='BAD', shader_meshes=('chair_seat', 'chair_top')))
+
+    assert not report['valid']
+    assert 'Tag data node tag_data has an invalid tag type: BAD' in report['errors']
+    assert 'Mesh |chair_MODEL|chair_top not found in both model and shading file ...' in report['errors']
+
+
+def test_validate_library(tmpdir):
+    valid_entry = _write_asset(tmpdir.mkdir('chair'))
+    invalid_entry = dict(valid_entry, asset_name='table')
+
+    report = validator.validate_library([valid_entry, invalid_entry], processes=2)
+
+    assert report['valid'] == ['chair']
+    assert report['invalid'] == ['table']
+    assert 'Model group with name table_MODEL does not exists!' in report['assets']['table']['errors']
+
+
+def test_process_executable_inside_maya(monkeypatch, tmpdir):
+    monkeypatch.setattr(validator.sys, 'executable', str(tmpdir.join('maya.exe')))
+    assert validator.get_process_executable() is None
+
+    tmpdir.join('mayapy.exe').write('')
+    assert validator.get_process_executable() == str(tmpdir.join('mayapy.exe'))
+
+    monkeypatch.setattr(validator.sys, 'executable', str(tmpdir.join('mayapy.exe')))
+    assert validator.get_process_executable() == str(tmpdir.join('mayapy.exe'))
+
+
+def test_validate_library_without_process_executable(monkeypatch, tmpdir):
+    def _pool(*args, **kwargs):
+        raise AssertionError('Validation processes cannot be started')
+
+    monkeypatch.setattr(validator, 'get_process_executable', lambda: None)
+    monkeypatch.setattr(validator.multiprocessing, 'Pool', _pool)
+    valid_entry = _write_asset(tmpdir)
+
+    report = validator.validate_library([valid_entry, dict(valid_entry, asset_name='table')], processes=2)
+
+    assert report['valid'] == ['chair']
+    assert report['invalid'] == ['table']
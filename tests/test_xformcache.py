@@ -0,0 +1,85 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger transform caches
+"""
+
+import numpy as np
+import pytest
+
+from solstice.tools.proprigger import xformcache
+
+
+def _matrices(frame):
+    proxy_matrix = np.identity(4)
+    proxy_matrix[3, :3] = [frame, 0.0, 0.0]
+    hires_matrix = np.identity(4) * 2.0
+    hires_matrix[3, 3] = 1.0
+    return np.array([proxy_matrix.reshape(16), hires_matrix.reshape(16)])
+
+
+def test_cache_files():
+    assert xformcache.get_cache_files('/tmp/shovel.json') == ('/tmp/shovel.npy', '/tmp/shovel.json')
+
+
+def test_write_and_read_cache(tmp_path):
+    cache_file = str(tmp_path / 'caches' / 'shovel')
+    geometry = {'hires': {'transform': 'shovel_hires_grp', 'file': 'shovel_hires.ma'}}
+    frames = [1.0, 2.0, 3.0]
+    with xformcache.TransformCacheWriter(cache_file, ['proxy', 'hires'], frames, geometry=geometry) as writer:
+        for frame in frames:
+            writer.write_frame(frame, _matrices(frame))
+
+    transform_cache = xformcache.TransformCache(cache_file)
+    assert transform_cache.groups == ['proxy', 'hires']
+    assert transform_cache.frames == frames
+    assert transform_cache.geometry == geometry
+    assert transform_cache.matrices.shape == (3, 2, 4, 4)
+    assert isinstance(transform_cache.matrices, np.memmap)
+
+    assert np.allclose(transform_cache.get_matrix(2, 'proxy')[3, :3], [2.0, 0.0, 0.0])
+    assert np.allclose(transform_cache.get_matrix(3, 'hires'), _matrices(3)[1].reshape(4, 4))
+    assert [frame for frame, _ in transform_cache.iter_frames(start=2)] == [2.0, 3.0]
+    with pytest.raises(KeyError):
+        transform_cache.get_frame_matrices(4)
+
+
+def test_fractional_frames_do_not_drift(tmp_path):
+    frames = xformcache.get_frames(1, 2, step=0.1)
+    assert len(frames) == 11
+    assert frames[3] == 1.3 and frames[-1] == 2.0
+    assert xformcache.get_frames(1, 1) == [1.0]
+
+    cache_file = str(tmp_path / 'shovel')
+    with xformcache.TransformCacheWriter(cache_file, ['proxy', 'hires'], frames) as writer:
+        for frame in frames:
+            writer.write_frame(frame, _matrices(frame))
+
+    transform_cache = xformcache.TransformCache(cache_file)
+    assert np.allclose(transform_cache.get_matrix(1.3, 'proxy')[3, :3], [1.3, 0.0, 0.0])
+    assert np.allclose(transform_cache.get_matrix(1 + 3 * 0.1, 'proxy')[3, :3], [1.3, 0.0, 0.0])
+
+
+def test_get_driven_transforms(monkeypatch, cmds):
+    for group in ['|chair|proxy|mesh_proxy|chair_proxy_grp', '|chair|hires|joint_hires',
+                  '|chair|hires|mesh_hires|chair_hires_grp']:
+        cmds.add(group)
+    proxy_joints = [cmds.add('|chair|proxy|joint_proxy|root_proxy_jnt', 'joint'),
+                    cmds.add('|chair|proxy|joint_proxy|root_proxy_jnt|main_proxy_jnt', 'joint')]
+    monkeypatch.setattr(xformcache, 'mc', cmds, raising=False)
+    assert xformcache.get_driven_transforms('|chair') == [
+        ('proxy', proxy_joints[1]), ('hires', '|chair|hires|mesh_hires|chair_hires_grp')]
+
+    proxy_grp = '|chair|proxy|mesh_proxy|chair_proxy_grp'
+    constraint = cmds.add('{}|chair_proxy_grp_parentConstraint1'.format(proxy_grp), 'parentConstraint')
+    cmds.connectAttr('{}.constraintTranslateX'.format(constraint), '{}.translateX'.format(proxy_grp))
+    assert xformcache.get_driven_transforms('|chair')[0] == ('proxy', proxy_grp)
+
+
+def test_unwritten_frames_are_identity(tmp_path):
+    cache_file = str(tmp_path / 'shovel')
+    with xformcache.TransformCacheWriter(cache_file, ['proxy'], [1, 2]) as writer:
+        writer.write_frame(2, _matrices(2)[:1])
+
+    assert np.allclose(xformcache.TransformCache(cache_file).get_frame_matrices(1), np.identity(4))
@@ -0,0 +1,38 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for solstice-tools-proprigger transform caches that need a Maya session
+"""
+
+import numpy as np
+import pytest
+
+maya_standalone = pytest.importorskip('maya.standalone')
+
+
+@pytest.fixture(scope='module')
+def mc():
+    maya_standalone.initialize()
+    import maya.cmds as cmds
+    return cmds
+
+
+def test_bake_transforms(mc, tmp_path):
+    from solstice.tools.proprigger import xformcache
+
+    mc.file(new=True, force=True)
+    transform = mc.group(empty=True, name='chair_proxy_grp')
+    mc.setKeyframe(transform, attribute='translateX', time=1, value=0)
+    mc.setKeyframe(transform, attribute='translateX', time=2, value=10)
+    mc.keyTangent(transform, inTangentType='linear', outTangentType='linear')
+    mc.currentTime(1)
+
+    cache_file = str(tmp_path / 'chair')
+    xformcache.bake_transforms(
+        [('proxy', transform)], cache_file, 1, 2, step=0.1, geometry={'proxy': {'file': 'chair_rig.ma'}})
+
+    transform_cache = xformcache.TransformCache(cache_file)
+    assert len(transform_cache.frames) == 11
+    assert np.allclose(transform_cache.get_matrix(1.3, 'proxy')[3, :3], [3.0, 0.0, 0.0], atol=1e-4)
+    assert mc.currentTime(query=True) == 1